@@ -0,0 +1,8 @@
+# 사용법: uvicorn asgi:app --port 8501
+# streamlit run app.py 와 같은 앱이며, 차트 WebP 파생본(/app/static/charts)에 장기 캐시 헤더를 붙여 서빙합니다.
+import streamlit as st
+from starlette.middleware import Middleware
+
+from core.assets import ImmutableAssetHeaders
+
+app = st.App("app.py", middleware=[Middleware(ImmutableAssetHeaders)])
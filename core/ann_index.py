@@ -0,0 +1,185 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.quantization import codec_from_state, codec_state
+from core.vector_index import l2_normalize
+
+
+DEFAULT_ANN_DIR = os.path.join("data", "cache", "ann")
+
+
+def spherical_kmeans(vectors, n_clusters, n_iter=10, sample_size=20000, seed=0):
+    """정규화 벡터용 k-means (내적 기준 할당, 중심도 정규화)"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    n_clusters = max(1, min(n_clusters, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        counts = np.bincount(assign, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            # 빈 군집은 임의의 점으로 다시 시작
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = l2_normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """순수 NumPy IVF(inverted file) 근사 최근접 이웃 인덱스
+
+    벡터를 nlist 개 군집으로 나눠 군집 순서대로 연속 저장하고, 검색 시에는
+    질의와 가까운 nprobe 개 군집만 훑습니다. nprobe 를 키우면 recall 이
+    오르고 속도가 내려갑니다 (nprobe == nlist 이면 전수 검색과 동일).
+    codec (학습된 core.quantization 코덱) 을 주면 벡터 대신 압축 코드를 저장합니다.
+    """
+
+    def __init__(self, centroids, nprobe=8, codec=None):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self.codec = codec
+        empty = np.zeros((0, self.dim), dtype=np.float32)
+        self.vectors = empty if codec is None else codec.encode(empty)   # 군집 순 정렬 (압축 시 코드)
+        self.keys = np.zeros(0, dtype=object)                  # 문서 키 (정렬 순)
+        self.list_offsets = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @property
+    def dim(self):
+        return self.centroids.shape[1]
+
+    @property
+    def codec_name(self):
+        return "float32" if self.codec is None else self.codec.name
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, vectors, keys, nlist=None, nprobe=8, n_iter=10, seed=0, codec=None):
+        """벡터로 군집 중심(과 코덱)을 학습하고 전체를 삽입"""
+        vectors = l2_normalize(vectors)
+        if nlist is None:
+            nlist = int(np.clip(np.sqrt(len(vectors)), 1, 4096))
+        if codec is not None:
+            rng = np.random.default_rng(seed)
+            codec.fit(vectors[rng.choice(len(vectors), min(20000, len(vectors)), replace=False)])
+        index = cls(spherical_kmeans(vectors, nlist, n_iter=n_iter, seed=seed), nprobe=nprobe, codec=codec)
+        index.add(vectors, keys)
+        return index
+
+    def add(self, vectors, keys):
+        """새 벡터를 기존 군집에 증분 삽입 (재학습 없음)"""
+        if len(keys) == 0:
+            return
+        vectors = l2_normalize(vectors)
+        keys = np.asarray(keys, dtype=object)
+        assign_new = np.argmax(vectors @ self.centroids.T, axis=1)
+        if self.codec is not None:
+            vectors = self.codec.encode(vectors)
+        assign_old = np.repeat(np.arange(self.nlist), np.diff(self.list_offsets))
+
+        assign = np.concatenate([assign_old, assign_new])
+        order = np.argsort(assign, kind="stable")
+        self.vectors = np.ascontiguousarray(np.concatenate([self.vectors, vectors])[order])
+        self.keys = np.concatenate([self.keys, keys])[order]
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=self.nlist))])
+
+    def search(self, queries, k=10, nprobe=None):
+        """(scores, keys) 반환, 각 (질의 수, k) 배열 (후보가 모자라면 빈 키는 None)"""
+        queries = l2_normalize(np.atleast_2d(queries))
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+        out_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        out_keys = np.full((len(queries), k), None, dtype=object)
+        for qi, q in enumerate(queries):
+            idx = np.concatenate([np.arange(self.list_offsets[c], self.list_offsets[c + 1]) for c in probes[qi]])
+            if len(idx) == 0:
+                continue
+            scores = self.vectors[idx] @ q if self.codec is None else self.codec.scores(self.vectors[idx], q)
+            kk = min(k, len(idx))
+            best = np.argpartition(-scores, kk - 1)[:kk]
+            best = best[np.argsort(-scores[best])]
+            out_scores[qi, :kk] = scores[best]
+            out_keys[qi, :kk] = self.keys[idx[best]]
+        return out_scores, out_keys
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, centroids=self.centroids, vectors=self.vectors,
+                 keys=self.keys.astype(str), list_offsets=self.list_offsets,
+                 nprobe=np.int64(self.nprobe), **codec_state(self.codec))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """저장된 인덱스를 한 번에 로드 (없거나 깨졌으면 None)"""
+        try:
+            data = np.load(path, allow_pickle=False)
+            index = cls(data["centroids"], nprobe=int(data["nprobe"]), codec=codec_from_state(data))
+            index.vectors = data["vectors"]
+            index.keys = data["keys"].astype(object)
+            index.list_offsets = data["list_offsets"]
+        except (OSError, KeyError, ValueError):
+            return None
+        return index
+
+
+def exact_search(vectors, queries, k=10):
+    """전수 내적 검색 (정규화 벡터 기준), 행 번호 반환"""
+    scores = l2_normalize(np.atleast_2d(queries)) @ vectors.T
+    k = min(k, vectors.shape[0])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    rows = np.arange(len(scores))[:, None]
+    return top[rows, np.argsort(-scores[rows, top], axis=1)]
+
+
+def benchmark(index, vectors, keys, queries, k=10, nprobes=(1, 2, 4, 8, 16, 32)):
+    """전수 검색 대비 recall@k 와 초당 질의 수(QPS) 리포트"""
+    vectors = l2_normalize(vectors)
+    keys = np.asarray(keys, dtype=object)
+
+    t0 = time.perf_counter()
+    truth = exact_search(vectors, queries, k)
+    exact_qps = len(queries) / max(time.perf_counter() - t0, 1e-9)
+    truth_keys = keys[truth]
+
+    rows = []
+    for nprobe in nprobes:
+        if nprobe > index.nlist:
+            continue
+        t0 = time.perf_counter()
+        _, found = index.search(queries, k, nprobe=nprobe)
+        qps = len(queries) / max(time.perf_counter() - t0, 1e-9)
+        recall = np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found, truth_keys)])
+        rows.append({"nprobe": nprobe, f"recall@{k}": recall, "qps": qps, "exact_qps": exact_qps,
+                     "speedup": qps / exact_qps})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.ann_index  (저장된 임베딩으로 recall/QPS 리포트 출력)
+    from core.embedding_backends import get_backend
+    from core.embedding_store import EmbeddingStore
+
+    stored = EmbeddingStore().load(get_backend().id)
+    if stored is None:
+        raise SystemExit("저장된 임베딩이 없습니다. RAG 페이지에서 임베딩을 먼저 생성하세요.")
+    _, df_docs, vectors = stored
+    t0 = time.perf_counter()
+    ivf = IVFIndex.build(vectors, df_docs["key"].values)
+    print(f"build: {len(ivf):,} vectors, nlist={ivf.nlist}, {time.perf_counter() - t0:.2f}s")
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(vectors), min(200, len(vectors)), replace=False)
+    print(benchmark(ivf, vectors, df_docs["key"].values, np.asarray(vectors)[sample]).to_string(index=False))
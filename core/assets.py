@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+
+IMAGE_ROOT = os.path.join("data", "images")
+PLATFORMS = ("steam", "youtube")
+# app.py 옆 static/ 폴더는 server.enableStaticServing 으로 /app/static/ 에서 그대로 서빙됨
+STATIC_DIR = "static"
+STATIC_URL = "/app/static"
+ASSET_DIR = os.path.join(STATIC_DIR, "charts")
+MANIFEST_PATH = os.path.join(ASSET_DIR, "manifest.json")
+
+WIDTHS = (480, 960, 1440)       # 원본이 이보다 크면 만드는 축소본 폭 (원본 폭 WebP 는 항상 생성)
+WEBP_QUALITY = 82
+# 산출물 형식이 바뀌면 올려서 이전 파생본을 무효화
+MANIFEST_VERSION = 1
+
+# 세그먼트 화면의 차트 파일명 (확장자 제외, {seg} = 세그먼트 번호, 없으면 플랫폼 공통 차트)
+SEGMENT_CHARTS = {
+    "steam": {
+        "radar": "08_radar_seg_{seg}",
+        "topics": "top_topic_segment_{seg}",
+        "lift": "02_3_topic_lift_segment_{seg}",
+        "mirror": "12_topdiff_mirror_segment_{seg}",
+        "sizes": "01_segment_sizes",
+        "heatmap": "06_feature_heatmap",
+    },
+    "youtube": {
+        "radar": "04_radar_{seg}",
+        "topics": "02_2_top_topics_per_segment_{seg}",
+        "lift": "02_3_topic_lift_segment_{seg}",
+        "mirror": "09_topdiff_mirror_segment_{seg}",
+        "sizes": "01_segment_sizes",
+        "heatmap": "03_feature_heatmap",
+    },
+}
+
+# 원본 이미지 하나 (variants 는 폭 오름차순 WebP 파생본)
+ChartAsset = namedtuple("ChartAsset", ["key", "src", "width", "height", "sha1", "bytes", "variants"])
+AssetVariant = namedtuple("AssetVariant", ["width", "height", "url", "bytes"])
+
+
+def asset_key(platform, name):
+    """'steam/08_radar_seg_0' 형태 키 (확장자는 떼고 씀)"""
+    return f"{platform}/{os.path.splitext(name)[0]}"
+
+
+def segment_chart(platform, chart, seg):
+    return SEGMENT_CHARTS[platform][chart].format(seg=seg)
+
+
+def _sha1(path, chunk=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _derive(src, key, sha1, widths, quality, out_dir):
+    """원본 하나 -> 폭별 WebP 파생본 (파일명에 내용 해시를 넣어 URL 이 바뀌지 않으면 내용도 같음)"""
+    from PIL import Image
+
+    with Image.open(src) as im:
+        im.load()
+        width, height = im.size
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+        variants = []
+        for w in sorted({w for w in widths if w < width} | {width}):
+            h = max(1, round(height * w / width))
+            img = im if w == width else im.resize((w, h), Image.LANCZOS)
+            rel = f"{key}.{sha1[:12]}.{w}.webp"
+            path = os.path.join(out_dir, rel)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            img.save(tmp, "WEBP", quality=quality, method=6)
+            os.replace(tmp, path)
+            variants.append({"width": w, "height": h, "file": rel, "bytes": os.path.getsize(path)})
+    return width, height, variants
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_assets(image_root=IMAGE_ROOT, out_dir=ASSET_DIR, platforms=PLATFORMS, widths=WIDTHS,
+                 quality=WEBP_QUALITY, max_workers=None):
+    """차트 원본 PNG 전체의 매니페스트(경로, 크기, sha1)와 WebP 파생본을 만듦
+
+    이전 매니페스트와 (파일 크기, 수정 시각) 이 같으면 해시도 다시 계산하지 않고,
+    해시가 같고 파생본이 남아 있으면 재인코딩하지 않습니다 (증분 빌드).
+    더 이상 참조되지 않는 파생본은 지웁니다. 반환값은 매니페스트 dict 입니다.
+    """
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    previous = _load_manifest(manifest_path) or {}
+    same_params = (previous.get("version") == MANIFEST_VERSION and previous.get("widths") == list(widths)
+                   and previous.get("quality") == quality)
+    old_assets = previous.get("assets", {}) if same_params else {}
+
+    sources = []
+    for platform in platforms:
+        folder = os.path.join(image_root, platform)
+        if not os.path.isdir(folder):
+            continue
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if entry.is_file() and entry.name.lower().endswith(".png"):
+                sources.append((asset_key(platform, entry.name), entry.path, entry.stat()))
+
+    def _one(item):
+        key, src, stat = item
+        old = old_assets.get(key)
+        if old and old["bytes"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+            sha1 = old["sha1"]
+        else:
+            sha1 = _sha1(src)
+        if old and old["sha1"] == sha1 and all(os.path.exists(os.path.join(out_dir, v["file"])) for v in old["variants"]):
+            return key, dict(old, src=src.replace(os.sep, "/"), mtime_ns=stat.st_mtime_ns), False
+        width, height, variants = _derive(src, key, sha1, widths, quality, out_dir)
+        return key, {"src": src.replace(os.sep, "/"), "width": width, "height": height, "sha1": sha1,
+                     "bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns, "variants": variants}, True
+
+    # Pillow 는 리사이즈/인코딩 중 GIL 을 놓으므로 스레드로 병렬 처리
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, os.cpu_count() or 1)) as pool:
+        results = list(pool.map(_one, sources))
+    assets = {key: entry for key, entry, _ in results}
+    manifest = {"version": MANIFEST_VERSION, "widths": list(widths), "quality": quality, "assets": assets}
+
+    # 매니페스트에 없는 파생본 정리 (원본이 바뀌어 해시가 달라진 옛 파일 등)
+    keep = {os.path.normpath(os.path.join(out_dir, v["file"])) for e in assets.values() for v in e["variants"]}
+    for platform in platforms:
+        folder = os.path.join(out_dir, platform)
+        if os.path.isdir(folder):
+            for entry in os.scandir(folder):
+                if entry.name.endswith(".webp") and os.path.normpath(entry.path) not in keep:
+                    os.remove(entry.path)
+
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, manifest_path)
+    manifest["rebuilt"] = sum(changed for _, _, changed in results)
+    return manifest
+
+
+def pick(asset, target_width):
+    """target_width(px) 이상인 가장 작은 파생본 (없으면 가장 큰 것)"""
+    for variant in asset.variants:
+        if variant.width >= target_width:
+            return variant
+    return asset.variants[-1]
+
+
+def srcset(asset):
+    return ", ".join(f"{v.url} {v.width}w" for v in asset.variants)
+
+
+def img_html(asset, sizes="100vw", alt="", loading="lazy"):
+    """브라우저가 화면 폭과 DPR 에 맞는 파생본을 고르도록 srcset/sizes 를 단 <img>
+
+    width/height 속성으로 비율을 미리 알려 이미지가 늦게 와도 레이아웃이 밀리지 않습니다.
+    loading="lazy" 면 화면에 들어올 때 받습니다 (첫 화면 이미지는 "eager").
+    """
+    fallback = pick(asset, 960)
+    return (f"<img src='{fallback.url}' srcset='{srcset(asset)}' sizes='{sizes}' "
+            f"width='{asset.width}' height='{asset.height}' alt='{alt}' loading='{loading}' decoding='async' "
+            f"style='width: 100%; height: auto;'>")
+
+
+def prefetch_html(assets_sizes):
+    """[(ChartAsset, sizes)] 를 보이지 않는 낮은 우선순위 <img> 로 미리 받게 하는 HTML
+
+    본 화면과 같은 srcset/sizes 를 쓰므로 브라우저가 나중에 고를 파생본과 같은 URL 이
+    HTTP 캐시에 들어갑니다 (asgi.py 로 띄우면 immutable 헤더라 재검증도 없음).
+    """
+    imgs = "".join(f"<img src='{pick(a, 960).url}' srcset='{srcset(a)}' sizes='{sizes}' alt='' "
+                   f"fetchpriority='low' decoding='async'>" for a, sizes in assets_sizes if a is not None)
+    return f"<div style='display: none;' aria-hidden='true'>{imgs}</div>" if imgs else ""
+
+
+class AssetManifest:
+    """빌드된 차트 매니페스트 조회 (파일의 크기/수정 시각이 바뀌었을 때만 다시 읽음)
+
+    매니페스트에 없는 이미지는 원본 폴더 목록 한 번으로 찾아 원본 경로를 돌려주므로
+    조회마다 os.path.exists 를 부르지 않습니다.
+    """
+
+    def __init__(self, path=MANIFEST_PATH, image_root=IMAGE_ROOT, static_url=STATIC_URL, static_dir=STATIC_DIR):
+        self.path = path
+        self.image_root = image_root
+        # 파생본 URL 접두사 (ASSET_DIR 의 static/ 기준 상대 경로)
+        self._url_prefix = static_url + "/" + os.path.relpath(os.path.dirname(path), static_dir).replace(os.sep, "/")
+        self._lock = threading.Lock()
+        self._signature = None
+        self._assets = {}
+        self._originals = {}     # platform -> (폴더 수정 시각, {이름: 경로})
+
+    def _load(self):
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return self._assets
+        with self._lock:
+            if signature != self._signature:
+                data = _load_manifest(self.path) if signature else None
+                assets = {}
+                if data and data.get("version") == MANIFEST_VERSION:
+                    for key, e in data.get("assets", {}).items():
+                        variants = tuple(AssetVariant(v["width"], v["height"], f"{self._url_prefix}/{v['file']}", v["bytes"])
+                                         for v in e["variants"])
+                        assets[key] = ChartAsset(key, e["src"], e["width"], e["height"], e["sha1"], e["bytes"], variants)
+                self._assets, self._signature = assets, signature
+        return self._assets
+
+    def __len__(self):
+        return len(self._load())
+
+    def get(self, platform, name):
+        """ChartAsset (빌드 안 된 이미지면 None)"""
+        return self._load().get(asset_key(platform, name))
+
+    def original(self, platform, name):
+        """원본 PNG 경로 (없으면 None) — 폴더 목록은 폴더가 바뀔 때만 다시 읽음"""
+        folder = os.path.join(self.image_root, platform)
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._originals.get(platform)
+        if cached is None or cached[0] != mtime:
+            files = {os.path.splitext(e.name)[0]: e.path for e in os.scandir(folder)
+                     if e.is_file() and e.name.lower().endswith(".png")}
+            cached = self._originals[platform] = (mtime, files)
+        return cached[1].get(os.path.splitext(name)[0])
+
+
+class ImmutableAssetHeaders:
+    """차트 파생본 응답에 장기 캐시 헤더를 붙이는 ASGI 미들웨어
+
+    Streamlit 의 /app/static 라우트는 Cache-Control 을 보내지 않으므로 asgi.py (st.App) 로
+    띄울 때 씁니다. 파생본 파일명에 내용 해시가 들어 있어 immutable 로 두어도 안전합니다.
+    """
+
+    def __init__(self, app, prefix=STATIC_URL + "/charts/", max_age=365 * 24 * 3600):
+        self.app = app
+        self.prefix = prefix
+        self.value = f"public, max-age={max_age}, immutable".encode()
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if self.prefix not in path or not path.endswith(".webp"):
+            await self.app(scope, receive, send)
+            return
+
+        async def _send(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                message = dict(message, headers=headers + [(b"cache-control", self.value)])
+            await send(message)
+
+        await self.app(scope, receive, _send)
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.assets  (파생본/매니페스트 빌드 + 세그먼트 화면당 전송 바이트 비교)
+    import time
+
+    t0 = time.perf_counter()
+    built = build_assets()
+    print(f"{len(built['assets'])} assets, {built['rebuilt']} rebuilt in {time.perf_counter() - t0:.1f}s -> {ASSET_DIR}")
+
+    # 와이드 레이아웃 본문 약 1400px 기준: 레이더는 좌측 컬럼(1.3/3), 나머지 차트는 전체 폭
+    store = AssetManifest()
+    view_widths = {"radar": 1400 * 1.3 / 3, "topics": 1400, "lift": 1400, "mirror": 1400}   # 세그먼트별 차트만
+    print(f"{'segment view':<16}{'PNG':>12}{'WebP 1x':>12}{'WebP 2x':>12}{'ratio 1x':>10}")
+    for platform, charts in SEGMENT_CHARTS.items():
+        seg = 0
+        while store.get(platform, segment_chart(platform, "radar", seg)) is not None:
+            assets = [(store.get(platform, segment_chart(platform, c, seg)), w) for c, w in view_widths.items()]
+            assets = [(a, w) for a, w in assets if a is not None]
+            before = sum(a.bytes for a, _ in assets)
+            x1 = sum(pick(a, w).bytes for a, w in assets)
+            x2 = sum(pick(a, 2 * w).bytes for a, w in assets)
+            print(f"{platform + ' ' + str(seg):<16}{before / 1024:>10.0f}KB{x1 / 1024:>10.0f}KB"
+                  f"{x2 / 1024:>10.0f}KB{before / max(x1, 1):>9.1f}x")
+            seg += 1
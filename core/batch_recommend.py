@@ -0,0 +1,137 @@
+"""팀 역량 프로필 일괄 추천 (헤드리스 배치)
+
+    python -m core.batch_recommend profiles.csv -o recommendations.parquet --k 5 --workers 4
+
+입력: 10개 차원 컬럼(아트 … BM)을 가진 CSV/Parquet. 값은 슬라이더와 같은 1~5 척도
+(--scale unit 이면 이미 0~1 로 변환된 값). 그 밖의 컬럼(팀명 등)은 결과에 그대로 붙습니다.
+출력: 프로필당 한 행, top-k APPID/게임명/장르/점수 리스트와 장르 빈도(JSON) 컬럼.
+카탈로그는 RAG 페이지와 같은 load_games_cached (D1~D10 + 태그 병합 테이블) 이므로
+같은 프로필이면 페이지와 같은 게임 목록에서 같은 순위가 나옵니다 (태그 파일에 없는 게임은 둘 다 제외).
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.data import GAME_DIM_PATH, GAME_TAG_PATH, load_games_cached
+from core.recommender import DIM_COLS, RecommendationEngine, slider_to_vector
+
+
+# 워커 프로세스마다 한 번만 만드는 추천 엔진
+_worker_engine = None
+
+
+def _init_worker(dim_path, tag_path):
+    global _worker_engine
+    _worker_engine = RecommendationEngine(load_games_cached(dim_path, tag_path), DIM_COLS)
+
+
+def _score_chunk(args):
+    matrix, k, weights = args
+    return _worker_engine.top_k_batch(matrix, k=k, weights=weights)
+
+
+def read_profiles(path):
+    if path.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, encoding="utf-8-sig")
+    missing = [c for c in DIM_COLS if c not in df.columns]
+    if missing:
+        raise SystemExit(f"프로필 파일에 차원 컬럼이 없습니다: {', '.join(missing)}")
+    return df
+
+
+def default_batch_size(n_games, budget=16_000_000):
+    """(배치 x 게임) 유사도 행렬이 budget 개 float 이하가 되도록"""
+    return int(max(1, min(65536, budget // max(n_games, 1))))
+
+
+def score_profiles(engine, matrix, k=5, weights=None, batch_size=None, workers=1, dim_path=GAME_DIM_PATH,
+                   tag_path=GAME_TAG_PATH):
+    """프로필 행렬을 배치 단위로 채점 -> (top 행 번호, top 점수)"""
+    batch_size = batch_size or default_batch_size(len(engine))
+    chunks = [(matrix[i:i + batch_size], k, weights) for i in range(0, len(matrix), batch_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        results = [engine.top_k_batch(m, k=k, weights=w) for m, k, w in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dim_path, tag_path)) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    if not results:
+        return np.zeros((0, k), dtype=np.int64), np.zeros((0, k), dtype=np.float32)
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+
+def genre_counts(genre_codes, n_genres, top):
+    """프로필별 top-k 장르 빈도 (프로필 수, 장르 수) — bincount 한 번으로 계산"""
+    codes = genre_codes[top]
+    flat = (np.arange(len(top))[:, None] * n_genres + codes).ravel()
+    return np.bincount(flat[codes.ravel() >= 0], minlength=len(top) * n_genres).reshape(len(top), n_genres)
+
+
+def build_output(df_profiles, df_games, top, top_scores, genre_col="TARGET_GENRE"):
+    out = df_profiles.drop(columns=DIM_COLS).reset_index(drop=True).copy()
+    out["top_appids"] = list(df_games["APPID"].to_numpy()[top])
+    out["top_games"] = list(df_games["game_name"].to_numpy()[top]) if "game_name" in df_games else None
+    out["top_scores"] = list(top_scores.astype(np.float32))
+    if genre_col in df_games.columns:
+        codes, genres = pd.factorize(df_games[genre_col])
+        # 장르가 비어 있는 게임(코드 -1)은 맨 끝에 붙인 None 을 가리킴
+        names = np.append(np.asarray(genres, dtype=object), None)
+        out["top_genres"] = list(names[codes][top])
+        counts = genre_counts(codes, len(genres), top)
+        order = np.argsort(-counts, axis=1, kind="stable")
+        out["genre_counts"] = [
+            json.dumps({genres[g]: int(row[g]) for g in idx if row[g] > 0}, ensure_ascii=False)
+            for row, idx in zip(counts, order)
+        ]
+        out["top_genre"] = [genres[idx[0]] if len(idx) and row[idx[0]] > 0 else None
+                            for row, idx in zip(counts, order)]
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="팀 역량 프로필 일괄 게임 추천")
+    parser.add_argument("profiles", help="프로필 CSV/Parquet (10개 차원 컬럼 포함)")
+    parser.add_argument("-o", "--output", default="recommendations.parquet")
+    parser.add_argument("--catalogue", default=GAME_DIM_PATH, help="게임 D1~D10 카탈로그 CSV")
+    parser.add_argument("--tags", default=GAME_TAG_PATH, help="게임 태그 CSV (페이지와 같은 병합 테이블을 만듦)")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="프로세스 수 (1 이면 단일 프로세스)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--scale", choices=["slider", "unit"], default="slider",
+                        help="slider: 1~5 점수, unit: 이미 0~1 로 변환된 값")
+    parser.add_argument("--weights", default=None, help="차원별 가중치 10개 (쉼표 구분)")
+    args = parser.parse_args(argv)
+
+    df_games = load_games_cached(args.catalogue, args.tags)
+    engine = RecommendationEngine(df_games, DIM_COLS)
+    df_profiles = read_profiles(args.profiles)
+    matrix = df_profiles[DIM_COLS].to_numpy(dtype=np.float32)
+    if args.scale == "slider":
+        matrix = slider_to_vector(matrix)
+    weights = None
+    if args.weights:
+        weights = np.array([float(w) for w in args.weights.split(",")], dtype=np.float32)
+        if len(weights) != len(DIM_COLS):
+            raise SystemExit(f"가중치는 {len(DIM_COLS)}개여야 합니다.")
+
+    t0 = time.perf_counter()
+    top, top_scores = score_profiles(engine, matrix, k=args.k, weights=weights, batch_size=args.batch_size,
+                                     workers=args.workers, dim_path=args.catalogue, tag_path=args.tags)
+    elapsed = time.perf_counter() - t0
+
+    out = build_output(df_profiles, engine.df_games, top, top_scores)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    out.to_parquet(args.output, index=False)
+    rate = len(matrix) / elapsed if elapsed > 0 else float("inf")
+    print(f"{len(matrix):,} profiles x {len(engine):,} games -> {args.output} "
+          f"({elapsed:.3f}s, {rate:,.0f} profiles/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from core.documents import normalize_appid
+from core.embedding_store import source_signature
+
+
+GAME_DIM_PATH = "data/GAME_DIM_D1_D10.csv"
+GAME_TAG_PATH = "data/TAG_STEAM_GAME.csv"
+DEFAULT_TABLE_CACHE_DIR = os.path.join("data", "cache", "tables")
+
+# 반복값이 많아 사전(dictionary) 인코딩하는 컬럼
+CATEGORICAL_COLS = ["APPID", "TARGET_GENRE", "engine", "network"]
+# 산출물 형식이 바뀌면 올려서 이전 캐시를 무효화
+TABLE_SCHEMA_VERSION = 1
+
+
+def load_game_dims(path=GAME_DIM_PATH):
+    """게임별 D1~D10 점수 카탈로그"""
+    return normalize_appid(pd.read_csv(path))
+
+
+def load_games(dim_path=GAME_DIM_PATH, tag_path=GAME_TAG_PATH):
+    """D1~D10 점수 + 스팀 태그/기술 스펙을 APPID 로 병합한 게임 테이블"""
+    df_dim = load_game_dims(dim_path)
+    df_tag = normalize_appid(pd.read_csv(tag_path))
+    return pd.merge(df_dim, df_tag, on='APPID', how='inner', suffixes=('', '_tag'))
+
+
+def _to_categorical(df, cols=CATEGORICAL_COLS):
+    for col in cols:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _write_arrow(df, path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    tmp = path + ".tmp"
+    # 비압축 Arrow IPC: memory_map 으로 열면 디코딩 없이 페이지 캐시를 그대로 씀
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+
+def _read_arrow(path):
+    import pyarrow as pa
+
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    # split_blocks: 컬럼별 블록 유지 (숫자 컬럼은 복사 없이 arrow 버퍼를 가리킴)
+    return table.to_pandas(split_blocks=True)
+
+
+def load_games_cached(dim_path=GAME_DIM_PATH, tag_path=GAME_TAG_PATH, cache_dir=DEFAULT_TABLE_CACHE_DIR):
+    """load_games 결과를 Arrow IPC 파일로 캐시해 두고, 원본 CSV 가 그대로면 memory-map 으로 읽음
+
+    원본 확인은 (크기, 수정 시각) 이 같으면 해시를 재사용하고, 달라졌을 때만 sha1 을 다시 계산합니다.
+    pyarrow 가 없거나 캐시를 쓸 수 없으면 CSV 에서 바로 읽습니다.
+    """
+    name = "games_" + hashlib.sha1(f"{os.path.abspath(dim_path)}|{os.path.abspath(tag_path)}".encode("utf-8")).hexdigest()[:12]
+    table_path = os.path.join(cache_dir, name + ".arrow")
+    manifest_path = os.path.join(cache_dir, name + ".json")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    previous = manifest.get("sources") or [None, None]
+    sources = [source_signature(p, prev) for p, prev in zip((dim_path, tag_path), previous)]
+    fresh = (manifest.get("schema") == TABLE_SCHEMA_VERSION and os.path.exists(table_path)
+             and [s["sha1"] for s in sources] == [s.get("sha1") for s in previous if s])
+
+    def _write_manifest(rows):
+        tmp = manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"schema": TABLE_SCHEMA_VERSION, "sources": sources, "rows": rows}, f, ensure_ascii=False)
+        os.replace(tmp, manifest_path)
+
+    if fresh:
+        try:
+            df = _read_arrow(table_path)
+            if sources != previous:
+                _write_manifest(len(df))    # 내용은 같고 수정 시각만 바뀐 경우 다음 확인에서 해시 생략
+            return df
+        except (ImportError, OSError, ValueError):
+            pass
+
+    df = _to_categorical(load_games(dim_path, tag_path))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_arrow(df, table_path)
+        _write_manifest(len(df))
+    except (ImportError, OSError):
+        pass
+    return df
+
+
+def data_version(paths=(GAME_DIM_PATH, GAME_TAG_PATH)):
+    """원본 파일들의 (크기, 수정 시각) 기반 버전 문자열"""
+    h = hashlib.sha1()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            h.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+        except OSError:
+            h.update(f"{path}:missing;".encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.data [점수 CSV] [태그 CSV]  (CSV 파싱 vs Arrow 캐시 콜드 스타트 시간/메모리 리포트)
+    import shutil
+    import subprocess
+    import sys
+
+    dim_path = sys.argv[1] if len(sys.argv) > 1 else GAME_DIM_PATH
+    tag_path = sys.argv[2] if len(sys.argv) > 2 else GAME_TAG_PATH
+    bench_dir = os.path.join(DEFAULT_TABLE_CACHE_DIR, "_bench")
+
+    def _measure(label, call):
+        """새 프로세스에서 (서버 재시작과 같은) 콜드 스타트 로드 시간과 로드로 늘어난 최대 RSS 측정"""
+        script = ("import resource, time; from core.data import load_games, load_games_cached; "
+                  "rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; t0 = time.perf_counter(); "
+                  f"df = {call}; print(time.perf_counter() - t0, df.memory_usage(deep=True).sum(), "
+                  "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss0)")
+        out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.split()
+        seconds, frame_bytes, rss_kb = float(out[0]), int(out[1]), int(out[2])
+        print(f"{label:<24} {seconds * 1000:9.1f} ms   frame {frame_bytes / 2 ** 20:8.2f} MB   "
+              f"max RSS +{rss_kb / 1024:7.1f} MB")
+
+    shutil.rmtree(bench_dir, ignore_errors=True)
+    _measure("csv (load_games)", f"load_games({dim_path!r}, {tag_path!r})")
+    _measure("arrow 캐시 생성", f"load_games_cached({dim_path!r}, {tag_path!r}, cache_dir={bench_dir!r})")
+    _measure("arrow 캐시 재사용(mmap)", f"load_games_cached({dim_path!r}, {tag_path!r}, cache_dir={bench_dir!r})")
+    shutil.rmtree(bench_dir, ignore_errors=True)
@@ -0,0 +1,95 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+DOC_COLUMNS = ["APPID", "game_name", "dim", "text", "raw_quote"]
+
+
+def normalize_appid(df):
+    """appid 류 컬럼명을 APPID 로 통일하고 문자열로 변환"""
+    col_map = {c: "APPID" for c in df.columns if "appid" in c.lower().replace("_", "")}
+    df = df.rename(columns=col_map)
+    if "APPID" in df.columns:
+        df["APPID"] = df["APPID"].astype(str)
+    return df
+
+
+def build_documents(df_rag):
+    """*quote* 컬럼들을 long 형태로 펼쳐 문서 테이블 생성 (벡터화)
+
+    행 순서는 (원본 행, 컬럼 순서) 그대로 유지됩니다.
+    """
+    quote_cols = [c for c in df_rag.columns if "quote" in c.lower()]
+    if not quote_cols or df_rag.empty:
+        return pd.DataFrame(columns=DOC_COLUMNS)
+
+    n_rows, n_cols = len(df_rag), len(quote_cols)
+    appid = df_rag["APPID"].astype(str).values
+    if "game_name" in df_rag.columns:
+        game_name = df_rag["game_name"].where(df_rag["game_name"].notna(), "Game " + df_rag["APPID"].astype(str)).values
+    else:
+        game_name = ("Game " + df_rag["APPID"].astype(str)).values
+    dim_codes = np.array([c.split("_")[0].upper() for c in quote_cols], dtype=object)
+
+    # (행, 컬럼) 순서로 펼침
+    quotes = pd.Series(df_rag[quote_cols].to_numpy(dtype=object).reshape(-1))
+    quotes = quotes.where(quotes.notna(), "").astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+    keep = (quotes != "").values
+
+    dims = np.tile(dim_codes, n_rows)[keep]
+    raw = quotes.values[keep]
+    df_docs = pd.DataFrame({
+        "APPID": np.repeat(appid, n_cols)[keep],
+        "game_name": np.repeat(game_name, n_cols)[keep],
+        "dim": dims,
+        "text": "[" + pd.Series(dims, dtype=object) + "] " + pd.Series(raw, dtype=object),
+        "raw_quote": raw,
+    })
+    return df_docs
+
+
+class DocumentStreamStats:
+    """스트리밍 전처리 진행 상황 (처리 행 수, 문서 수, 처리 속도)"""
+
+    def __init__(self, total_bytes=0):
+        self.rows = 0
+        self.docs = 0
+        self.seconds = 0.0
+        self.bytes_read = 0
+        self.total_bytes = total_bytes
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def fraction(self):
+        return min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 0.0
+
+
+def iter_document_chunks(path, chunksize=20000, stats=None):
+    """CSV 를 청크 단위로 읽어 문서 테이블을 하나씩 내보내는 generator
+
+    generator 자체는 한 번에 청크 하나만 읽고 전처리합니다 (내보낸 청크를 모아 두면 그만큼 메모리를 씀).
+    stats(DocumentStreamStats) 를 넘기면 처리량이 갱신됩니다.
+    """
+    if stats is not None:
+        stats.total_bytes = os.path.getsize(path)
+    with open(path, "rb") as f:
+        reader = pd.read_csv(f, chunksize=chunksize, encoding="utf-8-sig")
+        while True:
+            t0 = time.perf_counter()
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            df_docs = build_documents(normalize_appid(chunk))
+            if stats is not None:
+                stats.rows += len(chunk)
+                stats.docs += len(df_docs)
+                stats.seconds += time.perf_counter() - t0
+                stats.bytes_read = f.tell()
+            yield df_docs
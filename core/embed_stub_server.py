@@ -0,0 +1,101 @@
+"""임베딩 API 대역 서버 (오프라인 스테이징/벤치마크용)
+
+실제 임베딩 API 처럼 배치 요청을 받고, 분당 요청 제한(429), 배치 크기 제한(400),
+응답 지연을 흉내 냅니다. 벡터는 LocalHashingBackend 로 계산합니다.
+
+    python -m core.embed_stub_server --port 8765 --latency 0.2 --rpm 600
+    EMBED_BACKEND=http EMBED_HTTP_URL=http://127.0.0.1:8765/embed streamlit run app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.embedding_backends import LocalHashingBackend
+
+
+class StubState:
+    def __init__(self, rpm, max_batch, latency, jitter):
+        self.rpm = rpm
+        self.max_batch = max_batch
+        self.latency = latency
+        self.jitter = jitter
+        self.backend = LocalHashingBackend()
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+
+    def allow(self):
+        """고정 1분 창 기준 요청 허용 여부"""
+        if not self.rpm:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if now - self.window_start >= 60:
+                self.window_start, self.window_count = now, 0
+            if self.window_count >= self.rpm:
+                return False
+            self.window_count += 1
+            return True
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/embed":
+                return self._send(404, {"error": "not found"})
+            if not state.allow():
+                return self._send(429, {"error": "rate limit exceeded"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                content = json.loads(self.rfile.read(length).decode("utf-8"))["content"]
+            except (ValueError, KeyError):
+                return self._send(400, {"error": "invalid request"})
+            if isinstance(content, str):
+                content = [content]
+            if len(content) > state.max_batch:
+                return self._send(400, {"error": f"batch size {len(content)} > {state.max_batch}"})
+
+            time.sleep(max(0.0, state.latency + random.uniform(-state.jitter, state.jitter)))
+            vectors = state.backend.embed_batch(content)
+            self._send(200, {"embedding": vectors.tolist()})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="임베딩 API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="요청당 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="지연 편차(초)")
+    parser.add_argument("--rpm", type=int, default=600, help="분당 허용 요청 수 (0 이면 무제한)")
+    parser.add_argument("--max-batch", type=int, default=100, help="요청당 최대 텍스트 수")
+    args = parser.parse_args(argv)
+
+    state = StubState(args.rpm, args.max_batch, args.latency, args.jitter)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    print(f"stub embedding server: http://{args.host}:{args.port}/embed")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import json
+import os
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+
+class EmbeddingBackend:
+    """임베딩 백엔드 공통 인터페이스
+
+    id 는 (백엔드, 모델) 조합으로, 저장소 키/디렉터리와 질의 캐시 키에 쓰여
+    서로 다른 백엔드가 만든 벡터가 섞이지 않게 합니다.
+    """
+
+    name = "base"
+    requires_api_key = False
+    # 백엔드별 기본 파이프라인 설정 (환경 변수로 덮어쓸 수 있음)
+    pipeline_defaults = {}
+
+    def __init__(self, model):
+        self.model = model
+
+    @property
+    def id(self):
+        return f"{self.name}:{self.model}"
+
+    def configure(self, api_key=None):
+        pass
+
+    def embed_batch(self, texts):
+        """텍스트 목록 -> 같은 순서의 벡터 목록"""
+        raise NotImplementedError
+
+
+class GeminiBackend(EmbeddingBackend):
+    """Google Gemini 임베딩 API"""
+
+    name = "gemini"
+    requires_api_key = True
+    pipeline_defaults = {"max_workers": 4, "rpm": 1500, "tpm": 1_000_000}
+
+    def __init__(self, model="models/text-embedding-004"):
+        super().__init__(model)
+
+    def configure(self, api_key=None):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+
+    def embed_batch(self, texts):
+        import google.generativeai as genai
+        return genai.embed_content(model=self.model, content=list(texts))['embedding']
+
+
+class LocalHashingBackend(EmbeddingBackend):
+    """네트워크 없이 CPU 에서 동작하는 해싱 벡터라이저 (문자 n-gram, 한글 대응)
+
+    학습 단계가 없어 문서/질의를 언제든 같은 공간으로 임베딩할 수 있습니다.
+    """
+
+    name = "local"
+    pipeline_defaults = {"max_workers": 1, "rpm": None, "tpm": None}
+
+    def __init__(self, model="hashing-char-768", n_features=768, ngram_range=(1, 3)):
+        super().__init__(model)
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self._vectorizer = HashingVectorizer(
+            analyzer="char_wb", ngram_range=ngram_range, n_features=n_features,
+            alternate_sign=True, norm="l2",
+        )
+
+    def embed_batch(self, texts):
+        return self._vectorizer.transform(list(texts)).toarray().astype(np.float32)
+
+
+class HttpEmbeddingBackend(EmbeddingBackend):
+    """임베딩 API 와 같은 배치 형태의 HTTP 서버 (core.embed_stub_server 등)
+
+    요청: POST {url} {"model": ..., "content": [...]}
+    응답: {"embedding": [[...], ...]}
+    """
+
+    name = "http"
+    pipeline_defaults = {"max_workers": 4, "rpm": 600, "tpm": None}
+
+    def __init__(self, url="http://127.0.0.1:8765/embed", model="stub-hashing-768", timeout=30):
+        super().__init__(model)
+        self.url = url
+        self.timeout = timeout
+
+    def embed_batch(self, texts):
+        body = json.dumps({"model": self.model, "content": list(texts)}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))["embedding"]
+        except urllib.error.HTTPError as e:
+            # 429/5xx 는 상위 파이프라인이 백오프 후 재시도
+            raise RuntimeError(f"HTTP {e.code}: {e.read()[:200]!r}") from e
+
+
+BACKENDS = {
+    "gemini": GeminiBackend,
+    "local": LocalHashingBackend,
+    "http": HttpEmbeddingBackend,
+}
+
+
+def get_backend(name=None, **kwargs):
+    """설정으로 백엔드 선택 (기본: 환경 변수 EMBED_BACKEND, 없으면 gemini)
+
+    EMBED_MODEL / EMBED_HTTP_URL 환경 변수로 모델명과 HTTP 주소를 지정할 수 있습니다.
+    """
+    name = (name or os.environ.get("EMBED_BACKEND") or "gemini").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 임베딩 백엔드: {name} (가능: {', '.join(BACKENDS)})")
+    if os.environ.get("EMBED_MODEL") and "model" not in kwargs:
+        kwargs["model"] = os.environ["EMBED_MODEL"]
+    if name == "http" and os.environ.get("EMBED_HTTP_URL") and "url" not in kwargs:
+        kwargs["url"] = os.environ["EMBED_HTTP_URL"]
+    return BACKENDS[name](**kwargs)
@@ -0,0 +1,311 @@
+import os
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.ann_index import DEFAULT_ANN_DIR, IVFIndex
+from core.embedding_backends import get_backend
+from core.documents import DocumentStreamStats, iter_document_chunks
+from core.embedding_pipeline import EmbeddingBatchError, embed_texts, pipeline_options_from_env
+from core.embedding_store import EmbeddingStore, make_key, source_signature
+from core.lexical_index import DEFAULT_LEXICAL_DIR, BM25Index, fuse_scores
+from core.quantization import make_codec
+from core.vector_index import GameQuoteIndex
+
+
+RAG_CSV_PATH = "data/GAME_DIM_CLASSIFIED_END.csv"
+
+
+# 작업 결과 (한 번 만들어지면 바뀌지 않음, 모든 세션이 같은 객체를 읽음)
+EmbeddingResult = namedtuple("EmbeddingResult", ["df_docs", "doc_embeddings", "reused_count", "computed_count", "index", "ann_index", "version", "lexical"])
+
+
+def _freeze(df_docs, vectors):
+    """세션 간 공유되는 결과를 읽기 전용으로 고정"""
+    if isinstance(vectors, np.ndarray) and vectors.flags.writeable:
+        vectors.setflags(write=False)
+    return df_docs, vectors
+
+
+class EmbeddingJobManager:
+    """프로세스 전체에서 공유하는 백그라운드 임베딩 작업
+
+    여러 세션이 동시에 start_job 을 호출해도 쓰레드는 하나만 뜨고,
+    나머지 세션은 진행 중인 작업의 진행률을 따라가다 같은 결과를 읽습니다.
+    """
+
+    def __init__(self, backend=None, store=None, pipeline_options=None, vector_codec=None):
+        self._lock = threading.Lock()
+        self.is_running = False      # 실행 중인지 여부
+        self.progress = 0.0          # 진행률 (0.0 ~ 1.0)
+        self.status_text = ""        # 현재 상태 메시지
+        self.error_msg = None        # 에러 메시지
+        self.result = None           # EmbeddingResult
+        self.backend = backend or get_backend()
+        self.store = store or EmbeddingStore()
+        self.pipeline_options = pipeline_options or pipeline_options_from_env(self.backend.pipeline_defaults)
+        # 인덱스 벡터 저장 방식 (float32 | float16 | int8 | pq), 압축 시 상위 후보는 저장소 float32 로 재채점
+        self.vector_codec = (vector_codec or os.environ.get("EMBED_VECTOR_CODEC") or "float32").lower()
+        make_codec(self.vector_codec)   # 잘못된 이름이면 바로 ValueError
+
+    # 기존 화면 코드 호환용 접근자
+    @property
+    def df_docs(self):
+        return self.result.df_docs if self.result else None
+
+    @property
+    def doc_embeddings(self):
+        return self.result.doc_embeddings if self.result else None
+
+    @property
+    def index(self):
+        return self.result.index if self.result else None
+
+    @property
+    def ann_index(self):
+        return self.result.ann_index if self.result else None
+
+    @property
+    def lexical(self):
+        return self.result.lexical if self.result else None
+
+    @property
+    def version(self):
+        return self.result.version if self.result else None
+
+    @property
+    def reused_count(self):
+        return self.result.reused_count if self.result else 0
+
+    @property
+    def computed_count(self):
+        return self.result.computed_count if self.result else 0
+
+    def start_job(self, api_key, source_path=RAG_CSV_PATH):
+        """백그라운드 쓰레드 시작 (이미 실행 중이거나 결과가 있으면 합류만 함)"""
+        with self._lock:
+            if self.is_running or self.result is not None:
+                return False
+            self.is_running = True
+            self.error_msg = None
+            self.progress = 0.0
+
+        thread = threading.Thread(target=self._run_embedding, args=(api_key, source_path), daemon=True)
+        thread.start()
+        return True
+
+    def reset(self):
+        """실패한 작업을 지우고 다시 시작할 수 있게 함"""
+        with self._lock:
+            if self.is_running:
+                return
+            self.result = None
+            self.error_msg = None
+            self.progress = 0.0
+
+    def _load_from_store(self, model, source_path):
+        """(저장소 내용, 원본 서명, 원본이 그대로인지) 반환"""
+        stored = self.store.load(model)
+        manifest = stored[0] if stored else None
+        signature = source_signature(source_path, manifest.get("source") if manifest else None)
+        return stored, signature, bool(stored) and self.store.is_fresh(manifest, signature)
+
+    def _build_ann(self, model, df_docs, vectors):
+        """전체 리뷰 검색용 IVF 인덱스 (디스크에서 로드 후 새 문서만 증분 삽입)"""
+        path = os.path.join(DEFAULT_ANN_DIR, re.sub(r"[^\w.-]", "_", model) + ".npz")
+        keys = df_docs['key'].values
+        first = ~df_docs['key'].duplicated().values
+
+        ann = IVFIndex.load(path)
+        if ann is not None and ann.dim == vectors.shape[1] and ann.codec_name == self.vector_codec:
+            stale = ~np.isin(ann.keys, keys)
+            if stale.mean() > 0.2:
+                ann = None      # 사라진 문서가 많으면 군집부터 다시 학습
+            else:
+                new = first & ~np.isin(keys, ann.keys)
+                if not new.any():
+                    return ann
+                ann.add(np.asarray(vectors)[new], keys[new])
+        else:
+            ann = None
+        if ann is None:
+            ann = IVFIndex.build(np.asarray(vectors)[first], keys[first], codec=make_codec(self.vector_codec))
+        try:
+            ann.save(path)
+        except OSError:
+            pass
+        return ann
+
+    def _build_lexical(self, model, index):
+        """근거 리뷰 BM25 색인 (GameQuoteIndex 행 순서, 저장된 색인의 같은 문서 행은 재사용)"""
+        path = os.path.join(DEFAULT_LEXICAL_DIR, re.sub(r"[^\w.-]", "_", model) + ".npz")
+        keys = index.df_docs['key'].values
+        previous = BM25Index.load(path)
+        if previous is not None and len(previous) == len(keys) and (previous.keys == keys).all():
+            return previous
+        lexical = BM25Index.build(index.df_docs['raw_quote'].fillna("").astype(str).values, keys, previous=previous)
+        try:
+            lexical.save(path)
+        except OSError:
+            pass
+        return lexical
+
+    def search_all(self, query_vec, k=10, nprobe=None):
+        """전체 리뷰 대상 근사 검색 결과 (score 열 포함 DataFrame)"""
+        result = self.result
+        if result is None or result.ann_index is None:
+            return None
+        compressed = result.ann_index.codec is not None
+        n_cand = k * result.index.rescore_factor if compressed else k
+        scores, keys = result.ann_index.search(query_vec, k=n_cand, nprobe=nprobe)
+        found = pd.notna(keys[0])
+        keys, scores = keys[0][found], scores[0][found]
+        if compressed:
+            # 압축 코드로 뽑은 후보를 float32 로 다시 채점 (원본에서 사라진 문서는 제외)
+            rows = result.index.rows_for_keys(keys)
+            keys, rows = keys[rows >= 0], rows[rows >= 0]
+            scores = result.index.exact_scores(rows, query_vec)
+            best = np.argsort(-scores, kind="stable")[:k]
+            keys, scores = keys[best], scores[best]
+        df_hits = result.df_docs.drop_duplicates('key').set_index('key').reindex(keys)
+        df_hits['score'] = scores
+        # 원본에서 사라진 문서는 제외
+        return df_hits.dropna(subset=['raw_quote']).reset_index()
+
+    def search_hybrid(self, query_text, query_vec=None, k=10, nprobe=None, fusion="rrf", alpha=0.5):
+        """전체 리뷰 대상 하이브리드 검색 (BM25 후보 + ANN 후보를 합쳐 점수 결합)
+
+        query_vec 이 None 이면 (네트워크 없이) BM25 만으로 검색합니다.
+        """
+        result = self.result
+        if result is None or result.lexical is None:
+            return None
+        index = result.index
+        lexical = result.lexical.scores(query_text)
+        rows, _ = result.lexical.search(query_text, k * 4)       # 질의 용어가 있는 문서만
+        if query_vec is not None and result.ann_index is not None:
+            _, keys = result.ann_index.search(query_vec, k=k * 4, nprobe=nprobe)
+            ann_rows = index.rows_for_keys(keys[0][pd.notna(keys[0])])
+            rows = np.union1d(rows, ann_rows[ann_rows >= 0])
+        if len(rows) == 0:
+            return index.df_docs.iloc[0:0].assign(score=pd.Series(dtype=np.float32))
+
+        if query_vec is None:
+            dense = np.zeros(len(rows), dtype=np.float32)
+            fused = lexical[rows]
+        else:
+            dense = index.exact_scores(rows, query_vec)
+            fused = fuse_scores(dense, lexical[rows], fusion, alpha)
+        best = np.argsort(-fused, kind="stable")[:k]
+        return index.df_docs.iloc[rows[best]].assign(
+            score=dense[best], lexical_score=lexical[rows[best]], fused_score=fused[best]).reset_index(drop=True)
+
+    def _finish(self, df_docs, vectors, reused, computed, model, signature):
+        df_docs, vectors = _freeze(df_docs, vectors)
+        self.status_text = "검색 인덱스 생성 중..."
+        index = GameQuoteIndex(df_docs, vectors, codec=make_codec(self.vector_codec))
+        ann = self._build_ann(model, df_docs, vectors)
+        lexical = self._build_lexical(model, index)
+        # (백엔드, 원본 CSV 내용, 문서 수) 버전: 결과 캐시 키에 사용
+        version = f"{model}@{(signature or {}).get('sha1', '')[:12]}#{len(df_docs)}"
+        self.result = EmbeddingResult(df_docs, vectors, reused, computed, index, ann, version, lexical)
+        self.status_text = f"완료! (재사용 {reused}개 / 신규 {computed}개)"
+        self.progress = 1.0
+
+    def _save_partial(self, model, doc_chunks, vectors_by_key, stored, signature):
+        """배치 실패 시 중간 저장 (다음 시도에서 재사용)
+
+        읽은 청크 중 벡터가 있는 문서에, 아직 읽지 않은 청크의 저장 문서를 더해 저장하므로
+        중간에 실패해도 저장소가 줄어들지 않습니다.
+        """
+        df_partial = pd.concat(doc_chunks, ignore_index=True)
+        seen = df_partial['key']
+        df_partial = df_partial[seen.isin(vectors_by_key.keys())].reset_index(drop=True)
+        partial = np.array([vectors_by_key[k] for k in df_partial['key']], dtype=np.float32)
+        if stored is not None:
+            _, df_stored, stored_vectors = stored
+            rest = ~df_stored['key'].isin(seen).to_numpy()
+            if rest.any():
+                df_partial = pd.concat([df_partial, df_stored[rest]], ignore_index=True)
+                partial = np.concatenate([partial.reshape(-1, stored_vectors.shape[1]),
+                                          np.asarray(stored_vectors[rest], dtype=np.float32)])
+        if len(df_partial):
+            self.store.save(model, df_partial, partial, signature, complete=False)
+
+    def _run_embedding(self, api_key, source_path):
+        """실제 백그라운드 임베딩 작업
+
+        원본 CSV 를 청크 단위로 전처리하면서, 청크마다 저장소에 없는 문서만
+        임베딩 파이프라인으로 넘깁니다. 검색 색인에 전체 문서 표와 벡터가 필요하므로
+        작업 중 메모리는 문서 수에 비례합니다 (청크로 나누는 것은 CSV 파싱과 임베딩 호출 단위).
+        """
+        try:
+            self.backend.configure(api_key=api_key)
+            # 저장소 키/디렉터리에 백엔드 id 를 써서 다른 백엔드 벡터와 섞이지 않게 함
+            model = self.backend.id
+
+            self.status_text = "저장된 임베딩 확인 중..."
+            stored, signature, fresh = self._load_from_store(model, source_path)
+            if fresh:
+                _, df_docs, vectors = stored
+                self._finish(df_docs, vectors, len(df_docs), 0, model, signature)
+                return
+
+            stats = DocumentStreamStats()
+            # 저장 표의 키 -> 행 색인은 한 번만 만들어 청크마다 재사용
+            positions = self.store.key_positions(stored)
+            doc_chunks = []
+            vectors_by_key = {}
+            computed = 0
+            self.status_text = "데이터 전처리 중..."
+
+            for df_chunk in iter_document_chunks(source_path, stats=stats):
+                if df_chunk.empty:
+                    continue
+                df_chunk['key'] = [make_key(model, t) for t in df_chunk['text']]
+                doc_chunks.append(df_chunk)
+
+                # 저장소에 있는 벡터는 재사용, 없는 문서만 임베딩
+                vectors_by_key.update(self.store.lookup(model, df_chunk['key'], stored=stored, positions=positions))
+                df_missing = df_chunk.drop_duplicates('key')
+                df_missing = df_missing[~df_missing['key'].isin(vectors_by_key.keys())]
+                keys = df_missing['key'].tolist()
+
+                def _on_progress(done, total):
+                    self.status_text = (f"임베딩 생성 중... ({computed + done:,}개 신규 / 문서 {stats.docs:,}개, "
+                                        f"전처리 {stats.rows_per_sec:,.0f} rows/s)")
+
+                try:
+                    new_vectors = embed_texts(df_missing['text'].tolist(), self.backend.embed_batch,
+                                              on_progress=_on_progress, **self.pipeline_options)
+                except EmbeddingBatchError as e:
+                    # 완료된 벡터만 중간 저장해 두고 (다음 시도에서 재사용) 실패로 처리
+                    vectors_by_key.update((keys[i], vec) for i, vec in e.partial.items())
+                    self._save_partial(model, doc_chunks, vectors_by_key, stored, signature)
+                    raise
+                vectors_by_key.update(zip(keys, new_vectors))
+                computed += len(keys)
+                self.progress = min(stats.fraction, 0.99)
+
+            if not doc_chunks:
+                self.error_msg = "분석할 텍스트 데이터가 없습니다."
+                return
+
+            df_docs = pd.concat(doc_chunks, ignore_index=True)
+            embeddings = np.array([vectors_by_key[k] for k in df_docs['key']], dtype=np.float32)
+            reused = int(df_docs['key'].nunique()) - computed
+
+            self.store.save(model, df_docs, embeddings, signature)
+            # 방금 만든 배열 대신 저장소 memmap 을 공유해 float32 원본이 메모리에 상주하지 않게 함
+            stored = self.store.load(model)
+            if stored is not None:
+                _, df_docs, embeddings = stored
+            self._finish(df_docs, embeddings, reused, computed, model, signature)
+
+        except Exception as e:
+            self.error_msg = f"임베딩 실패: {e}"
+        finally:
+            self.is_running = False
@@ -0,0 +1,143 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatchError(RuntimeError):
+    """재시도를 모두 소진한 배치가 있을 때 (완료된 벡터는 partial 에 보존)"""
+
+    def __init__(self, message, partial):
+        super().__init__(message)
+        self.partial = partial      # {문서 위치: 벡터}
+
+
+def estimate_tokens(text):
+    """토큰 수 대략 추정 (한글 포함, UTF-8 4바이트당 1토큰)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+def pipeline_options_from_env(defaults=None):
+    """환경 변수로 동시성/속도 제한 설정 (없으면 백엔드 기본값)"""
+    options = {"batch_size": 50, "max_workers": 4, "rpm": None, "tpm": None, "max_retries": 6}
+    options.update(defaults or {})
+    for key, env in [("batch_size", "EMBED_BATCH_SIZE"), ("max_workers", "EMBED_MAX_WORKERS"),
+                     ("rpm", "EMBED_RPM"), ("tpm", "EMBED_TPM"), ("max_retries", "EMBED_MAX_RETRIES")]:
+        value = os.environ.get(env)
+        if value:
+            options[key] = int(value)
+    return options
+
+
+class RateLimiter:
+    """분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷"""
+
+    def __init__(self, rpm=None, tpm=None, clock=time.monotonic, sleep=time.sleep):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        now = clock()
+        self._req_allowance = float(rpm or 0)
+        self._tok_allowance = float(tpm or 0)
+        self._last = now
+
+    def _refill(self, now):
+        elapsed = now - self._last
+        self._last = now
+        if self.rpm:
+            self._req_allowance = min(self.rpm, self._req_allowance + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self._tok_allowance = min(self.tpm, self._tok_allowance + elapsed * self.tpm / 60.0)
+
+    def acquire(self, tokens=1):
+        """요청 1건 + tokens 만큼 여유가 생길 때까지 대기"""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                wait = 0.0
+                if self.rpm and self._req_allowance < 1:
+                    wait = max(wait, (1 - self._req_allowance) * 60.0 / self.rpm)
+                if self.tpm and self._tok_allowance < tokens:
+                    wait = max(wait, (tokens - self._tok_allowance) * 60.0 / self.tpm)
+                if wait <= 0:
+                    if self.rpm:
+                        self._req_allowance -= 1
+                    if self.tpm:
+                        self._tok_allowance -= tokens
+                    return
+            self._sleep(wait)
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """지수 백오프 + full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def embed_texts(texts, embed_batch, batch_size=50, max_workers=4, rpm=None, tpm=None,
+                max_retries=6, base_delay=1.0, max_delay=30.0, on_progress=None,
+                sleep=time.sleep):
+    """texts 를 배치로 나눠 병렬 임베딩하고 입력 순서 그대로 float32 행렬로 반환
+
+    embed_batch(list[str]) -> list[vector] 는 배치 하나를 임베딩하는 함수입니다.
+    실패한 배치는 백오프 후 재시도하며, 끝내 실패하면 건너뛰지 않고
+    EmbeddingBatchError 를 발생시킵니다 (행 순서가 어긋나는 일이 없음).
+    on_progress(done, total) 는 문서 단위로 호출되고, 재시도는 logging 경고로 남깁니다.
+    """
+    total = len(texts)
+    if total == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    limiter = RateLimiter(rpm=rpm, tpm=tpm)
+    batches = [(start, texts[start:start + batch_size]) for start in range(0, total, batch_size)]
+    results = {}
+    done = 0
+
+    def _run(start, batch):
+        tokens = sum(estimate_tokens(t) for t in batch)
+        for attempt in range(max_retries + 1):
+            limiter.acquire(tokens)
+            try:
+                vectors = embed_batch(batch)
+                if len(vectors) != len(batch):
+                    raise ValueError(f"배치 크기 불일치: {len(vectors)} != {len(batch)}")
+                return start, vectors
+            except Exception as e:
+                if attempt == max_retries:
+                    raise
+                logger.warning("임베딩 배치 %d 실패, 재시도 %d/%d: %s", start, attempt + 1, max_retries, e)
+                sleep(backoff_delay(attempt, base_delay, max_delay))
+
+    failure = None
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(_run, start, batch) for start, batch in batches]
+        for future in as_completed(futures):
+            try:
+                start, vectors = future.result()
+            except Exception as e:
+                if failure is None:
+                    failure = e
+                    # 아직 시작하지 않은 배치는 취소
+                    for f in futures:
+                        f.cancel()
+                continue
+            for offset, vec in enumerate(vectors):
+                results[start + offset] = vec
+            done += len(vectors)
+            if on_progress:
+                on_progress(done, total)
+
+    if failure is not None:
+        raise EmbeddingBatchError(f"배치 임베딩 실패: {failure}", results)
+
+    return np.asarray([results[i] for i in range(total)], dtype=np.float32)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_STORE_DIR = os.path.join("data", "cache", "embeddings")
+
+
+def make_key(model, text):
+    """(모델명, 문서 텍스트) 해시 키"""
+    return hashlib.sha1(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_signature(path, previous=None):
+    """원본 CSV 서명 (크기/수정시각이 같으면 해시 재계산 생략)"""
+    stat = os.stat(path)
+    sig = {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous and all(previous.get(k) == sig[k] for k in ("path", "size", "mtime_ns")):
+        sig["sha1"] = previous.get("sha1")
+    else:
+        sig["sha1"] = file_sha1(path)
+    return sig
+
+
+class EmbeddingStore:
+    """content-addressed 임베딩 저장소
+
+    모델별 디렉터리에 벡터(float32 .npy, memmap 로드)와 문서 테이블(parquet),
+    원본 CSV 서명을 담은 manifest 를 저장합니다.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+
+    def _model_dir(self, model):
+        return os.path.join(self.root, re.sub(r"[^\w.-]", "_", model))
+
+    def _paths(self, model):
+        d = self._model_dir(model)
+        return {
+            "manifest": os.path.join(d, "manifest.json"),
+            "docs": os.path.join(d, "docs.parquet"),
+            "vectors": os.path.join(d, "vectors.npy"),
+        }
+
+    def load(self, model):
+        """저장된 (manifest, 문서 테이블, 벡터 memmap) 반환, 없으면 None"""
+        paths = self._paths(model)
+        if not all(os.path.exists(p) for p in paths.values()):
+            return None
+        try:
+            with open(paths["manifest"], "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            df_docs = pd.read_parquet(paths["docs"])
+            vectors = np.load(paths["vectors"], mmap_mode="r")
+        except Exception:
+            return None
+        if len(df_docs) != len(vectors):
+            return None
+        return manifest, df_docs, vectors
+
+    def is_fresh(self, manifest, signature):
+        """원본 CSV 가 그대로이고, 저장 당시 모든 문서가 임베딩된 상태였는지"""
+        if not manifest or not manifest.get("complete", True):
+            return False
+        return manifest.get("source", {}).get("sha1") == signature.get("sha1")
+
+    @staticmethod
+    def key_positions(stored):
+        """저장된 문서 표의 키 -> 행 번호 (중복 키는 첫 행, 저장소가 비어 있으면 None)"""
+        if stored is None:
+            return None
+        _, df_stored, _ = stored
+        pos = pd.Series(np.arange(len(df_stored)), index=df_stored["key"].values)
+        return pos[~pos.index.duplicated()]
+
+    def lookup(self, model, keys, stored=None, positions=None):
+        """키 목록에 대해 (재사용 벡터 dict) 반환
+
+        stored 를 넘기면 다시 읽지 않고, positions(key_positions 결과) 까지 넘기면
+        청크마다 전체 저장 표의 색인을 다시 만들지 않습니다.
+        """
+        if stored is None:
+            stored = self.load(model)
+        if stored is None:
+            return {}
+        _, _, vectors = stored
+        if positions is None:
+            positions = self.key_positions(stored)
+        hit = positions.reindex(pd.Index(keys).unique()).dropna().astype(int)
+        return {k: vectors[i] for k, i in hit.items()}
+
+    def save(self, model, df_docs, vectors, signature, complete=True):
+        """현재 문서 집합으로 저장소를 교체 (원본에서 사라진 문서는 정리됨)
+
+        complete=False 는 일부 배치가 실패한 중간 저장으로, 다음 실행에서
+        저장된 벡터는 재사용하되 빠진 문서는 다시 임베딩합니다.
+        """
+        paths = self._paths(model)
+        os.makedirs(self._model_dir(model), exist_ok=True)
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        tmp_vec = paths["vectors"] + ".tmp.npy"
+        tmp_docs = paths["docs"] + ".tmp"
+        tmp_manifest = paths["manifest"] + ".tmp"
+
+        np.save(tmp_vec, vectors)
+        df_docs.reset_index(drop=True).to_parquet(tmp_docs, index=False)
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": model,
+                "source": signature,
+                "count": int(len(df_docs)),
+                "complete": bool(complete),
+                "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+            }, f, ensure_ascii=False, indent=2)
+
+        os.replace(tmp_vec, paths["vectors"])
+        os.replace(tmp_docs, paths["docs"])
+        os.replace(tmp_manifest, paths["manifest"])
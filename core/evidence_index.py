@@ -0,0 +1,205 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core.persona_store import QUOTE_TYPES
+from core.result_cache import ResultCache
+from core.snapshot_store import INSIGHT_GLOBS, insight_files, snapshot_id
+
+
+EVIDENCE_COLUMNS = ["snapshot", "platform", "segment_id", "evidence_type", "source", "key", "value", "text", "chart_name"]
+CATEGORICAL_COLUMNS = ["snapshot", "platform", "evidence_type", "source", "key", "text", "chart_name"]
+_SEP = "\x1f"        # 검색 버퍼의 행 구분자 (본문에 나오지 않는 문자)
+
+
+def _records(path):
+    """인사이트 JSON 하나 -> 근거 행 dict 목록 (스냅샷마다 다른 필드 구성을 한 스키마로 맞춤)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    meta = data.get("analysis_metadata", {}) or {}
+    platform = str(meta.get("target") or os.path.basename(path).split("_")[0]).lower()
+    snapshot = snapshot_id(path)
+    out = []
+    for seg in data.get("segments", []):
+        refs = (seg.get("persona_profile", {}) or {}).get("evidence_refs", []) or []
+        for ref in refs:
+            etype = ref.get("evidence_type")
+            etype = "quote" if etype in QUOTE_TYPES else etype
+            value = ref.get("value")
+            # 인용 본문은 value, 예전 스냅샷은 note 에 들어 있음
+            text = value if etype == "quote" else None
+            if etype == "quote" and not text:
+                text = ref.get("note")
+            out.append({
+                "snapshot": snapshot, "platform": platform,
+                "segment_id": ref.get("segment_id", seg.get("segment_id")),
+                "evidence_type": etype, "source": ref.get("source"), "key": ref.get("key"),
+                "value": None if etype == "quote" else value, "text": text or None,
+                "chart_name": ref.get("chart_name"),
+            })
+    return out
+
+
+class EvidenceIndex:
+    """모든 인사이트 파일의 evidence_refs 를 한 장으로 펼친 열 지향 표
+
+    문자열 열은 모두 범주형(사전 인코딩)이라 필터는 정수 코드 비교로 끝나고,
+    value 는 숫자로 파싱해 float 열(숫자가 아니면 NaN)로 둡니다.
+    인용 검색은 서로 다른 본문만 소문자로 이어 붙인 버퍼 하나를 훑어 본문 코드를 찾고,
+    코드 -> 행 변환은 룩업 배열 한 번으로 끝냅니다 (같은 인용이 스냅샷마다 반복돼도 한 번만 검사).
+    """
+
+    def __init__(self, df):
+        df = df.reindex(columns=EVIDENCE_COLUMNS).reset_index(drop=True)
+        df["segment_id"] = pd.to_numeric(df["segment_id"], errors="coerce").fillna(-1).astype(np.int32)
+        df["value"] = pd.to_numeric(df["value"], errors="coerce").astype(np.float64)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        self.df = df
+        self._codes = {col: df[col].cat.codes.to_numpy() for col in CATEGORICAL_COLUMNS}
+        self._segment = df["segment_id"].to_numpy()
+        self._value = df["value"].to_numpy()
+
+        # 검색 버퍼: 서로 다른 본문마다 (소문자 본문 + 구분자), _starts[i] = i 번째 본문 시작 위치
+        texts = [str(t).lower() for t in df["text"].cat.categories]
+        self._buffer = _SEP.join(texts) + _SEP
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+        self._starts = np.cumsum(lengths) - lengths
+        self._searches = ResultCache(maxsize=64)        # 검색어 -> 본문 코드 (인덱스가 바뀌면 인스턴스째 교체)
+
+    @classmethod
+    def build(cls, paths=None):
+        paths = insight_files() if paths is None else paths
+        rows = [r for p in paths for r in _records(p)]
+        return cls(pd.DataFrame(rows, columns=EVIDENCE_COLUMNS))
+
+    def __len__(self):
+        return len(self.df)
+
+    def categories(self, col):
+        return list(self.df[col].cat.categories)
+
+    def _isin(self, col, values):
+        """범주형 열이 values 중 하나인 행 (코드 배열 비교)"""
+        if isinstance(values, str):
+            values = [values]
+        cats = self.df[col].cat.categories
+        codes = cats.get_indexer(list(values))
+        lut = np.zeros(len(cats) + 1, dtype=bool)           # 마지막 칸 = 결측(코드 -1)
+        lut[codes[codes >= 0]] = True
+        return lut[self._codes[col]]
+
+    def mask(self, snapshot=None, platform=None, evidence_type=None, source=None, key=None, segment=None,
+             value_min=None, value_max=None):
+        """조건을 모두 만족하는 행 bool 배열 (None 인 조건은 건너뜀, 값 범위는 숫자 값이 있는 행만)"""
+        m = np.ones(len(self.df), dtype=bool)
+        for col, values in (("snapshot", snapshot), ("platform", platform), ("evidence_type", evidence_type),
+                            ("source", source), ("key", key)):
+            if values is not None:
+                m &= self._isin(col, values)
+        if segment is not None:
+            m &= np.isin(self._segment, np.atleast_1d(segment))
+        if value_min is not None:
+            m &= self._value >= value_min
+        if value_max is not None:
+            m &= self._value <= value_max
+        return m
+
+    def _search_codes(self, query):
+        """query 가 들어 있는 본문 코드 (대소문자 무시, 검색어별 캐시)"""
+        codes = self._searches.get(query)
+        if codes is None:
+            positions = np.fromiter((m.start() for m in re.finditer(re.escape(query), self._buffer)), dtype=np.int64)
+            codes = np.unique(np.searchsorted(self._starts, positions, side="right") - 1)
+            self._searches.put(query, codes)
+        return codes
+
+    def search_mask(self, query):
+        """본문에 query 가 들어 있는 행 bool 배열"""
+        query = str(query).lower()
+        if not query or _SEP in query:
+            return np.zeros(len(self.df), dtype=bool)
+        lut = np.zeros(len(self._starts) + 1, dtype=bool)    # 마지막 칸 = 본문 없음(코드 -1)
+        lut[self._search_codes(query)] = True
+        return lut[self._codes["text"]]
+
+    def search_rows(self, query):
+        """본문에 query 가 들어 있는 행 번호 (오름차순)"""
+        return np.flatnonzero(self.search_mask(query))
+
+    def query(self, text=None, limit=None, **filters):
+        """필터 + 본문 검색 결과 DataFrame (원래 행 순서)"""
+        m = self.mask(**filters)
+        if text:
+            m &= self.search_mask(text)
+        rows = np.flatnonzero(m)
+        if limit is not None:
+            rows = rows[:limit]
+        return self.df.iloc[rows]
+
+
+class EvidenceStore:
+    """EvidenceIndex 를 한 번 만들어 두고, 인사이트 파일 구성/크기/수정 시각이 바뀔 때만 다시 만듦"""
+
+    def __init__(self, patterns=INSIGHT_GLOBS):
+        self.patterns = patterns
+        self._lock = threading.Lock()
+        self._signature = None
+        self._index = None
+
+    def _files_signature(self):
+        sig = []
+        for path in insight_files(self.patterns):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            sig.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(sig)
+
+    def get(self):
+        signature = self._files_signature()
+        if self._index is not None and signature == self._signature:
+            return self._index
+        with self._lock:
+            if self._index is None or signature != self._signature:
+                paths = [p for p, _, _ in signature]
+                self._index, self._signature = EvidenceIndex.build(paths), signature
+            return self._index
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.evidence_index [배수]  (인사이트 근거를 배수만큼 복제해 필터/검색 속도 리포트)
+    import sys
+    import time
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    base = EvidenceIndex.build()
+    print(f"{len(base)} evidence rows from {base.df['snapshot'].nunique()} snapshots")
+    rows = pd.concat([base.df.astype(object)] * scale, ignore_index=True)
+    # 최악의 경우: 인용 본문이 전부 서로 다름 (행 번호를 붙여 중복 제거 효과를 없앰)
+    unique = rows.copy()
+    quote = unique["text"].notna()
+    unique.loc[quote, "text"] = unique.loc[quote, "text"] + " #" + unique.index[quote].astype(str)
+
+    def _timed(label, fn, repeat=10):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            out = fn()
+        print(f"  {label:<34} {(time.perf_counter() - t0) / repeat * 1000:8.2f} ms  ({len(out):,} rows)")
+
+    for name, df in (("repeated quotes", rows), ("all-unique quotes", unique)):
+        t0 = time.perf_counter()
+        index = EvidenceIndex(df)
+        print(f"x{scale} {name}: {len(index):,} rows, build {time.perf_counter() - t0:.2f}s")
+        _timed("filter key + segment", lambda: index.query(key=["recommended", "playtime"], segment=[0, 1]))
+        _timed("filter metric value range", lambda: index.query(evidence_type="metric", value_min=0.5, value_max=1.0))
+        for q in ("스토리", "게임", "존재하지않는문장"):
+            _timed(f"search '{q}' (first)", lambda: index.search_rows(q), repeat=1)
+            _timed(f"search '{q}' (cached)", lambda: index.search_rows(q))
+        _timed("pandas str.contains '게임'",
+               lambda: np.flatnonzero(index.df["text"].astype(object).str.contains("게임", regex=False, na=False)), 1)
@@ -0,0 +1,152 @@
+import os
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+DEFAULT_LEXICAL_DIR = os.path.join("data", "cache", "lexical")
+
+# 팀 역량 차원별 어휘 질의 (리뷰에 글자 그대로 등장하는 표현)
+DIM_KEYWORDS = {
+    "아트": "아트 그래픽 비주얼 디자인 일러스트 캐릭터",
+    "연출": "연출 컷신 카메라 분위기 사운드 몰입",
+    "서사": "서사 스토리 세계관 이야기 시나리오 엔딩",
+    "조작감": "조작감 조작 타격감 손맛 컨트롤 키감",
+    "시스템복잡도": "시스템 복잡 깊이 전략 빌드 메커니즘",
+    "컨텐츠설계량": "컨텐츠 콘텐츠 볼륨 분량 파밍 던전 맵",
+    "엔진": "엔진 그래픽 최적화 프레임 렉 버그",
+    "네트워크": "네트워크 서버 멀티 매칭 핑 접속 렉",
+    "운영": "운영 업데이트 패치 이벤트 소통 운영진",
+    "BM": "BM 과금 가챠 결제 유료 패스 현질 무과금",
+}
+
+
+def _vectorizer(n_features):
+    # 띄어쓰기/조사 변형에 강한 한글 문자 n-gram (어휘 사전 없이 해싱 → 증분 추가 가능)
+    return HashingVectorizer(analyzer="char_wb", ngram_range=(2, 3), n_features=n_features,
+                             alternate_sign=False, norm=None, lowercase=True, dtype=np.float32)
+
+
+class BM25Index:
+    """문자 n-gram BM25 역색인 (CSC 희소 행렬 = 용어별 posting list)
+
+    행 순서는 build 에 넘긴 문서 순서를 그대로 따릅니다.
+    """
+
+    def __init__(self, tf, keys, k1=1.2, b=0.75, n_features=2 ** 20):
+        self.k1 = k1
+        self.b = b
+        self.n_features = n_features
+        self.keys = np.asarray(keys, dtype=object)
+        self._vec = _vectorizer(n_features)
+        self._set_tf(tf.tocsr())
+
+    def _set_tf(self, tf_csr):
+        tf_csr.sort_indices()
+        self._tf_csr = tf_csr                                       # 증분 재사용용 (문서 -> 용어)
+        self._tf = tf_csr.tocsc()                                   # 검색용 (용어 -> 문서)
+        self.doc_len = np.asarray(tf_csr.sum(axis=1)).ravel().astype(np.float32)
+        self.avgdl = float(self.doc_len.mean()) if len(self.doc_len) else 0.0
+        df = np.diff(self._tf.indptr).astype(np.float32)
+        n = max(len(self.doc_len), 1)
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, texts, keys, previous=None, **kwargs):
+        """문서 BM25 색인 생성 (previous 에 같은 키가 있으면 그 행을 재사용)"""
+        kwargs.setdefault("n_features", previous.n_features if previous is not None else 2 ** 20)
+        vec = _vectorizer(kwargs["n_features"])
+        keys = np.asarray(keys, dtype=object)
+        if previous is None or len(previous) == 0:
+            return cls(vec.transform(list(texts)), keys, **kwargs)
+
+        prev_pos = {k: i for i, k in enumerate(previous.keys)}
+        reuse = np.array([prev_pos.get(k, -1) for k in keys], dtype=np.int64)
+        new = np.flatnonzero(reuse < 0)
+        texts = np.asarray(texts, dtype=object)
+
+        # 재사용 행과 새 행을 모은 뒤 원래 순서로 재배열
+        parts = [previous._tf_csr[reuse[reuse >= 0]]]
+        order = [np.flatnonzero(reuse >= 0)]
+        if len(new):
+            parts.append(vec.transform(list(texts[new])))
+            order.append(new)
+        stacked = sp.vstack(parts, format="csr")
+        inverse = np.empty(len(keys), dtype=np.int64)
+        inverse[np.concatenate(order)] = np.arange(len(keys))
+        return cls(stacked[inverse], keys, **kwargs)
+
+    def scores(self, query):
+        """전체 문서에 대한 BM25 점수 (질의 용어의 posting 만 훑음)"""
+        n = len(self.keys)
+        q = self._vec.transform([query])
+        terms, qtf = q.indices, q.data
+        if len(terms) == 0 or n == 0:
+            return np.zeros(n, dtype=np.float32)
+        sub = self._tf[:, terms].tocoo()
+        tf = sub.data
+        dl = self.doc_len[sub.row]
+        denom = tf + self.k1 * (1 - self.b + self.b * dl / max(self.avgdl, 1e-9))
+        weight = self.idf[terms[sub.col]] * qtf[sub.col] * tf * (self.k1 + 1) / denom
+        return np.bincount(sub.row, weights=weight, minlength=n).astype(np.float32)
+
+    def search(self, query, k=10):
+        """(행 번호, 점수) 상위 k 개 (질의 용어가 하나도 없는 점수 0 문서는 빼므로 k 개보다 적을 수 있음)"""
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), scores[:0]
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        top = top[scores[top] > 0]
+        return top, scores[top]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        tf = self._tf_csr
+        np.savez(tmp, indptr=tf.indptr.astype(np.int64), indices=tf.indices.astype(np.int32),
+                 data=tf.data.astype(np.float32), shape=np.array(tf.shape, dtype=np.int64),
+                 keys=self.keys.astype(str), params=np.array([self.k1, self.b, self.n_features], dtype=np.float64))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            data = np.load(path, allow_pickle=False)
+            tf = sp.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"]))
+            k1, b, n_features = data["params"]
+            return cls(tf, data["keys"].astype(object), k1=float(k1), b=float(b), n_features=int(n_features))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def _ranks(scores):
+    """내림차순 순위 (1부터)"""
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.float32)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def fuse_scores(dense, lexical, method="rrf", alpha=0.5, k_rrf=60):
+    """dense/lexical 점수 결합
+
+    rrf  : Σ 1 / (k_rrf + 순위)  (점수 척도 차이에 강함)
+    blend: alpha * dense + (1 - alpha) * lexical  (각각 min-max 정규화 후)
+    """
+    dense = np.asarray(dense, dtype=np.float32)
+    lexical = np.asarray(lexical, dtype=np.float32)
+    if method == "rrf":
+        # 어휘 일치가 전혀 없는 문서는 lexical 순위 기여 없이 dense 순위만 반영
+        lexical_part = np.where(lexical > 0, 1.0 / (k_rrf + _ranks(lexical)), 0.0)
+        return (1.0 / (k_rrf + _ranks(dense)) + lexical_part).astype(np.float32)
+
+    def _minmax(x):
+        span = x.max() - x.min() if len(x) else 0
+        return (x - x.min()) / span if span > 0 else np.zeros_like(x)
+    return alpha * _minmax(dense) + (1 - alpha) * _minmax(lexical)
@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import deque
+
+
+class RunCounter:
+    """페이지 스크립트 실행 횟수 집계 (최근 1분 창, 프로세스 전체)"""
+
+    def __init__(self, window=60.0, clock=time.monotonic):
+        self.window = window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._events = {}    # 페이지 -> deque[실행 시각]
+        self.totals = {}
+
+    def record(self, page):
+        now = self._clock()
+        with self._lock:
+            events = self._events.setdefault(page, deque())
+            events.append(now)
+            self.totals[page] = self.totals.get(page, 0) + 1
+            self._trim(events, now)
+
+    def _trim(self, events, now):
+        while events and now - events[0] > self.window:
+            events.popleft()
+
+    def per_minute(self, page):
+        now = self._clock()
+        with self._lock:
+            events = self._events.get(page)
+            if not events:
+                return 0
+            self._trim(events, now)
+            return len(events) * 60.0 / self.window
+
+
+class LatencyStats:
+    """구간별 소요 시간 표본 (이름별 최근 maxlen 개, 프로세스 전체)"""
+
+    def __init__(self, maxlen=200):
+        self._lock = threading.Lock()
+        self._samples = {}   # 이름 -> deque[초]
+        self.maxlen = maxlen
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.maxlen)).append(seconds)
+
+    def summary(self, name):
+        """{"count", "last_ms", "p50_ms", "p90_ms"} (표본이 없으면 None)"""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+            if not samples:
+                return None
+            last = self._samples[name][-1]
+        pct = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+        return {"count": len(samples), "last_ms": last * 1000, "p50_ms": pct(0.5), "p90_ms": pct(0.9)}
@@ -0,0 +1,47 @@
+import os
+import re
+from collections import namedtuple
+
+
+PERSONA_DIR = os.path.join("data", "insights")
+QUOTE_TYPES = ("quote", "quite")     # 원본 JSON 에 오타(quite)로 들어간 항목도 인용으로 취급
+
+# 세그먼트 하나의 페르소나 (읽기 전용, 리스트 필드는 tuple)
+SegmentPersona = namedtuple("SegmentPersona", [
+    "platform", "segment_id", "segment_size", "segment_ratio",
+    "persona_name", "one_liner", "description", "key_characteristics", "needs", "pain_points",
+    "recommended_actions", "target_priority", "retention_risk", "monetization_potential",
+    "evidence_refs", "quotes",
+])
+
+
+def format_quote(text):
+    """~~취소선~~ 을 <del> 태그로 변환"""
+    return re.sub(r'~~(.*?)~~', r'<del>\1</del>', text)
+
+
+def segment_persona(platform, seg):
+    """인사이트 JSON 의 segments 항목 하나 -> SegmentPersona"""
+    profile = seg.get("persona_profile", {}) or {}
+    refs = tuple(profile.get("evidence_refs", []) or [])
+    # 예전 스냅샷은 인용 본문이 value 대신 note 에 들어 있음
+    quotes = tuple(format_quote(e.get("value") or e.get("note")) for e in refs
+                   if e.get("evidence_type") in QUOTE_TYPES and (e.get("value") or e.get("note")))
+    return SegmentPersona(
+        platform=platform,
+        segment_id=seg.get("segment_id"),
+        segment_size=seg.get("segment_size"),
+        segment_ratio=seg.get("segment_ratio"),
+        persona_name=profile.get("persona_name", "N/A"),
+        one_liner=profile.get("one_liner", ""),
+        description=profile.get("description", "설명 데이터가 없습니다."),
+        key_characteristics=tuple(profile.get("key_characteristics", [])),
+        needs=tuple(profile.get("needs", [])),
+        pain_points=tuple(profile.get("pain_points", [])),
+        recommended_actions=tuple(profile.get("recommended_actions", [])),
+        target_priority=profile.get("target_priority", "-"),
+        retention_risk=profile.get("retention_risk", "-"),
+        monetization_potential=profile.get("monetization_potential", "-"),
+        evidence_refs=refs,
+        quotes=quotes,
+    )
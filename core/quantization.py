@@ -0,0 +1,260 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def _kmeans(vectors, n_clusters, n_iter=10, sample_size=10000, seed=0):
+    """유클리드 k-means (PQ 부분공간 코드북 학습용)"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample_size:
+        vectors = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+    n_clusters = max(1, min(n_clusters, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        # ‖x‖² 는 행마다 상수라 argmin 에 영향이 없으므로 생략
+        assign = np.argmin((centroids ** 2).sum(1) - 2 * vectors @ centroids.T, axis=1)
+        counts = np.bincount(assign, minlength=n_clusters)
+        # 부분공간 차원이 작으므로 차원별 bincount 로 군집 합 (np.add.at 보다 훨씬 빠름)
+        sums = np.stack([np.bincount(assign, weights=vectors[:, d], minlength=n_clusters)
+                         for d in range(vectors.shape[1])], axis=1)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class Float32Codec:
+    """압축 없음 (기준선)"""
+
+    name = "float32"
+
+    def fit(self, vectors):
+        return self
+
+    def encode(self, vectors):
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def decode(self, codes):
+        return np.asarray(codes, dtype=np.float32)
+
+    def scores(self, codes, query):
+        return codes @ query
+
+    def bytes_per_vector(self, dim):
+        return 4 * dim
+
+    def state(self):
+        return {}
+
+    def load_state(self, state):
+        return self
+
+
+class Float16Codec(Float32Codec):
+    """반정밀도 (메모리 1/2, 정규화 벡터에서는 오차가 거의 없음)"""
+
+    name = "float16"
+
+    def encode(self, vectors):
+        return np.ascontiguousarray(vectors, dtype=np.float16)
+
+    def scores(self, codes, query):
+        return codes.astype(np.float32) @ query
+
+    def bytes_per_vector(self, dim):
+        return 2 * dim
+
+
+class Int8Codec(Float32Codec):
+    """차원별 min/max 스칼라 양자화 (메모리 1/4)
+
+    x ≈ offset + scale * code 이므로 q·x = q·offset + (q * scale)·code 로
+    코드를 복원하지 않고 바로 내적합니다.
+    """
+
+    name = "int8"
+
+    def __init__(self):
+        self.offset = None
+        self.scale = None
+
+    def fit(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        lo, hi = vectors.min(axis=0), vectors.max(axis=0)
+        self.offset = lo
+        self.scale = np.where(hi > lo, (hi - lo) / 255.0, 1.0).astype(np.float32)
+        return self
+
+    def encode(self, vectors):
+        codes = np.rint((np.asarray(vectors, dtype=np.float32) - self.offset) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes):
+        return self.offset + codes.astype(np.float32) * self.scale
+
+    def scores(self, codes, query):
+        return codes.astype(np.float32) @ (query * self.scale) + float(query @ self.offset)
+
+    def bytes_per_vector(self, dim):
+        return dim
+
+    def state(self):
+        return {"offset": self.offset, "scale": self.scale}
+
+    def load_state(self, state):
+        self.offset, self.scale = state["offset"], state["scale"]
+        return self
+
+
+class PQCodec(Float32Codec):
+    """Product quantization: 벡터를 m 개 부분공간으로 나눠 부분공간마다 256개 코드북 번호(1바이트)로 저장
+
+    검색은 질의와 코드북의 내적표(m x 256)를 만든 뒤 코드로 표를 찾아 더하는 방식(ADC)입니다.
+    """
+
+    name = "pq"
+
+    def __init__(self, m=None, n_iter=10, seed=0):
+        self.m = m                  # None 이면 부분공간당 8차원
+        self.n_iter = n_iter
+        self.seed = seed
+        self.codebooks = None       # (m, 256, dsub)
+
+    def _subspaces(self, vectors):
+        n, dim = vectors.shape
+        return vectors.reshape(n, self.m, dim // self.m)
+
+    def fit(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        # 차원을 나눠떨어지게 하는 가장 가까운 m 사용
+        m = self.m or max(1, dim // 8)
+        self.m = max(d for d in range(1, min(m, dim) + 1) if dim % d == 0)
+        # 표본을 먼저 뽑아 부분공간별로 연속 배열로 만든 뒤 학습
+        rng = np.random.default_rng(self.seed)
+        if len(vectors) > 10000:
+            vectors = vectors[np.sort(rng.choice(len(vectors), 10000, replace=False))]
+        sub = self._subspaces(vectors)
+        self.codebooks = np.stack([_kmeans(np.ascontiguousarray(sub[:, j]), 256, self.n_iter, seed=self.seed + j)
+                                   for j in range(self.m)]).astype(np.float32)
+        if self.codebooks.shape[1] < 256:
+            pad = np.zeros((self.m, 256 - self.codebooks.shape[1], self.codebooks.shape[2]), dtype=np.float32)
+            self.codebooks = np.concatenate([self.codebooks, pad], axis=1)
+        return self
+
+    def encode(self, vectors, chunk=65536):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        cb_sq = (self.codebooks ** 2).sum(axis=2)                      # (m, 256)
+        for i in range(0, len(vectors), chunk):
+            sub = self._subspaces(vectors[i:i + chunk])                 # (n, m, dsub)
+            for j in range(self.m):
+                dist = cb_sq[j][None, :] - 2 * sub[:, j] @ self.codebooks[j].T
+                codes[i:i + chunk, j] = np.argmin(dist, axis=1)
+        return codes
+
+    def decode(self, codes):
+        parts = self.codebooks[np.arange(self.m)[None, :], codes]      # (n, m, dsub)
+        return parts.reshape(len(codes), -1)
+
+    def scores(self, codes, query):
+        lut = np.einsum("mkd,md->mk", self.codebooks, query.reshape(self.m, -1))
+        return lut[np.arange(self.m)[None, :], codes].sum(axis=1)
+
+    def bytes_per_vector(self, dim):
+        return self.m
+
+    def state(self):
+        return {"codebooks": self.codebooks}
+
+    def load_state(self, state):
+        self.codebooks = state["codebooks"]
+        self.m = self.codebooks.shape[0]
+        return self
+
+
+CODECS = {"float32": Float32Codec, "float16": Float16Codec, "int8": Int8Codec, "pq": PQCodec}
+
+
+def make_codec(name=None):
+    """이름(또는 환경변수 EMBED_VECTOR_CODEC)으로 코덱 생성, float32 면 None (압축 안 함)"""
+    name = (name or os.environ.get("EMBED_VECTOR_CODEC") or "float32").lower()
+    if name not in CODECS:
+        raise ValueError(f"알 수 없는 벡터 코덱: {name} (가능: {', '.join(CODECS)})")
+    return None if name == "float32" else CODECS[name]()
+
+
+def codec_state(codec, prefix="codec_"):
+    """npz 저장용 {이름: 배열}"""
+    if codec is None:
+        return {prefix + "name": np.array("float32")}
+    out = {prefix + "name": np.array(codec.name)}
+    out.update({prefix + k: v for k, v in codec.state().items()})
+    return out
+
+
+def codec_from_state(data, prefix="codec_"):
+    if prefix + "name" not in data:
+        return None
+    name = str(data[prefix + "name"])
+    if name == "float32":
+        return None
+    state = {k[len(prefix):]: data[k] for k in data.files if k.startswith(prefix) and k != prefix + "name"}
+    return CODECS[name]().load_state(state)
+
+
+def compression_report(vectors, queries, k=10, codecs=("float16", "int8", "pq"), rescore_factor=4):
+    """코덱별 메모리 절감 vs recall@k 손실 리포트 (float32 전수 검색을 정답으로)
+
+    recall@k_rescored 는 압축 점수로 k * rescore_factor 개 후보를 뽑은 뒤 float32 로 다시 매긴 결과입니다.
+    """
+    from core.vector_index import l2_normalize
+
+    vectors = l2_normalize(vectors)
+    queries = l2_normalize(np.atleast_2d(queries))
+    n, dim = vectors.shape
+    k = min(k, n)
+    exact = queries @ vectors.T
+    truth = np.argpartition(-exact, k - 1, axis=1)[:, :k]
+
+    def _recall(found):
+        return float(np.mean([len(np.intersect1d(f, t)) / k for f, t in zip(found, truth)]))
+
+    rows = [{"codec": "float32", "MB": n * dim * 4 / 2 ** 20, "ratio_vs_float32": 1.0, "ratio_vs_float64": 2.0,
+             f"recall@{k}": 1.0, f"recall@{k}_rescored": 1.0, "encode_s": 0.0}]
+    for name in codecs:
+        codec = CODECS[name]()
+        t0 = time.perf_counter()
+        codec.fit(vectors)
+        codes = codec.encode(vectors)
+        encode_s = time.perf_counter() - t0
+
+        approx = np.stack([codec.scores(codes, q) for q in queries])
+        found = np.argpartition(-approx, k - 1, axis=1)[:, :k]
+        kk = min(k * rescore_factor, n)
+        cand = np.argpartition(-approx, kk - 1, axis=1)[:, :kk]
+        rescored = np.take_along_axis(exact, cand, axis=1)
+        found_rescored = np.take_along_axis(cand, np.argsort(-rescored, axis=1)[:, :k], axis=1)
+
+        nbytes = codes.nbytes + sum(v.nbytes for v in codec.state().values())
+        rows.append({"codec": name, "MB": nbytes / 2 ** 20, "ratio_vs_float32": n * dim * 4 / nbytes,
+                     "ratio_vs_float64": n * dim * 8 / nbytes, f"recall@{k}": _recall(found),
+                     f"recall@{k}_rescored": _recall(found_rescored), "encode_s": encode_s})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.quantization  (저장된 임베딩으로 메모리 절감 / recall 손실 리포트 출력)
+    from core.embedding_backends import get_backend
+    from core.embedding_store import EmbeddingStore
+
+    stored = EmbeddingStore().load(get_backend().id)
+    if stored is None:
+        raise SystemExit("저장된 임베딩이 없습니다. RAG 페이지에서 임베딩을 먼저 생성하세요.")
+    _, _, vectors = stored
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(vectors), min(200, len(vectors)), replace=False)
+    queries = np.asarray(vectors)[sample] + rng.normal(0, 0.05, (len(sample), vectors.shape[1])).astype(np.float32)
+    print(f"{len(vectors):,} vectors x {vectors.shape[1]} dims")
+    print(compression_report(np.asarray(vectors), queries).to_string(index=False, float_format="%.3f"))
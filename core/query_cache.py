@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class QueryEmbeddingCache:
+    """(모델, 질의문) -> 임베딩 LRU + TTL 캐시 (세션 간 공유, 쓰레드 안전)"""
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl              # 초 단위, None 이면 만료 없음
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # key -> (저장 시각, 벡터)
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, now):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        stored_at, vec = item
+        if self.ttl is not None and now - stored_at > self.ttl:
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return vec
+
+    def _put(self, key, vec, now):
+        self._items[key] = (now, vec)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def get_many(self, model, queries, embed_batch):
+        """질의 목록의 임베딩을 반환 (캐시에 없는 질의만 한 번의 배치 호출로 임베딩)
+
+        embed_batch(list[str]) -> list[vector]
+        """
+        now = self._clock()
+        found = {}
+        with self._lock:
+            for q in queries:
+                vec = self._get((model, q), now)
+                if vec is not None:
+                    found[q] = vec
+            missing = [q for q in dict.fromkeys(queries) if q not in found]
+            self.hits += len(queries) - sum(1 for q in queries if q in missing)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = embed_batch(missing)
+            now = self._clock()         # 배치 호출 시간만큼 TTL 이 줄지 않도록 끝난 시각으로 저장
+            with self._lock:
+                for q, vec in zip(missing, vectors):
+                    vec = np.asarray(vec, dtype=np.float32)
+                    vec.setflags(write=False)
+                    self._put((model, q), vec, now)
+                    found[q] = vec
+
+        return [found[q] for q in queries]
+
+    def get(self, model, query, embed_batch):
+        return self.get_many(model, [query], embed_batch)[0]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+
+# 팀 역량 슬라이더 / GAME_DIM_D1_D10.csv 의 10개 차원 (D1~D10)
+DIM_COLS = ["아트", "연출", "서사", "조작감", "시스템복잡도", "컨텐츠설계량", "엔진", "네트워크", "운영", "BM"]
+
+# 리뷰 CSV 의 d1_quote ~ d10_quote 컬럼에서 온 문서 dim 코드 (DIM_COLS 와 같은 순서)
+DIM_CODES = [f"D{i}" for i in range(1, len(DIM_COLS) + 1)]
+
+
+def slider_to_vector(values):
+    """슬라이더 값(1~5) -> 0~1 입력 벡터"""
+    return (np.asarray(values, dtype=np.float32) - 1) / 4.0
+
+
+class RecommendationEngine:
+    """게임 특성 행렬을 한 번 만들어 두고 코사인 유사도 top-k 를 계산하는 추천기
+
+    공유 DataFrame 은 수정하지 않으며, 결과는 top-k 행만 복사해 반환합니다.
+    """
+
+    def __init__(self, df_games, feature_cols=DIM_COLS):
+        self.df_games = df_games.reset_index(drop=True)
+        self.feature_cols = list(feature_cols)
+
+        # (차원 x 게임) 연속 배열로 저장: 입력 벡터 @ 행렬 한 번이 가장 빠른 배치
+        features = self.df_games[self.feature_cols].to_numpy(dtype=np.float32)
+        norms = np.linalg.norm(features, axis=1)
+        self._features = np.ascontiguousarray(features.T)                   # 가중치 계산용 원본
+        self._sq_features = np.ascontiguousarray((features * features).T)   # 가중 노름용 제곱
+        self._normalized = np.ascontiguousarray((features / np.where(norms == 0, 1, norms)[:, None]).T)
+        for arr in (self._features, self._sq_features, self._normalized):
+            arr.setflags(write=False)
+
+    def __len__(self):
+        return len(self.df_games)
+
+    def scores(self, input_vector, weights=None):
+        """모든 게임의 (가중) 코사인 유사도
+
+        weights 가 있으면 cos(w*u, w*g) = Σ w²ug / (‖w*u‖ ‖w*g‖) 로 계산합니다.
+        """
+        u = np.asarray(input_vector, dtype=np.float32).reshape(-1)
+        if weights is None:
+            u_norm = np.linalg.norm(u)
+            if u_norm == 0:
+                return np.zeros(len(self), dtype=np.float32)
+            return (u / u_norm) @ self._normalized
+
+        w2 = np.asarray(weights, dtype=np.float32).reshape(-1) ** 2
+        u_norm = np.sqrt(np.dot(w2, u * u))
+        if u_norm == 0:
+            return np.zeros(len(self), dtype=np.float32)
+        # 임시 배열을 줄이려고 제자리 연산 (특성이 모두 0 인 게임은 분자도 0)
+        num = (w2 * u) @ self._features
+        den = w2 @ self._sq_features
+        np.sqrt(den, out=den)
+        den *= u_norm
+        np.divide(num, den, out=num, where=den > 0)
+        return num
+
+    def top_k_indices(self, scores, k=5):
+        """argpartition 으로 상위 k 개 행 번호 (점수 내림차순)"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        top = np.argpartition(scores, len(scores) - k)[-k:]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def scores_batch(self, input_matrix, weights=None):
+        """여러 프로필을 한 번에 채점 -> (프로필 수, 게임 수) 유사도 행렬"""
+        U = np.atleast_2d(np.asarray(input_matrix, dtype=np.float32))
+        if weights is None:
+            u_norm = np.linalg.norm(U, axis=1, keepdims=True)
+            return (U / np.where(u_norm == 0, np.inf, u_norm)) @ self._normalized
+
+        w2 = np.asarray(weights, dtype=np.float32).reshape(1, -1) ** 2
+        u_norm = np.sqrt((U * U) @ w2.T)
+        num = (U * w2) @ self._features
+        den = np.sqrt(w2 @ self._sq_features) * u_norm
+        np.divide(num, den, out=num, where=den > 0)
+        return num
+
+    def top_k_batch(self, input_matrix, k=5, weights=None):
+        """여러 프로필의 상위 k 개 (행 번호, 점수), 각 (프로필 수, k) 배열"""
+        scores = self.scores_batch(input_matrix, weights)
+        k = min(k, scores.shape[1])
+        top = np.argpartition(scores, scores.shape[1] - k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def recommend(self, input_vector, k=5, weights=None, tag_scores=None, tag_weight=0.0):
+        """상위 k 개 게임 (match_score 열 포함, 원본과 분리된 DataFrame)
+
+        tag_scores (같은 행 순서의 태그 유사도, TagIndex.scores) 를 주면
+        match_score = (1 - tag_weight) * 차원 코사인 + tag_weight * 태그 유사도 로 순위를 매기고
+        dim_score / tag_score 열을 함께 돌려줍니다.
+        """
+        scores = self.scores(input_vector, weights)
+        if tag_scores is None or tag_weight <= 0:
+            top = self.top_k_indices(scores, k)
+            return self.df_games.iloc[top].assign(match_score=scores[top])
+        tag_scores = np.asarray(tag_scores, dtype=np.float32)
+        hybrid = (1 - tag_weight) * scores + tag_weight * tag_scores
+        top = self.top_k_indices(hybrid, k)
+        return self.df_games.iloc[top].assign(match_score=hybrid[top], dim_score=scores[top], tag_score=tag_scores[top])
@@ -0,0 +1,100 @@
+import atexit
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_RESULT_CACHE_PATH = os.path.join("data", "cache", "result_cache.pkl")
+
+
+def quantize_profile(slider_values, weights=None, weight_step=0.1):
+    """슬라이더(1~5 정수)와 가중치를 캐시 키용 튜플로 양자화"""
+    sliders = tuple(int(round(v)) for v in slider_values)
+    if weights is None:
+        return sliders, None
+    return sliders, tuple(int(round(w / weight_step)) for w in weights)
+
+
+class ResultCache:
+    """양자화된 입력 -> 추천/근거 결과 LRU 캐시 (세션 간 공유, 선택적 디스크 저장)
+
+    키에 데이터/모델 버전을 함께 넣으므로, 원본 CSV 나 임베딩이 바뀌면
+    이전 결과는 자연히 쓰이지 않고 LRU 로 밀려납니다.
+    디스크 저장은 put 마다 하지 않고, flush_every 번 바뀔 때마다 / flush() 호출 시 / 프로세스 종료 시 합니다.
+    """
+
+    def __init__(self, maxsize=256, path=None, flush_every=64):
+        self.maxsize = maxsize
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._items = OrderedDict()
+        self._dirty = 0          # 마지막 저장 이후 put 횟수
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._load()
+            atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                items = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return
+        if isinstance(items, OrderedDict):
+            self._items = items
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def flush(self):
+        """바뀐 내용이 있으면 디스크에 저장 (항목 복사만 잠금 안에서, 쓰기는 잠금 밖에서)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            items = OrderedDict(self._items)
+            self._dirty = 0
+        with self._io_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.path)
+            except OSError:
+                with self._lock:
+                    self._dirty += 1      # 다음 flush 에서 다시 시도
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+            self._dirty += 1
+            due = bool(self.path) and self._dirty >= self.flush_every
+        if due:
+            self.flush()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._items),
+                "hit_rate": self.hits / total if total else 0.0}
@@ -0,0 +1,349 @@
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from core.result_cache import ResultCache
+
+
+# 플랫폼별 세그먼트 프로필 표 (세그먼트 x 특성 평균 + 전체 대비 diff%)
+PROFILE_PATHS = {
+    "steam": os.path.join("data", "segments_detailed_profiles.csv"),
+}
+
+# 레이더 축 -> 묶을 특성 (축 값 = 특성별 '전체 평균 대비 배율' 의 평균)
+RADAR_AXES = {
+    "문화 몰입도": ["culture_score"],
+    "활동성": ["play_intensity", "recent_activity"],
+    "확산성": ["vote_influence", "weighted_vote_score", "is_viral"],
+    "평가 방향": ["sentiment_score", "recommended"],
+    "표현 강도": ["emotion_intensity_norm"],
+    "관점 강도": ["focus_gameplay", "focus_content", "focus_technical", "focus_social"],
+}
+RADAR_MAX = 2.0                   # 레이더 바깥 원 (배율), 넘는 값은 테두리에 붙여 그림
+RADAR_RINGS = (0.5, 1.0, 1.5, 2.0)
+HIGHLIGHT = "#FF4B4B"
+MUTED = "#8a8f98"
+PALETTE = ["#FF4B4B", "#1f77b4", "#2ca02c", "#ff7f0e", "#9467bd", "#17becf", "#8c564b", "#e377c2", "#bcbd22", "#7f7f7f"]
+
+
+# 세그먼트 부분집합 비교 결과
+# table   : 세그먼트 x [count, pct, 특성, 특성_diff% ...] (diff% 는 부분집합 고객수 가중 평균 대비)
+# ranking : 특성별 구분력 (부분집합 안 Z-score 폭) 내림차순
+# pairwise: (k, k, 특성) 쌍별 값 차이 (행 - 열), distance: (k, k) 쌍별 평균 |ΔZ|
+SegmentComparison = namedtuple("SegmentComparison", ["segments", "table", "ranking", "pairwise", "distance"])
+
+
+class SegmentProfiles:
+    """세그먼트 프로필 CSV 한 개를 차트용 행렬로 미리 변환
+
+    diff% 열이 있는 특성만 씁니다. 배율(ratio) = 1 + diff% / 100 이고,
+    레이더 축 값은 (특성 x 축) 가중 행렬 곱 한 번으로, 히트맵 Z-score 는 세그먼트 방향
+    표준화 한 번으로 계산합니다.
+    """
+
+    def __init__(self, df):
+        df = df.sort_values("segment").reset_index(drop=True)
+        self.segments = df["segment"].astype(int).to_numpy()
+        self.groups = df["group"].astype(str).to_numpy() if "group" in df.columns else np.full(len(df), "")
+        self.counts = df["count"].astype(int).to_numpy()
+        self.pcts = df["pct"].astype(float).to_numpy()
+        self.features = [c for c in df.columns if f"{c}_diff%" in df.columns]
+
+        self.values = df[self.features].to_numpy(dtype=np.float64)
+        self.ratio = 1 + df[[f"{c}_diff%" for c in self.features]].to_numpy(dtype=np.float64) / 100
+        std = self.values.std(axis=0)
+        self.zscore = (self.values - self.values.mean(axis=0)) / np.where(std > 0, std, 1)
+
+        # 특성 -> 축 평균 가중치 (CSV 에 없는 특성은 빠지고, 특성이 하나도 없는 축은 제외)
+        pos = {f: i for i, f in enumerate(self.features)}
+        axes = {a: [pos[f] for f in fs if f in pos] for a, fs in RADAR_AXES.items()}
+        self.axes = [a for a, idx in axes.items() if idx]
+        weights = np.zeros((len(self.features), len(self.axes)))
+        for j, a in enumerate(self.axes):
+            weights[axes[a], j] = 1 / len(axes[a])
+        self.radar = self.ratio @ weights
+        self._row = {s: i for i, s in enumerate(self.segments)}
+        self._comparisons = ResultCache(maxsize=32)     # 부분집합 -> SegmentComparison (표가 바뀌면 인스턴스째 교체)
+
+    @classmethod
+    def read(cls, path):
+        return cls(pd.read_csv(path, encoding="utf-8-sig"))
+
+    def __len__(self):
+        return len(self.segments)
+
+    def row(self, segment):
+        return self._row.get(int(segment))
+
+    def compare(self, segments):
+        """세그먼트 부분집합 비교 (SegmentComparison, 같은 부분집합이면 캐시 재사용)
+
+        표에 있는 세그먼트가 두 개 미만이면 ValueError.
+        """
+        key = tuple(sorted({int(s) for s in segments if int(s) in self._row}))
+        if len(key) < 2:
+            raise ValueError(f"비교하려면 표에 있는 세그먼트가 두 개 이상 필요합니다: {list(segments)}")
+        result = self._comparisons.get(key)
+        if result is None:
+            result = self._compare(key)
+            self._comparisons.put(key, result)
+        return result
+
+    def _compare(self, segments):
+        rows = np.array([self._row[s] for s in segments], dtype=np.int64)
+        k, n_feat = len(rows), len(self.features)
+        sub = self.values[rows]
+        z = self.zscore[rows]
+        weights = self.counts[rows].astype(np.float64)
+
+        # 부분집합 평균 대비 diff% (평균이 0 인 특성은 NaN)
+        mean = weights @ sub / max(weights.sum(), 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            diff = (sub - mean) / np.abs(mean) * 100
+        diff[:, mean == 0] = np.nan
+        data = np.empty((k, 2 * n_feat))
+        data[:, 0::2], data[:, 1::2] = sub, diff
+        columns = [c for f in self.features for c in (f, f"{f}_diff%")]
+        table = pd.DataFrame(data, index=pd.Index(self.segments[rows], name="segment"), columns=columns)
+        table.insert(0, "count", self.counts[rows])
+        table.insert(1, "pct", self.pcts[rows])
+
+        # 쌍별 차이는 브로드캐스팅 한 번 (k x k x 특성)
+        pairwise = (sub[:, None, :] - sub[None, :, :]).astype(np.float32)
+        distance = np.abs(z[:, None, :] - z[None, :, :]).mean(axis=2) if n_feat else np.zeros((k, k))
+
+        cols = np.arange(n_feat)
+        top, bottom = z.argmax(axis=0), z.argmin(axis=0)
+        # 평균이 0 이라 diff% 가 전부 NaN 인 특성은 NaN 으로 둠 (nanmax 의 All-NaN 경고 방지)
+        abs_diff = np.abs(diff)
+        defined = ~np.isnan(abs_diff).all(axis=0)
+        max_abs_diff = np.full(n_feat, np.nan)
+        max_abs_diff[defined] = np.nanmax(abs_diff[:, defined], axis=0)
+        ranking = pd.DataFrame({
+            "feature": self.features,
+            "spread_z": z.max(axis=0) - z.min(axis=0),
+            "top_segment": self.segments[rows][top],
+            "top_value": sub[top, cols],
+            "bottom_segment": self.segments[rows][bottom],
+            "bottom_value": sub[bottom, cols],
+            "max_abs_diff%": max_abs_diff,
+        }).sort_values("spread_z", ascending=False, kind="stable").reset_index(drop=True)
+        return SegmentComparison(tuple(int(s) for s in self.segments[rows]), table, ranking, pairwise, distance)
+
+
+class SegmentProfileStore:
+    """플랫폼별 SegmentProfiles (파일의 크기/수정 시각이 바뀌었을 때만 다시 읽음)"""
+
+    def __init__(self, paths=PROFILE_PATHS):
+        self.paths = dict(paths)
+        self._lock = threading.Lock()
+        self._entries = {}       # platform -> (stat 서명, SegmentProfiles)
+
+    def get(self, platform):
+        """SegmentProfiles (표가 없는 플랫폼이면 None)"""
+        path = self.paths.get(platform)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        signature = (stat.st_size, stat.st_mtime_ns)
+        entry = self._entries.get(platform)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(platform)
+            if entry is None or entry[0] != signature:
+                try:
+                    entry = (signature, SegmentProfiles.read(path))
+                except (OSError, ValueError, KeyError):
+                    return None
+                self._entries[platform] = entry
+            return entry[1]
+
+
+def _spec(title, body):
+    spec = {"$schema": "https://vega.github.io/schema/vega-lite/v5.json"}
+    if title:
+        spec["title"] = title
+    spec.update(body)
+    return spec
+
+
+def _polar(r, n):
+    """축 i 를 오른쪽(0°)부터 반시계로 배치한 (x, y)"""
+    theta = 2 * np.pi * np.arange(n) / n
+    return r * np.cos(theta), r * np.sin(theta)
+
+
+def _radar(axes, series, title, size):
+    """series = [(이름, 축별 배율, 선 색, 점선 패턴, 채움 색)] -> 극좌표 레이더 Vega-Lite spec"""
+    n = len(axes)
+    rows = []
+    for ring in RADAR_RINGS:
+        x, y = _polar(np.full(n, ring), n)
+        rows += [{"kind": "ring", "ring": ring, "order": k, "x": x[k], "y": y[k]} for k in range(n)]
+        rows.append({"kind": "tick", "x": ring * np.cos(np.pi / n), "y": ring * np.sin(np.pi / n), "label": f"{ring:g}x"})
+    x, y = _polar(np.full(n, RADAR_MAX), n)
+    lx, ly = _polar(np.full(n, RADAR_MAX * 1.18), n)
+    rows += [{"kind": "spoke", "x": 0.0, "y": 0.0, "x2": x[k], "y2": y[k]} for k in range(n)]
+    rows += [{"kind": "label", "x": lx[k], "y": ly[k], "label": axes[k]} for k in range(n)]
+    for name, r, *_ in series:
+        x, y = _polar(np.clip(r, 0, RADAR_MAX), n)
+        rows += [{"kind": "value", "series": name, "order": k, "x": x[k], "y": y[k], "axis": axes[k],
+                  "ratio": round(float(r[k]), 3)} for k in range(n)]
+    for row in rows:
+        for key in ("x", "y", "x2", "y2"):
+            if key in row:
+                row[key] = round(float(row[key]), 4)
+
+    names = [name for name, *_ in series]
+    scale = lambda i: {"domain": names, "range": [item[i] for item in series]}
+    lim = RADAR_MAX * 1.45
+    pos = {"x": {"field": "x", "type": "quantitative", "scale": {"domain": [-lim, lim]}, "axis": None},
+           "y": {"field": "y", "type": "quantitative", "scale": {"domain": [-lim, lim]}, "axis": None}}
+    only = lambda kind: {"filter": f"datum.kind === '{kind}'"}
+    return _spec(title, {
+        "width": size, "height": size,
+        "view": {"stroke": None},
+        "data": {"values": rows},
+        "encoding": pos,
+        "layer": [
+            {"transform": [only("ring")], "mark": {"type": "line", "interpolate": "linear-closed", "color": "#d5d8dc",
+                                                   "strokeWidth": 0.8},
+             "encoding": {"detail": {"field": "ring"}, "order": {"field": "order"}}},
+            {"transform": [only("spoke")], "mark": {"type": "rule", "color": "#d5d8dc", "strokeDash": [2, 3]},
+             "encoding": {"x2": {"field": "x2"}, "y2": {"field": "y2"}}},
+            {"transform": [only("tick")], "mark": {"type": "text", "color": MUTED, "fontSize": 10, "dx": 12},
+             "encoding": {"text": {"field": "label"}}},
+            {"transform": [only("label")], "mark": {"type": "text", "fontSize": 12, "fontWeight": "bold"},
+             "encoding": {"text": {"field": "label"}}},
+            {"transform": [only("value")],
+             "mark": {"type": "line", "interpolate": "linear-closed", "fillOpacity": 0.18 if len(series) <= 2 else 0.08,
+                      "strokeWidth": 2.5},
+             "encoding": {
+                 "order": {"field": "order"},
+                 "color": {"field": "series", "type": "nominal", "legend": {"orient": "bottom", "title": None},
+                           "scale": scale(2)},
+                 "fill": {"field": "series", "type": "nominal", "legend": None, "scale": scale(4)},
+                 "strokeDash": {"field": "series", "type": "nominal", "legend": None, "scale": scale(3)},
+                 "tooltip": [{"field": "series", "title": "세그먼트"}, {"field": "axis", "title": "축"},
+                             {"field": "ratio", "title": "전체 대비 배율", "format": ".2f"}],
+             }},
+        ],
+    })
+
+
+def radar_spec(profiles, segment, title=None, size=420):
+    """세그먼트 레이더 (전체 평균 = 1.0x 점선 대비 배율) Vega-Lite spec"""
+    i = profiles.row(segment)
+    series = [("전체 평균", np.ones(len(profiles.axes)), MUTED, [5, 4], "transparent"),
+              (f"Segment {segment}", profiles.radar[i], HIGHLIGHT, [1, 0], HIGHLIGHT)]
+    return _radar(profiles.axes, series, {"text": title or f"Segment {segment}", "subtitle": f"n={profiles.counts[i]:,}"}, size)
+
+
+def radar_overlay_spec(profiles, segments, labels=None, title=None, size=460):
+    """여러 세그먼트 레이더를 한 장에 겹침 (색은 세그먼트별, 전체 평균 점선 포함)"""
+    labels = labels or {}
+    series = [("전체 평균", np.ones(len(profiles.axes)), MUTED, [5, 4], "transparent")]
+    for k, s in enumerate(s for s in segments if profiles.row(s) is not None):
+        color = PALETTE[k % len(PALETTE)]
+        series.append((labels.get(s, f"Segment {s}"), profiles.radar[profiles.row(s)], color, [1, 0], color))
+    return _radar(profiles.axes, series, title, size)
+
+
+def size_spec(segments, counts, pcts, current, title=None):
+    """세그먼트 비중 막대 (현재 세그먼트 강조) Vega-Lite spec"""
+    rows = [{"segment": str(int(s)), "count": int(c), "pct": round(float(p), 2),
+             "label": f"{p:.1f}% ({int(c):,}명)", "current": int(s) == int(current)}
+            for s, c, p in zip(segments, counts, pcts)]
+    return _spec(title, {
+        "width": "container", "height": 260,
+        "data": {"values": rows},
+        "encoding": {
+            "x": {"field": "segment", "type": "ordinal", "title": "세그먼트", "sort": None, "axis": {"labelAngle": 0}},
+            "y": {"field": "pct", "type": "quantitative", "title": "비중(%)"},
+        },
+        "layer": [
+            {"mark": {"type": "bar", "cornerRadiusEnd": 3},
+             "encoding": {
+                 "color": {"condition": {"test": "datum.current", "value": HIGHLIGHT}, "value": MUTED},
+                 "tooltip": [{"field": "segment", "title": "세그먼트"}, {"field": "count", "title": "고객수", "format": ","},
+                             {"field": "pct", "title": "비율(%)", "format": ".1f"}],
+             }},
+            {"mark": {"type": "text", "dy": -8, "fontSize": 11}, "encoding": {"text": {"field": "label"}}},
+        ],
+    })
+
+
+def heatmap_spec(profiles, current=None, title=None):
+    """세그먼트 x 특성 Z-score 히트맵 (음=파랑, 양=주황, 현재 세그먼트 테두리) Vega-Lite spec"""
+    seg, feat = np.meshgrid(profiles.segments, np.arange(len(profiles.features)), indexing="ij")
+    z = np.round(profiles.zscore, 3).ravel()
+    diff = np.round((profiles.ratio - 1) * 100, 1).ravel()
+    names = np.asarray(profiles.features, dtype=object)[feat.ravel()]
+    rows = [{"segment": str(s), "feature": f, "z": float(v), "diff": float(d), "current": bool(current is not None and s == int(current))}
+            for s, f, v, d in zip(seg.ravel().tolist(), names.tolist(), z.tolist(), diff.tolist())]
+    return _spec(title, {
+        "width": "container", "height": 22 * len(profiles.features),
+        "data": {"values": rows},
+        "encoding": {
+            "x": {"field": "segment", "type": "ordinal", "title": "세그먼트", "sort": None, "axis": {"labelAngle": 0}},
+            "y": {"field": "feature", "type": "ordinal", "title": None, "sort": list(profiles.features)},
+        },
+        "layer": [
+            {"mark": "rect",
+             "encoding": {
+                 "color": {"field": "z", "type": "quantitative", "title": "Z",
+                           "scale": {"scheme": "blueorange", "domain": [-2.5, 2.5], "clamp": True}},
+                 "tooltip": [{"field": "segment", "title": "세그먼트"}, {"field": "feature", "title": "특성"},
+                             {"field": "z", "title": "Z-score", "format": ".2f"},
+                             {"field": "diff", "title": "전체 대비(%)", "format": "+.1f"}],
+             }},
+            {"transform": [{"filter": "datum.current"}],
+             "mark": {"type": "rect", "fill": None, "stroke": "#31333F", "strokeWidth": 2}},
+        ],
+    })
+
+
+def _matrix_spec(matrix, labels, title, value_title, fmt, scale):
+    """k x k 행렬 히트맵 (행 - 열)"""
+    names = [str(s) for s in labels]
+    rows = [{"row": names[i], "col": names[j], "value": round(float(matrix[i, j]), 4)}
+            for i in range(len(names)) for j in range(len(names))]
+    return _spec(title, {
+        "width": "container", "height": max(160, 34 * len(names)),
+        "data": {"values": rows},
+        "encoding": {
+            "x": {"field": "col", "type": "ordinal", "title": None, "sort": names, "axis": {"labelAngle": 0}},
+            "y": {"field": "row", "type": "ordinal", "title": None, "sort": names},
+        },
+        "layer": [
+            {"mark": "rect",
+             "encoding": {"color": {"field": "value", "type": "quantitative", "title": value_title, "scale": scale},
+                          "tooltip": [{"field": "row", "title": "행"}, {"field": "col", "title": "열"},
+                                      {"field": "value", "title": value_title, "format": fmt}]}},
+            {"mark": {"type": "text", "fontSize": 10},
+             "encoding": {"text": {"field": "value", "format": fmt}}},
+        ],
+    })
+
+
+def pairwise_spec(comparison, feature_index, labels=None, title=None):
+    """특성 하나의 세그먼트 쌍별 값 차이 (행 - 열) 히트맵"""
+    labels = labels or {}
+    names = [labels.get(s, str(s)) for s in comparison.segments]
+    matrix = comparison.pairwise[:, :, feature_index]
+    lim = float(np.abs(matrix).max()) or 1.0
+    return _matrix_spec(matrix, names, title, "차이", ".3f", {"scheme": "blueorange", "domain": [-lim, lim]})
+
+
+def distance_spec(comparison, labels=None, title=None):
+    """세그먼트 쌍별 평균 |ΔZ| (특성 전체, 클수록 다른 세그먼트) 히트맵"""
+    labels = labels or {}
+    names = [labels.get(s, str(s)) for s in comparison.segments]
+    return _matrix_spec(comparison.distance, names, title, "평균 |ΔZ|", ".2f", {"scheme": "greys"})
@@ -0,0 +1,281 @@
+import glob
+import json
+import os
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from core.persona_store import PERSONA_DIR, segment_persona
+from core.result_cache import ResultCache
+
+
+# 인사이트 JSON (플랫폼별 최신 페르소나 + 날짜별 스냅샷)
+INSIGHT_GLOBS = (
+    os.path.join(PERSONA_DIR, "*_persona.json"),
+    os.path.join("data", "*_cluster_insights_*.json"),
+)
+HEADER_KEY = '"analysis_metadata"'
+HEADER_CHUNK = 16 * 1024         # 헤더를 찾을 때 처음 읽는 바이트 수 (모자라면 두 배씩)
+TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+# 페르소나에서 값이 바뀌었는지 볼 필드 (단일 값 / 목록)
+SCALAR_FIELDS = ("segment_size", "segment_ratio", "persona_name", "one_liner", "description",
+                 "target_priority", "retention_risk", "monetization_potential")
+LIST_FIELDS = ("key_characteristics", "needs", "pain_points", "recommended_actions", "quotes")
+META_FIELDS = ("total_reviews", "total_comments", "num_segments", "analysis_date",
+               "postprocess_version", "postprocess_datetime")
+
+# 목록의 스냅샷 한 개 (헤더만 읽은 상태)
+SnapshotInfo = namedtuple("SnapshotInfo", ["snapshot_id", "path", "platform", "version", "timestamp", "metadata", "signature"])
+# 연 스냅샷 (세그먼트별 SegmentPersona)
+InsightSnapshot = namedtuple("InsightSnapshot", ["info", "segments", "overall_insights"])
+# 두 스냅샷 비교 결과 (delta = other - base)
+SnapshotDiff = namedtuple("SnapshotDiff", ["base", "other", "scores", "top_changes", "fields"])
+
+
+def insight_files(patterns=INSIGHT_GLOBS):
+    return sorted({p for pattern in patterns for p in glob.glob(pattern)})
+
+
+def snapshot_id(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def snapshot_label(info):
+    return f"{info.version or '-'} · {info.timestamp:%Y-%m-%d %H:%M} ({info.snapshot_id})"
+
+
+def read_header(path, chunk=HEADER_CHUNK):
+    """파일 앞부분만 읽어 analysis_metadata 를 파싱 (맨 앞 객체가 아니면 전체 파싱)"""
+    decoder = json.JSONDecoder()
+    text = ""
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            more = f.read(chunk)
+            text += more
+            start = text.find(HEADER_KEY)
+            brace = text.find("{", start + len(HEADER_KEY)) if start >= 0 else -1
+            if brace >= 0:
+                if text[start + len(HEADER_KEY):brace].strip() != ":":
+                    break
+                try:
+                    return decoder.raw_decode(text, brace)[0]
+                except ValueError:
+                    pass        # 헤더가 아직 덜 읽힘
+            if not more:
+                break
+            chunk *= 2
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("analysis_metadata", {}) or {}
+
+
+def _timestamp(meta, mtime_ns):
+    for field in ("postprocess_datetime", "analysis_date"):
+        for fmt in TIME_FORMATS:
+            try:
+                return datetime.strptime(str(meta.get(field)), fmt)
+            except ValueError:
+                continue
+    return datetime.fromtimestamp(mtime_ns / 1e9)
+
+
+def _scores(meta):
+    """priority_scoring.scores -> segment_id 색인 DataFrame (impact / urgency / ratio ...)"""
+    rows = (meta.get("priority_scoring", {}) or {}).get("scores", []) or []
+    df = pd.DataFrame(rows)
+    if df.empty or "segment_id" not in df:
+        return pd.DataFrame(index=pd.Index([], name="segment_id"))
+    df = df.set_index("segment_id").sort_index()
+    return df.rename(columns=lambda c: c[:-len("_score")] if c.endswith("_score") else c)
+
+
+def _field_changes(base, other):
+    """메타데이터와 세그먼트 페르소나의 바뀐 필드 (segment_id -1 = 전체 메타데이터)"""
+    rows = []
+    for field in META_FIELDS:
+        before, after = base.info.metadata.get(field), other.info.metadata.get(field)
+        if before != after:
+            rows.append((-1, field, "changed", before, after))
+    for seg in sorted(set(base.segments) | set(other.segments)):
+        a, b = base.segments.get(seg), other.segments.get(seg)
+        if a is None or b is None:
+            rows.append((seg, "segment", "added" if a is None else "removed", a and a.persona_name, b and b.persona_name))
+            continue
+        for field in SCALAR_FIELDS:
+            before, after = getattr(a, field), getattr(b, field)
+            if before != after:
+                rows.append((seg, field, "changed", before, after))
+        for field in LIST_FIELDS:
+            before, after = getattr(a, field), getattr(b, field)
+            rows += [(seg, field, "removed", item, None) for item in before if item not in after]
+            rows += [(seg, field, "added", None, item) for item in after if item not in before]
+    return pd.DataFrame(rows, columns=["segment_id", "field", "change", "base", "other"])
+
+
+class SnapshotStore:
+    """인사이트 JSON 전부를 (플랫폼, 버전, 시각) 으로 색인
+
+    목록은 파일 앞쪽의 analysis_metadata 만 읽어 만들고, 한 번 만든 목록은 인사이트 디렉터리의
+    수정 시각이 바뀌거나 (파일 추가/삭제/교체) refresh() 를 부를 때만 다시 만듭니다 (바뀐 파일만 다시 읽음).
+    그 밖에는 info/latest/list 가 dict 조회와 필터뿐입니다.
+    세그먼트 본문은 open() 할 때 처음 파싱해 캐시합니다. 캐시 키에 파일의 (크기, 수정 시각) 이
+    들어 있어 파일이 바뀌면 이전 결과는 쓰이지 않고 LRU 로 밀려납니다.
+    """
+
+    def __init__(self, patterns=INSIGHT_GLOBS):
+        self.patterns = patterns
+        self._lock = threading.Lock()
+        self._headers = {}                               # path -> SnapshotInfo
+        self._dirs = sorted({os.path.dirname(p) or "." for p in patterns})
+        self._dirs_signature = None                      # 목록을 만들 때의 디렉터리 수정 시각
+        self._infos = {}                                 # snapshot_id -> SnapshotInfo
+        self._ordered = {None: []}                       # platform (None = 전체) -> 최신순 SnapshotInfo
+        self._opened = ResultCache(maxsize=16)           # signature -> InsightSnapshot
+        self._diffs = ResultCache(maxsize=64)            # (signature, signature) -> SnapshotDiff
+
+    def _current_dirs_signature(self):
+        sig = []
+        for d in self._dirs:
+            try:
+                sig.append((d, os.stat(d).st_mtime_ns))
+            except OSError:
+                sig.append((d, None))
+        return tuple(sig)
+
+    def refresh(self):
+        """다음 조회 때 목록을 다시 만듦 (파일을 제자리에서 고쳐 쓴 경우)"""
+        with self._lock:
+            self._dirs_signature = None
+
+    def _catalog(self):
+        signature = self._current_dirs_signature()
+        if signature == self._dirs_signature:
+            return self._infos
+        with self._lock:
+            if signature != self._dirs_signature:
+                infos = self._build_catalog()
+                ordered = {None: sorted(infos.values(), key=lambda i: (i.timestamp, i.snapshot_id), reverse=True)}
+                for info in ordered[None]:
+                    ordered.setdefault(info.platform, []).append(info)
+                self._infos, self._ordered = infos, ordered
+                self._dirs_signature = signature
+            return self._infos
+
+    def _build_catalog(self):
+        infos = {}
+        for path in insight_files(self.patterns):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature = (path, stat.st_size, stat.st_mtime_ns)
+            info = self._headers.get(path)
+            if info is None or info.signature != signature:
+                try:
+                    meta = read_header(path)
+                except (OSError, ValueError):
+                    continue
+                platform = str(meta.get("target") or os.path.basename(path).split("_")[0]).lower()
+                info = SnapshotInfo(snapshot_id(path), path, platform, meta.get("postprocess_version"),
+                                    _timestamp(meta, stat.st_mtime_ns), meta, signature)
+                self._headers[path] = info
+            infos[info.snapshot_id] = info
+        return infos
+
+    def list(self, platform=None):
+        """SnapshotInfo 목록 (최신순)"""
+        self._catalog()
+        return list(self._ordered.get(platform, ()))
+
+    def info(self, sid):
+        return self._catalog().get(sid)
+
+    def latest(self, platform):
+        infos = self.list(platform)
+        return infos[0] if infos else None
+
+    def open(self, sid):
+        """InsightSnapshot (없거나 읽을 수 없으면 None)"""
+        info = sid if isinstance(sid, SnapshotInfo) else self.info(sid)
+        if info is None:
+            return None
+        snapshot = self._opened.get(info.signature)
+        if snapshot is None:
+            try:
+                with open(info.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                return None
+            segments = {seg.get("segment_id"): segment_persona(info.platform, seg) for seg in data.get("segments", [])}
+            snapshot = InsightSnapshot(info, segments, data.get("overall_insights", {}) or {})
+            self._opened.put(info.signature, snapshot)
+        return snapshot
+
+    def diff(self, base_id, other_id):
+        """두 스냅샷의 우선순위 점수 변화와 필드별 변경 (SnapshotDiff, 같은 쌍이면 캐시 재사용)"""
+        base, other = self.info(base_id), self.info(other_id)
+        if base is None or other is None:
+            return None
+        key = (base.signature, other.signature)
+        result = self._diffs.get(key)
+        if result is None:
+            result = self._diff(base, other)
+            self._diffs.put(key, result)
+        return result
+
+    def _diff(self, base, other):
+        # 점수는 헤더만으로 계산 (base/other 열 + delta 열)
+        a, b = _scores(base.metadata), _scores(other.metadata)
+        segs = a.index.union(b.index)
+        cols = [c for c in a.columns.union(b.columns, sort=False)
+                if pd.api.types.is_numeric_dtype(a.get(c, b.get(c)))]
+        scores = pd.DataFrame(index=segs)
+        for col in cols:
+            before = a[col].reindex(segs) if col in a else pd.Series(np.nan, index=segs)
+            after = b[col].reindex(segs) if col in b else pd.Series(np.nan, index=segs)
+            scores[f"{col}_base"], scores[f"{col}_other"], scores[f"{col}_delta"] = before, after, after - before
+
+        pa = base.metadata.get("priority_scoring", {}) or {}
+        pb = other.metadata.get("priority_scoring", {}) or {}
+        top_changes = {k: (tuple(pa.get(k) or ()), tuple(pb.get(k) or ()))
+                       for k in sorted(set(pa) | set(pb)) if k.endswith("_top") and pa.get(k) != pb.get(k)}
+
+        opened_base, opened_other = self.open(base), self.open(other)
+        fields = _field_changes(opened_base, opened_other) if opened_base and opened_other else None
+        return SnapshotDiff(base, other, scores, top_changes, fields)
+
+
+if __name__ == "__main__":
+    # 사용법: python -m core.snapshot_store  (스냅샷 목록, 헤더/본문 읽기 시간, 버전 간 점수 변화)
+    import time
+
+    store = SnapshotStore()
+    t0 = time.perf_counter()
+    infos = store.list()
+    print(f"catalog (headers only): {len(infos)} snapshots in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    for info in infos:
+        t0 = time.perf_counter()
+        store.open(info)
+        opened = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.open(info.snapshot_id)
+        print(f"  {info.platform:<8} {snapshot_label(info):<62} open {opened * 1000:6.2f} ms, cached {(time.perf_counter() - t0) * 1e6:6.1f} µs")
+
+    for platform in sorted({i.platform for i in infos}):
+        versions = store.list(platform)
+        if len(versions) < 2:
+            continue
+        t0 = time.perf_counter()
+        d = store.diff(versions[1].snapshot_id, versions[0].snapshot_id)
+        first = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        store.diff(versions[1].snapshot_id, versions[0].snapshot_id)
+        print(f"\n{platform}: {versions[1].snapshot_id} -> {versions[0].snapshot_id} "
+              f"(diff {first * 1000:.1f} ms, cached {(time.perf_counter() - t0) * 1e6:.1f} µs)")
+        print(d.scores.filter(like="_delta").round(4).to_string())
+        for k, (before, after) in d.top_changes.items():
+            print(f"{k}: {list(before)} -> {list(after)}")
+        print(d.fields.groupby(["field", "change"]).size().to_string())
@@ -0,0 +1,129 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+TAG_COLS = ["user_tags", "genres_store"]
+
+
+def parse_tags(series):
+    """쉼표 구분 태그 문자열 -> (행 번호, 태그) long 형태 (결측/빈 태그 제외)"""
+    tags = series.fillna("").astype(str).str.split(",").explode().str.strip()
+    tags = tags[tags != ""]
+    return tags.index.to_numpy(), tags.to_numpy(dtype=object)
+
+
+class TagIndex:
+    """게임 x 태그 희소 행렬 (IDF 가중, 행 L2 정규화)
+
+    user_tags / genres_store 를 한 번만 파싱해 CSR 로 들고 있고, 태그 질의와
+    기준 게임 질의는 희소 행렬-벡터 곱 한 번으로 모든 게임의 코사인 유사도를 냅니다.
+    행 순서는 넘겨받은 df_games 행 순서와 같습니다 (RecommendationEngine 과 정렬 일치).
+    """
+
+    def __init__(self, df_games, tag_cols=TAG_COLS, n_neighbors=50):
+        df = df_games.reset_index(drop=True)
+        self.appids = df["APPID"].astype(str).to_numpy()
+        self._row = {a: i for i, a in enumerate(self.appids)}
+        self.n_neighbors = n_neighbors
+        self._lock = threading.Lock()
+
+        rows, tags = [], []
+        for col in tag_cols:
+            if col in df.columns:
+                r, t = parse_tags(df[col])
+                rows.append(r)
+                tags.append(t)
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        tags = np.concatenate(tags) if tags else np.zeros(0, dtype=object)
+        codes, vocab = pd.factorize(tags)
+        self.vocab = np.asarray(vocab, dtype=object)
+        self._tag_pos = {t: i for i, t in enumerate(self.vocab)}
+
+        # 이진 출현 (같은 태그가 두 컬럼에 있어도 1) -> IDF 가중 -> 행 정규화
+        n_games, n_tags = len(df), len(self.vocab)
+        presence = sp.csr_matrix((np.ones(len(codes), dtype=np.float32), (rows, codes)), shape=(n_games, n_tags))
+        presence.sum_duplicates()
+        presence.data[:] = 1.0
+        self.doc_freq = np.diff(presence.tocsc().indptr)
+        self.idf = (np.log((1 + n_games) / (1 + self.doc_freq)) + 1).astype(np.float32)
+        weighted = presence @ sp.diags(self.idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        self.matrix = sp.csr_matrix(sp.diags(1 / np.where(norms == 0, 1, norms)).astype(np.float32) @ weighted)
+        self._matrix_t = self.matrix.T.tocsr()
+
+        # 게임별 태그 유사 게임 이웃 표 (필요한 행만 채우거나 precompute_neighbors 로 한 번에)
+        k = min(n_neighbors, max(n_games - 1, 0))
+        self._neighbors = np.zeros((n_games, k), dtype=np.int64)
+        self._neighbor_scores = np.zeros((n_games, k), dtype=np.float32)
+        self._filled = np.zeros(n_games, dtype=bool)
+
+    def __len__(self):
+        return len(self.appids)
+
+    def popular_tags(self, limit=None):
+        """문서 빈도 내림차순 태그 목록 (UI 선택지용)"""
+        order = np.argsort(-self.doc_freq, kind="stable")
+        return self.vocab[order[:limit]].tolist()
+
+    def query_vector(self, tags=(), seed_appid=None):
+        """선택 태그(IDF 가중) + 기준 게임 태그 벡터를 합쳐 정규화한 (태그 수,) 밀집 벡터"""
+        q = np.zeros(len(self.vocab), dtype=np.float32)
+        ids = [self._tag_pos[t] for t in tags if t in self._tag_pos]
+        if ids:
+            q[ids] = self.idf[ids]
+            q /= np.linalg.norm(q)
+        row = self._row.get(str(seed_appid)) if seed_appid is not None else None
+        if row is not None:
+            seed = self.matrix.getrow(row)
+            q[seed.indices] += seed.data
+        norm = np.linalg.norm(q)
+        return q / norm if norm > 0 else q
+
+    def scores(self, tags=(), seed_appid=None):
+        """모든 게임의 태그 코사인 유사도 (질의가 비면 0)"""
+        q = self.query_vector(tags, seed_appid)
+        nz = np.flatnonzero(q)
+        if len(nz) == 0:
+            return np.zeros(len(self), dtype=np.float32)
+        # 질의에 있는 태그 열만 곱함
+        return np.asarray(self._matrix_t[nz].T @ q[nz], dtype=np.float32).ravel()
+
+    def _fill_neighbors(self, rows, budget=16_000_000):
+        """rows 게임들의 태그 유사 게임 상위 n_neighbors 를 이웃 표에 채움 (청크 단위 X @ Xᵀ)"""
+        n = len(self)
+        k = self._neighbors.shape[1]
+        chunk = int(max(1, budget // max(n, 1)))
+        for i in range(0, len(rows), chunk):
+            part = rows[i:i + chunk]
+            sims = np.asarray((self.matrix[part] @ self._matrix_t).todense())
+            sims[np.arange(len(part)), part] = -np.inf      # 자기 자신 제외
+            if k:
+                top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+                top_scores = np.take_along_axis(sims, top, axis=1)
+                order = np.argsort(-top_scores, axis=1, kind="stable")
+                self._neighbors[part] = np.take_along_axis(top, order, axis=1)
+                self._neighbor_scores[part] = np.take_along_axis(top_scores, order, axis=1)
+            self._filled[part] = True
+
+    def precompute_neighbors(self):
+        """모든 게임의 이웃 표를 미리 계산 (카탈로그가 작을 때 권장, O(게임 수²))"""
+        with self._lock:
+            self._fill_neighbors(np.flatnonzero(~self._filled))
+
+    def similar_to(self, appid, k=10):
+        """이 APPID 와 태그가 비슷한 게임 (행 번호, 유사도)
+
+        이웃 표에 있으면 조회만 하므로 마이크로초 단위이고, 처음 묻는 게임은
+        희소 행렬-벡터 곱 한 번으로 그 행만 채운 뒤 재사용합니다.
+        """
+        row = self._row.get(str(appid))
+        if row is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if not self._filled[row]:
+            with self._lock:
+                if not self._filled[row]:
+                    self._fill_neighbors(np.array([row]))
+        return self._neighbors[row, :k], self._neighbor_scores[row, :k]
@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from core.lexical_index import fuse_scores
+
+
+def l2_normalize(vectors):
+    """행 단위 L2 정규화 (float32)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class GameQuoteIndex:
+    """APPID(+dim) 별로 연속 구간에 정렬된, 정규화된 리뷰 벡터 인덱스
+
+    임베딩 완료 시 한 번 만들어 두고, 게임별 조회는 offsets 테이블에서
+    구간을 꺼내 슬라이스 + 행렬-벡터 곱 한 번으로 끝냅니다.
+
+    codec (core.quantization) 을 주면 float32 사본 대신 압축 코드만 메모리에 두고,
+    상위 후보는 원본 vectors (보통 저장소 memmap) 에서 float32 로 다시 채점합니다.
+    """
+
+    def __init__(self, df_docs, vectors, codec=None, rescore_factor=4, chunk=65536):
+        df = df_docs.reset_index(drop=True)
+        order = np.lexsort((df["dim"].astype(str).values, df["APPID"].astype(str).values))
+
+        self.df_docs = df.iloc[order].reset_index(drop=True)
+        self.doc_ids = order                       # 원본 df_docs 행 번호
+        self.codec = codec
+        self.rescore_factor = rescore_factor
+        self._chunk = chunk
+        if codec is None:
+            self._source = None
+            self.vectors = np.ascontiguousarray(l2_normalize(np.asarray(vectors)[order]))
+        else:
+            self._source = vectors
+            self.vectors = self._encode(codec)
+        self.vectors.setflags(write=False)
+
+        appids = self.df_docs["APPID"].astype(str).values
+        dims = self.df_docs["dim"].astype(str).values
+        # 구분자는 \x1f (numpy 문자열은 끝의 \x00 을 잘라내므로 NUL 은 쓰지 않음)
+        group_keys = np.char.add(np.char.add(appids.astype(str), "\x1f"), dims.astype(str))
+        self.offsets = self._offsets(appids)
+        self.dim_offsets = self._offsets(group_keys)
+
+        # 차원별 문서 파티션 (전 게임 대상, 행 번호 오름차순)
+        self.dim_rows = {d: np.flatnonzero(dims == d) for d in np.unique(dims)} if len(dims) else {}
+        self._build_centroids(group_keys)
+
+    def _normalized(self, rows):
+        """인덱스 행 번호(슬라이스/배열)의 정규화 float32 벡터"""
+        if self.codec is None:
+            return self.vectors[rows]
+        return l2_normalize(np.asarray(self._source[self.doc_ids[rows]]))
+
+    def _encode(self, codec, sample_size=20000):
+        """표본으로 코덱을 학습한 뒤 청크 단위로 압축 (float32 전체 사본을 만들지 않음)"""
+        n = len(self.doc_ids)
+        if n == 0:
+            return np.zeros((0, 0), dtype=np.uint8)
+        sample = np.sort(np.random.default_rng(0).choice(n, min(sample_size, n), replace=False))
+        codec.fit(self._normalized(sample))
+        return np.concatenate([codec.encode(self._normalized(slice(i, i + self._chunk)))
+                               for i in range(0, n, self._chunk)])
+
+    @property
+    def nbytes(self):
+        """인덱스가 들고 있는 벡터(또는 압축 코드) 메모리"""
+        state = self.codec.state().values() if self.codec is not None else ()
+        return self.vectors.nbytes + sum(v.nbytes for v in state)
+
+    def dense_scores(self, rows, query_vec):
+        """행 번호(슬라이스/배열)의 질의 내적 (압축 시 근사값)"""
+        q = l2_normalize(np.asarray(query_vec).reshape(-1))
+        if self.codec is None:
+            return self.vectors[rows] @ q
+        return self.codec.scores(self.vectors[rows], q).astype(np.float32)
+
+    def rows_for_keys(self, keys):
+        """문서 키 -> 인덱스 행 번호 (같은 키가 여러 행이면 첫 행, 없으면 -1)"""
+        if getattr(self, "_key_rows", None) is None:
+            key_rows = pd.Series(np.arange(len(self.df_docs)), index=self.df_docs["key"].values)
+            self._key_rows = key_rows[~key_rows.index.duplicated()]
+        return self._key_rows.reindex(np.asarray(keys, dtype=object)).fillna(-1).astype(np.int64).values
+
+    def exact_scores(self, rows, query_vec):
+        """행 번호 배열의 float32 정확 내적 (압축 안 했으면 dense_scores 와 같음)"""
+        q = l2_normalize(np.asarray(query_vec).reshape(-1))
+        return self._normalized(np.asarray(rows)) @ q
+
+    def _rescored(self, start, end, query_vec, k):
+        """구간 전체 근사 점수 + 상위 k * rescore_factor 후보만 float32 로 재채점"""
+        scores = self.dense_scores(slice(start, end), query_vec)
+        if self.codec is None or not self.rescore_factor:
+            return scores
+        kk = min(k * self.rescore_factor, end - start)
+        cand = np.argpartition(-scores, kk - 1)[:kk]
+        scores[cand] = self.exact_scores(start + cand, query_vec)
+        return scores
+
+    def _build_centroids(self, group_keys):
+        """(APPID, dim) 그룹별 정규화 평균 벡터와, 각 문서의 그룹 중심 유사도
+
+        그룹은 정렬 순서상 연속 구간이므로 그룹 합은 희소 지시행렬 곱 한 번으로 구합니다.
+        cohesion (평균 벡터 길이, 0~1) 은 그룹 안 리뷰들이 얼마나 한 방향을 가리키는지입니다.
+        """
+        if len(group_keys) == 0:
+            self.group_keys = np.zeros(0, dtype=str)
+            self.group_starts = np.zeros(0, dtype=np.int64)
+            self.group_counts = np.zeros(0, dtype=np.int64)
+            self.centroids = np.zeros((0, 0), dtype=np.float32)
+            self.cohesion = np.zeros(0, dtype=np.float32)
+            self.centroid_scores = np.zeros(0, dtype=np.float32)
+            self.group_best = np.zeros(0, dtype=np.int64)
+            return
+        self.group_keys, self.group_starts, self.group_counts = np.unique(group_keys, return_index=True, return_counts=True)
+        group_of_row = np.repeat(np.arange(len(self.group_keys)), self.group_counts)
+        # 그룹 지시 희소행렬 @ 벡터 (2차원 reduceat 보다 훨씬 빠름), 청크 단위로 누적
+        n, chunk = len(group_of_row), self._chunk
+        indicator = sp.csr_matrix((np.ones(n, dtype=np.float32), group_of_row, np.arange(n + 1)),
+                                  shape=(n, len(self.group_keys)))
+        sums = sum(np.asarray(indicator[i:i + chunk].T @ self._normalized(slice(i, i + chunk)))
+                   for i in range(0, n, chunk))
+        self.cohesion = (np.linalg.norm(sums, axis=1) / self.group_counts).astype(np.float32)
+        self.centroids = l2_normalize(sums)
+
+        # 문서별 자기 그룹 중심과의 내적 (전체 복사본을 만들지 않도록 청크 단위)
+        self.centroid_scores = np.empty(n, dtype=np.float32)
+        for i in range(0, n, chunk):
+            rows = slice(i, i + chunk)
+            self.centroid_scores[rows] = np.einsum("ij,ij->i", self._normalized(rows), self.centroids[group_of_row[rows]])
+
+        # 그룹별 대표 리뷰 (중심 유사도 최대, 동점이면 앞 행) 행 번호
+        group_max = np.maximum.reduceat(self.centroid_scores, self.group_starts)
+        is_max = np.flatnonzero(self.centroid_scores == np.repeat(group_max, self.group_counts))
+        self.group_best = is_max[np.unique(group_of_row[is_max], return_index=True)[1]]
+        for arr in (self.centroids, self.cohesion, self.centroid_scores, self.group_best):
+            arr.setflags(write=False)
+
+    @staticmethod
+    def _offsets(sorted_keys):
+        if len(sorted_keys) == 0:
+            return {}
+        keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+        return {k: (int(s), int(s + c)) for k, s, c in zip(keys, starts, counts)}
+
+    def __len__(self):
+        return len(self.df_docs)
+
+    def span(self, appid, dim=None):
+        key = str(appid) if dim is None else f"{appid}\x1f{dim}"
+        table = self.offsets if dim is None else self.dim_offsets
+        return table.get(key, (0, 0))
+
+    def count(self, appid, dim=None):
+        start, end = self.span(appid, dim)
+        return end - start
+
+    def top_k(self, appid, query_vec, k=1, dim=None, lexical_scores=None, fusion="rrf", alpha=0.5):
+        """게임(+차원) 안에서 질의와 가장 가까운 리뷰 k 개 (score 열 포함 DataFrame)
+
+        lexical_scores (이 인덱스 행 순서의 BM25 점수) 를 주면 dense 점수와 결합해
+        순위를 매기고 lexical_score / fused_score 열을 함께 돌려줍니다.
+        query_vec 이 None 이면 BM25 점수만으로 순위를 매깁니다.
+        """
+        start, end = self.span(appid, dim)
+        if end <= start:
+            return self.df_docs.iloc[0:0].assign(score=pd.Series(dtype=np.float32))
+        if query_vec is None:
+            scores = np.zeros(end - start, dtype=np.float32)
+        else:
+            scores = self._rescored(start, end, query_vec, k)
+        rank_by = scores
+        if lexical_scores is not None:
+            lexical = np.asarray(lexical_scores[start:end], dtype=np.float32)
+            rank_by = lexical if query_vec is None else fuse_scores(scores, lexical, fusion, alpha)
+        k = min(k, end - start)
+        best = np.argpartition(-rank_by, k - 1)[:k]
+        best = best[np.argsort(-rank_by[best], kind="stable")]
+        df_best = self.df_docs.iloc[start + best].assign(score=scores[best])
+        if lexical_scores is not None:
+            df_best = df_best.assign(lexical_score=lexical[best], fused_score=rank_by[best])
+        return df_best
+
+    def representative(self, appid, dim, k=1):
+        """(게임, 차원) 그룹 중심에 가장 가까운 리뷰 k 개 — 질의 임베딩 없이 순위 (score = 중심 유사도)"""
+        start, end = self.span(appid, dim)
+        if end <= start:
+            return self.df_docs.iloc[0:0].assign(score=pd.Series(dtype=np.float32))
+        scores = self.centroid_scores[start:end]
+        k = min(k, end - start)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return self.df_docs.iloc[start + best].assign(score=scores[best])
+
+    def evidence_matrix(self, appids, dims):
+        """게임 x 차원 근거 매트릭스를 한 번에 조회 -> (리뷰 수, cohesion, 대표 리뷰) DataFrame 3개
+
+        그룹 키를 searchsorted 로 한 번에 찾아 미리 계산된 배열에서 꺼내므로 게임 수와 무관하게 빠릅니다.
+        """
+        appids = [str(a) for a in appids]
+        dims = [str(d) for d in dims]
+        keys = np.char.add(np.char.add(np.repeat(np.array(appids, dtype=str), len(dims)), "\x1f"),
+                           np.tile(np.array(dims, dtype=str), len(appids)))
+        counts = np.zeros(len(keys), dtype=np.int64)
+        cohesion = np.full(len(keys), np.nan, dtype=np.float32)
+        found = np.zeros(len(keys), dtype=bool)
+        if len(self.group_keys):
+            pos = np.minimum(np.searchsorted(self.group_keys, keys), len(self.group_keys) - 1)
+            found = self.group_keys[pos] == keys
+            pos = pos[found]
+            counts[found] = self.group_counts[pos]
+            cohesion[found] = self.cohesion[pos]
+        quotes = np.full(len(keys), None, dtype=object)
+        if found.any():
+            quotes[found] = self.df_docs["raw_quote"].values[self.group_best[pos]]
+
+        shape = (len(appids), len(dims))
+        def _frame(values):
+            return pd.DataFrame(np.asarray(values).reshape(shape), index=appids, columns=dims)
+        return _frame(counts), _frame(cohesion), _frame(quotes)
@@ -0,0 +1,312 @@
+"""YouTube 유저 Ward 군집 파라미터 스윕 (헤드리스 배치)
+
+    python -m core.ward_sweep data/youtube_user_features.csv -o data/youtube_ward_WFOCUS_sweep_results.csv \\
+        --w-focus 1.2,1.4,1.6,1.8,2.0 --k 4,5,6,7 --n-neighbors 30 --workers 4 --pick 1.6:6
+
+입력: 유저 한 행, 특성 블록별 컬럼 (focus_* / culture_* / engage_* / emotion_*). 컬럼마다 표준화한 뒤
+블록마다 W_* / sqrt(블록 컬럼 수) 를 곱해 블록 크기와 상관없이 가중치만큼 거리에 기여하게 합니다.
+그 밖의 컬럼(유저 ID 등)은 쓰지 않습니다.
+가중치 조합 하나마다 kNN 연결 제약(n_neighbors) Ward 트리를 한 번만 만들고, 모든 K 는 그 트리에서 자릅니다.
+격자점별 결과와 트리는 data/cache 에 쌓아 두고 (입력 파일 해시가 키에 포함), 다시 돌리면 새 격자점만 계산합니다
+(이미 만든 가중치 조합에 K 만 추가하면 트리도 다시 만들지 않음).
+출력: 기존 스윕 CSV 와 같은 스키마 (W_FOCUS, K, Silhouette, Davies-Bouldin, Calinski-Harabasz, Balance(min/max),
+n_neighbors, W_CULTURE, W_ENGAGE, W_EMOTION, 군집0 …). --pick W_FOCUS:K 는 한 조합만 담은
+youtube_ward_weighted_blocks_WFOCUS_{W_FOCUS}.csv 를 함께 씁니다.
+"""
+import argparse
+import hashlib
+import itertools
+import os
+import time
+import warnings
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import ward_tree
+from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score, silhouette_score
+from sklearn.neighbors import kneighbors_graph
+
+from core.embedding_store import file_sha1
+from core.result_cache import ResultCache
+
+
+USER_FEATURES_PATH = os.path.join("data", "youtube_user_features.csv")
+SWEEP_RESULTS_PATH = os.path.join("data", "youtube_ward_WFOCUS_sweep_results.csv")
+SWEEP_CACHE_PATH = os.path.join("data", "cache", "ward_sweep.pkl")
+TREE_CACHE_DIR = os.path.join("data", "cache", "ward_trees")     # 가중치 조합별 병합 트리 (.npy)
+SWEEP_VERSION = 1                # 계산 방식이 바뀌면 올려서 캐시 무효화
+SILHOUETTE_SAMPLE = 20000        # 실루엣 표본 수 (0 이면 전체, O(n^2))
+
+# 가중치 컬럼 -> 특성 컬럼 접두사
+BLOCKS = (("W_FOCUS", "focus_"), ("W_CULTURE", "culture_"), ("W_ENGAGE", "engage_"), ("W_EMOTION", "emotion_"))
+GRID_COLUMNS = ["W_FOCUS", "K", "n_neighbors", "W_CULTURE", "W_ENGAGE", "W_EMOTION"]
+METRIC_COLUMNS = ["Silhouette", "Davies-Bouldin", "Calinski-Harabasz", "Balance(min/max)"]
+CLUSTER_PREFIX = "군집"
+
+# 격자점 하나 / 트리를 공유하는 가중치 조합 (격자점에서 K 를 뺀 것)
+SweepPoint = namedtuple("SweepPoint", GRID_COLUMNS)
+Weighting = namedtuple("Weighting", ["W_FOCUS", "n_neighbors", "W_CULTURE", "W_ENGAGE", "W_EMOTION"])
+# 표준화한 특성 행렬과 블록별 컬럼 위치
+UserFeatures = namedtuple("UserFeatures", ["matrix", "blocks"])
+
+
+def read_features(path):
+    if path.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, encoding="utf-8-sig")
+    blocks = {w: [i for i, c in enumerate(df.columns) if str(c).startswith(prefix)] for w, prefix in BLOCKS}
+    missing = [prefix for w, prefix in BLOCKS if not blocks[w]]
+    if missing:
+        raise SystemExit(f"특성 파일에 블록 컬럼이 없습니다: {', '.join(p + '*' for p in missing)}")
+    cols = sorted(i for idx in blocks.values() for i in idx)
+    matrix = df.iloc[:, cols].to_numpy(dtype=np.float64)
+    std = matrix.std(axis=0)
+    matrix = (matrix - matrix.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    pos = {c: j for j, c in enumerate(cols)}
+    return UserFeatures(matrix, {w: [pos[i] for i in idx] for w, idx in blocks.items()})
+
+
+def weighted_matrix(features, weighting):
+    scale = np.empty(features.matrix.shape[1])
+    for w, idx in features.blocks.items():
+        scale[idx] = getattr(weighting, w) / np.sqrt(len(idx))
+    return features.matrix * scale
+
+
+def stable_cuts(children, n_leaves, ks):
+    """Ward 트리 하나에서 여러 K 의 라벨을 한 번에 -> {K: 라벨 배열}
+
+    병합을 마지막 것부터 되돌리며 노드를 쪼개고, 큰 쪽 자식이 부모 라벨을 잇고 작은 쪽이 새 라벨(K-1)을 받으므로
+    K 가 늘어도 기존 군집 번호는 그대로입니다 (기존 스윕 CSV 의 군집 열 순서와 같음).
+    """
+    n, k_max = n_leaves, max(ks)
+    sizes = np.ones(2 * n - 1, dtype=np.int64)
+    for i, (a, b) in enumerate(children):
+        sizes[n + i] = sizes[a] + sizes[b]
+
+    node_label = {2 * n - 2: 0}
+    parent_label = np.zeros(k_max, dtype=np.int64)
+    for step in range(1, k_max):
+        node = 2 * n - 1 - step              # 아직 안 되돌린 병합 중 가장 나중 것
+        label = node_label.pop(node)
+        a, b = children[node - n]
+        big, small = (a, b) if sizes[a] >= sizes[b] else (b, a)
+        node_label[big], node_label[small] = label, step
+        parent_label[step] = label
+
+    # K_max 군집 라벨을 잎까지 내려보냄
+    labels = np.full(2 * n - 1, -1, dtype=np.int64)
+    for node, label in node_label.items():
+        labels[node] = label
+    for i in range(n - 2, -1, -1):
+        if labels[n + i] >= 0:
+            labels[children[i]] = labels[n + i]
+    leaf = labels[:n]
+
+    cuts = {}
+    for k in ks:
+        lut = np.arange(k_max)
+        for label in range(k, k_max):        # 부모 라벨이 항상 더 작으므로 오름차순으로 한 번에 풀림
+            lut[label] = lut[parent_label[label]]
+        cuts[k] = lut[leaf]
+    return cuts
+
+
+def tree_path(tree_dir, data_sig, weighting):
+    key = repr((SWEEP_VERSION, data_sig, tuple(float(v) for v in weighting)))
+    return os.path.join(tree_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+
+
+def build_tree(X, n_neighbors, path=None):
+    """kNN 연결 제약 Ward 트리의 children (path 가 있으면 저장본 재사용)"""
+    if path and os.path.exists(path):
+        children = np.load(path)
+        if len(children) == len(X) - 1:
+            return children
+    connectivity = kneighbors_graph(X, n_neighbors=n_neighbors, include_self=False)
+    with warnings.catch_warnings():
+        # 연결 성분이 여러 개면 sklearn 이 이어 붙이면서 경고 (결과에는 영향 없음)
+        warnings.filterwarnings("ignore", message="the number of connected components")
+        children = ward_tree(X, connectivity=connectivity)[0]
+    if path:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp, children)
+        os.replace(tmp, path)
+    return children
+
+
+def evaluate_weighting(features, weighting, ks, silhouette_sample=SILHOUETTE_SAMPLE, seed=0, tree_file=None):
+    """가중치 조합 하나: 트리 한 번 + K 별 지표 -> {K: 결과 dict}"""
+    X = weighted_matrix(features, weighting)
+    children = build_tree(X, weighting.n_neighbors, tree_file)
+
+    results = {}
+    for k, labels in stable_cuts(children, len(X), ks).items():
+        sizes = np.bincount(labels, minlength=k)
+        sample = silhouette_sample if 0 < silhouette_sample < len(X) else None
+        results[k] = {
+            "Silhouette": float(silhouette_score(X, labels, sample_size=sample, random_state=seed)),
+            "Davies-Bouldin": float(davies_bouldin_score(X, labels)),
+            "Calinski-Harabasz": float(calinski_harabasz_score(X, labels)),
+            "Balance(min/max)": float(sizes.min() / sizes.max()),
+            "sizes": tuple(int(s) for s in sizes),
+        }
+    return results
+
+
+# 워커 프로세스마다 한 번만 읽는 특성 행렬
+_worker_features = None
+
+
+def _init_worker(features_path):
+    global _worker_features
+    _worker_features = read_features(features_path)
+
+
+def _evaluate_task(args):
+    weighting, ks, silhouette_sample, seed, tree_file = args
+    return weighting, evaluate_weighting(_worker_features, weighting, ks, silhouette_sample, seed, tree_file)
+
+
+def grid_points(w_focus, ks, n_neighbors, w_culture, w_engage, w_emotion):
+    return [SweepPoint(f, k, n, c, e, m)
+            for f, k, n, c, e, m in itertools.product(w_focus, ks, n_neighbors, w_culture, w_engage, w_emotion)]
+
+
+def _cache_key(data_sig, point, silhouette_sample, seed):
+    return (SWEEP_VERSION, data_sig, silhouette_sample, seed,
+            tuple(round(float(v), 6) if isinstance(v, float) else int(v) for v in point))
+
+
+def run_sweep(features_path, points, workers=1, cache=None, tree_dir=None, silhouette_sample=SILHOUETTE_SAMPLE, seed=0,
+              log=print):
+    """격자점 목록 -> {SweepPoint: 결과 dict} (캐시에 없는 격자점만 가중치 조합 단위로 계산)"""
+    data_sig = file_sha1(features_path)
+    results, pending = {}, {}
+    for point in points:
+        cached = cache.get(_cache_key(data_sig, point, silhouette_sample, seed)) if cache is not None else None
+        if cached is not None:
+            results[point] = cached
+        else:
+            weighting = Weighting(point.W_FOCUS, point.n_neighbors, point.W_CULTURE, point.W_ENGAGE, point.W_EMOTION)
+            pending.setdefault(weighting, set()).add(point.K)
+    log(f"{len(points)} grid points: {len(results)} cached, {len(points) - len(results)} to compute "
+        f"({len(pending)} trees)")
+
+    def _store(weighting, by_k):
+        for k, row in by_k.items():
+            point = SweepPoint(weighting.W_FOCUS, k, weighting.n_neighbors, weighting.W_CULTURE,
+                               weighting.W_ENGAGE, weighting.W_EMOTION)
+            results[point] = row
+            if cache is not None:
+                cache.put(_cache_key(data_sig, point, silhouette_sample, seed), row)
+        if cache is not None:
+            cache.flush()       # 트리 하나(수십 초) 끝날 때마다 저장해 중간에 멈춰도 남김
+
+    tasks = [(w, sorted(ks), silhouette_sample, seed, tree_path(tree_dir, data_sig, w) if tree_dir else None)
+             for w, ks in pending.items()]
+    if workers <= 1 or len(tasks) <= 1:
+        features = read_features(features_path) if tasks else None
+        for weighting, ks, sample, s, tree_file in tasks:
+            t0 = time.perf_counter()
+            _store(weighting, evaluate_weighting(features, weighting, ks, sample, s, tree_file))
+            log(f"  {tuple(weighting)} K={ks} {time.perf_counter() - t0:.1f}s")
+    else:
+        # 끝난 가중치 조합부터 캐시에 넣으므로 중간에 멈춰도 다음 실행은 남은 것만 계산
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(features_path,)) as pool:
+            futures = [pool.submit(_evaluate_task, task) for task in tasks]
+            for future in as_completed(futures):
+                weighting, by_k = future.result()
+                _store(weighting, by_k)
+                log(f"  {tuple(weighting)} K={sorted(by_k)} done")
+    return results
+
+
+def format_cluster(size, total):
+    return f"{size / total * 100:4.1f}% ({size:,}명)"
+
+
+def sweep_table(results):
+    """결과 -> 기존 스윕 CSV 스키마 DataFrame (격자 순서 정렬, 군집 열은 최대 K 까지)"""
+    points = sorted(results)
+    n_clusters = max((len(results[p]["sizes"]) for p in points), default=0)
+    rows = []
+    for point in points:
+        row = results[point]
+        total = sum(row["sizes"])
+        out = {"W_FOCUS": point.W_FOCUS, "K": point.K}
+        out.update({c: row[c] for c in METRIC_COLUMNS})
+        out.update({c: getattr(point, c) for c in GRID_COLUMNS[2:]})
+        out.update({f"{CLUSTER_PREFIX}{i}": format_cluster(s, total) for i, s in enumerate(row["sizes"])})
+        rows.append(out)
+    columns = GRID_COLUMNS[:2] + METRIC_COLUMNS + GRID_COLUMNS[2:] + [f"{CLUSTER_PREFIX}{i}" for i in range(n_clusters)]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def pick_table(table, w_focus, k):
+    """한 조합만 담은 표 (weighted_blocks CSV 스키마: 격자 열은 W_FOCUS/K 만, 빈 군집 열 제거)"""
+    row = table[np.isclose(table["W_FOCUS"], w_focus) & (table["K"] == k)]
+    if row.empty:
+        raise SystemExit(f"스윕 결과에 W_FOCUS={w_focus}, K={k} 조합이 없습니다.")
+    row = row.head(1).drop(columns=GRID_COLUMNS[2:])
+    return row.dropna(axis=1, how="all")
+
+
+def _floats(text):
+    return [float(v) for v in text.split(",")]
+
+
+def _ints(text):
+    return [int(v) for v in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube 유저 Ward 군집 파라미터 스윕")
+    parser.add_argument("features", nargs="?", default=USER_FEATURES_PATH, help="유저 특성 CSV/Parquet")
+    parser.add_argument("-o", "--output", default=SWEEP_RESULTS_PATH)
+    parser.add_argument("--w-focus", type=_floats, default=[1.2, 1.4, 1.6, 1.8, 2.0])
+    parser.add_argument("--k", type=_ints, default=[4, 5, 6, 7])
+    parser.add_argument("--n-neighbors", type=_ints, default=[30])
+    parser.add_argument("--w-culture", type=_floats, default=[1.2])
+    parser.add_argument("--w-engage", type=_floats, default=[1.0])
+    parser.add_argument("--w-emotion", type=_floats, default=[0.8])
+    parser.add_argument("--workers", type=int, default=1, help="프로세스 수 (1 이면 단일 프로세스)")
+    parser.add_argument("--silhouette-sample", type=int, default=SILHOUETTE_SAMPLE, help="실루엣 표본 수 (0 이면 전체)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", default=SWEEP_CACHE_PATH, help="격자점 결과 캐시 (빈 문자열이면 캐시 안 함)")
+    parser.add_argument("--tree-cache", default=TREE_CACHE_DIR, help="가중치 조합별 트리 저장 폴더 (빈 문자열이면 저장 안 함)")
+    parser.add_argument("--pick", default=None, help="W_FOCUS:K 한 조합을 weighted_blocks CSV 로 따로 저장")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.features):
+        raise SystemExit(f"유저 특성 파일이 없습니다: {args.features}")
+    points = grid_points(args.w_focus, args.k, args.n_neighbors, args.w_culture, args.w_engage, args.w_emotion)
+    cache = ResultCache(maxsize=100_000, path=args.cache) if args.cache else None
+
+    t0 = time.perf_counter()
+    try:
+        results = run_sweep(args.features, points, workers=args.workers, cache=cache, tree_dir=args.tree_cache or None,
+                            silhouette_sample=args.silhouette_sample, seed=args.seed)
+    finally:
+        if cache is not None:
+            cache.flush()
+    table = sweep_table(results)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    table.to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"{len(table)} rows -> {args.output} ({time.perf_counter() - t0:.1f}s)")
+
+    if args.pick:
+        w_focus, k = args.pick.split(":")
+        picked = pick_table(table, float(w_focus), int(k))
+        path = os.path.join(os.path.dirname(os.path.abspath(args.output)),
+                            f"youtube_ward_weighted_blocks_WFOCUS_{float(w_focus)}.csv")
+        picked.to_csv(path, index=False, encoding="utf-8-sig")
+        print(f"W_FOCUS={float(w_focus)}, K={int(k)} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
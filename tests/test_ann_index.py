@@ -0,0 +1,55 @@
+import numpy as np
+
+from core.ann_index import IVFIndex, exact_search
+from core.quantization import Int8Codec
+from core.vector_index import l2_normalize
+
+
+def _data(n=600, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = l2_normalize(rng.normal(size=(n, dim)).astype(np.float32))
+    keys = np.array([f"doc{i}" for i in range(n)], dtype=object)
+    return vectors, keys
+
+
+def test_full_probe_equals_exact_search():
+    vectors, keys = _data()
+    index = IVFIndex.build(vectors, keys, nlist=12)
+    queries = vectors[:20]
+    _, found = index.search(queries, k=5, nprobe=index.nlist)
+    np.testing.assert_array_equal(found, keys[exact_search(vectors, queries, k=5)])
+
+
+def test_incremental_add_matches_bulk_build_lists():
+    vectors, keys = _data()
+    index = IVFIndex.build(vectors[:400], keys[:400], nlist=8)
+    index.add(vectors[400:], keys[400:])
+    assert len(index) == 600 and sorted(index.keys) == sorted(keys)
+    assert index.list_offsets[-1] == 600
+    # 각 벡터는 가장 가까운 중심의 리스트에 들어 있음
+    pos = {k: i for i, k in enumerate(keys)}
+    assign = np.argmax(vectors[[pos[k] for k in index.keys]] @ index.centroids.T, axis=1)
+    np.testing.assert_array_equal(assign, np.repeat(np.arange(index.nlist), np.diff(index.list_offsets)))
+
+    _, found = index.search(vectors[550], k=1, nprobe=index.nlist)
+    assert found[0, 0] == "doc550"
+
+
+def test_search_pads_when_candidates_run_out():
+    vectors, keys = _data(n=3)
+    index = IVFIndex.build(vectors, keys, nlist=1)
+    scores, found = index.search(vectors[:1], k=5)
+    assert list(found[0, 3:]) == [None, None]
+    assert np.isneginf(scores[0, 3:]).all()
+
+
+def test_save_load_roundtrip_with_codec(tmp_path):
+    vectors, keys = _data()
+    index = IVFIndex.build(vectors, keys, nlist=8, codec=Int8Codec())
+    path = str(tmp_path / "ivf.npz")
+    index.save(path)
+    loaded = IVFIndex.load(path)
+    assert loaded.codec_name == "int8" and loaded.nprobe == index.nprobe
+    for a, b in zip(index.search(vectors[:10], k=5), loaded.search(vectors[:10], k=5)):
+        np.testing.assert_array_equal(a, b)
+    assert IVFIndex.load(str(tmp_path / "missing.npz")) is None
@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.batch_recommend import build_output, genre_counts, main
+from core.data import load_games_cached
+from core.recommender import DIM_COLS, RecommendationEngine, slider_to_vector
+
+
+def _profiles(n):
+    df = pd.DataFrame(np.full((n, len(DIM_COLS)), 3.0), columns=DIM_COLS)
+    df.insert(0, "team", [f"team {i}" for i in range(n)])
+    return df
+
+
+def test_genre_counts_skip_missing_codes():
+    codes = np.array([0, 1, -1, 1])
+    counts = genre_counts(codes, 2, np.array([[0, 1, 3], [2, 2, 2]]))
+    np.testing.assert_array_equal(counts, [[1, 2], [0, 0]])
+
+
+def test_missing_genre_is_not_reported_as_last_genre():
+    games = pd.DataFrame({"APPID": ["a", "b", "c", "d"], "game_name": list("ABCD"),
+                          "TARGET_GENRE": ["RPG", "Action", None, None]})
+    top = np.array([[0, 1, 2], [2, 3, 2]])
+    out = build_output(_profiles(2), games, top, np.zeros(top.shape, dtype=np.float32))
+
+    assert list(out["top_genres"][0]) == ["RPG", "Action", None]
+    assert list(out["top_genres"][1]) == [None, None, None]
+    assert json.loads(out["genre_counts"][0]) == {"RPG": 1, "Action": 1}
+    assert json.loads(out["genre_counts"][1]) == {}
+    assert out["top_genre"][0] == "RPG"
+    assert pd.isna(out["top_genre"][1])
+
+
+def test_cli_ranks_the_same_catalogue_as_the_page(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)                              # 테이블 캐시(data/cache) 를 임시 폴더에
+    rng = np.random.default_rng(0)
+    dims = pd.DataFrame(rng.integers(1, 6, (30, len(DIM_COLS))), columns=DIM_COLS)
+    dims.insert(0, "game_name", [f"game {i}" for i in range(30)])
+    dims.insert(0, "APPID", np.arange(100, 130))
+    dims["TARGET_GENRE"] = rng.choice(["RPG", "Action"], 30)
+    dims.to_csv("dims.csv", index=False)
+    # 태그 파일에 없는 게임(세 개 중 두 개)은 페이지 테이블에서 빠짐
+    tags = dims[["APPID"]].iloc[::3].assign(user_tags="Co-op", genres_store="액션")
+    tags.to_csv("tags.csv", index=False)
+    _profiles(4).assign(**{c: rng.integers(1, 6, 4) for c in DIM_COLS}).to_csv("profiles.csv", index=False)
+
+    main(["profiles.csv", "-o", "out.parquet", "--catalogue", "dims.csv", "--tags", "tags.csv", "--k", "3"])
+    out = pd.read_parquet("out.parquet")
+
+    # 페이지와 같은 경로: load_games_cached -> RecommendationEngine.recommend
+    engine = RecommendationEngine(load_games_cached("dims.csv", "tags.csv"), DIM_COLS)
+    assert len(engine) == len(tags)
+    profiles = pd.read_csv("profiles.csv")
+    for row, got in zip(profiles[DIM_COLS].to_numpy(), out["top_appids"]):
+        want = engine.recommend(slider_to_vector(row), k=3)["APPID"].astype(str).tolist()
+        assert list(map(str, got)) == want
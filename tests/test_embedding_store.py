@@ -0,0 +1,103 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.embedding_job as embedding_job
+from core.embedding_backends import LocalHashingBackend
+from core.embedding_job import EmbeddingJobManager
+from core.embedding_store import EmbeddingStore, make_key
+
+
+class FailingBackend(LocalHashingBackend):
+    """같은 id 로 저장소를 공유하지만 임베딩 호출은 항상 실패"""
+
+    def embed_batch(self, texts):
+        raise RuntimeError("backend down")
+
+
+def _write_quotes(path, n_rows, changed=None):
+    rows = [{"APPID": i, "game_name": f"game {i}",
+             "d1_quote": f"리뷰 {i} 전투가 재밌어요", "d2_quote": f"리뷰 {i} 스토리가 좋아요"} for i in range(n_rows)]
+    if changed is not None:
+        rows[changed]["d1_quote"] = f"리뷰 {changed} 바뀐 문장"
+    pd.DataFrame(rows).to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def _manager(backend, store):
+    return EmbeddingJobManager(backend=backend, store=store,
+                               pipeline_options={"batch_size": 8, "max_workers": 1, "max_retries": 0})
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # ANN / BM25 색인도 상대 경로(data/cache)에 저장되므로 임시 폴더에서 실행
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(embedding_job, "iter_document_chunks",
+                        functools.partial(embedding_job.iter_document_chunks, chunksize=10))
+    return tmp_path
+
+
+def test_save_load_lookup_roundtrip(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "store"))
+    df = pd.DataFrame({"key": [make_key("m", t) for t in "abc"], "text": list("abc")})
+    vectors = np.arange(6, dtype=np.float32).reshape(3, 2)
+    store.save("m", df, vectors, {"sha1": "x"})
+
+    stored = store.load("m")
+    manifest, df_stored, loaded = stored
+    assert manifest["count"] == 3 and manifest["complete"]
+    assert store.is_fresh(manifest, {"sha1": "x"}) and not store.is_fresh(manifest, {"sha1": "y"})
+    np.testing.assert_array_equal(loaded, vectors)
+
+    keys = [df["key"][2], "missing", df["key"][0]]
+    positions = store.key_positions(stored)
+    hits = store.lookup("m", keys, stored=stored, positions=positions)
+    assert set(hits) == {df["key"][0], df["key"][2]}
+    np.testing.assert_array_equal(hits[df["key"][2]], vectors[2])
+    assert store.lookup("m", keys, stored=stored).keys() == hits.keys()
+
+
+def test_mid_run_failure_does_not_shrink_store(workdir):
+    source = str(workdir / "quotes.csv")
+    store = EmbeddingStore(str(workdir / "store"))
+    backend = LocalHashingBackend()
+
+    _write_quotes(source, 60)
+    first = _manager(backend, store)
+    first._run_embedding(None, source)
+    assert first.error_msg is None
+    before = store.load(backend.id)[1]["key"]
+    assert len(before) == 120
+
+    # 첫 청크의 문서 하나만 바뀐 상태에서 백엔드가 실패 -> 읽지 않은 청크의 저장 벡터도 남아야 함
+    _write_quotes(source, 60, changed=3)
+    failing = _manager(FailingBackend(), store)
+    failing._run_embedding(None, source)
+    assert failing.error_msg is not None
+    manifest, df_after, vectors = store.load(backend.id)
+    assert not manifest["complete"]
+    assert set(before) <= set(df_after["key"])
+    assert len(vectors) == len(df_after) >= len(before) - 1
+
+    # 다시 돌리면 바뀐 문서 하나만 새로 임베딩
+    retry = _manager(backend, store)
+    retry._run_embedding(None, source)
+    assert retry.error_msg is None
+    assert retry.computed_count == 1
+    assert retry.reused_count == 119
+
+
+def test_bm25_only_search_returns_only_matching_quotes(workdir):
+    source = str(workdir / "quotes.csv")
+    _write_quotes(source, 3, changed=1)
+    manager = _manager(LocalHashingBackend(), EmbeddingStore(str(workdir / "store")))
+    manager._run_embedding(None, source)
+    assert manager.error_msg is None
+
+    # 질의 용어가 있는 문서가 k 개보다 적으면 그만큼만 (오프라인 BM25 전용 경로)
+    hits = manager.search_hybrid("바뀐 문장", query_vec=None, k=5)
+    assert hits["raw_quote"].tolist() == ["리뷰 1 바뀐 문장"]
+    assert (hits["lexical_score"] > 0).all()
+    assert manager.search_hybrid("qqzzxx", query_vec=None, k=5).empty
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.evidence_index import EVIDENCE_COLUMNS, EvidenceIndex, EvidenceStore
+
+
+def _frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    quotes = ["스토리가 좋다", "Great GAME", "버그가 많다", "스토리 짧음"]
+    is_quote = rng.random(n) < 0.5
+    return pd.DataFrame({
+        "snapshot": rng.choice(["s1", "s2"], n),
+        "platform": rng.choice(["steam", "youtube"], n),
+        "segment_id": rng.integers(0, 5, n),
+        "evidence_type": np.where(is_quote, "quote", "metric"),
+        "source": "reviews",
+        "key": rng.choice(["recommended", "playtime", None], n),
+        "value": np.where(is_quote, None, rng.random(n).round(3).astype(str)),
+        "text": np.where(is_quote, rng.choice(quotes, n), None),
+        "chart_name": None,
+    }, columns=EVIDENCE_COLUMNS)
+
+
+def test_mask_matches_pandas_filters():
+    df = _frame()
+    index = EvidenceIndex(df)
+    value = pd.to_numeric(df["value"])
+    got = index.mask(platform="steam", key=["recommended", "없는키"], segment=[1, 3], value_min=0.2, value_max=0.8)
+    want = ((df["platform"] == "steam") & (df["key"] == "recommended") & df["segment_id"].isin([1, 3])
+            & (value >= 0.2) & (value <= 0.8)).to_numpy()
+    np.testing.assert_array_equal(got, want)
+    assert not index.mask(key="없는키").any()
+
+
+def test_search_is_case_insensitive_and_skips_missing_text():
+    df = _frame()
+    index = EvidenceIndex(df)
+    for query in ("스토리", "game", "많다", "없는 문장"):
+        want = df["text"].fillna("").str.lower().str.contains(query.lower(), regex=False).to_numpy()
+        np.testing.assert_array_equal(index.search_mask(query), want)
+    assert not index.search_mask("").any()
+    assert not index.search_mask("\x1f").any()
+    # 본문 경계를 넘는 부분 문자열은 맞지 않음
+    assert not index.search_mask("좋다great").any()
+
+    rows = index.query(text="스토리", platform="youtube", limit=3)
+    assert len(rows) <= 3 and (rows["platform"] == "youtube").all()
+    assert rows["text"].str.contains("스토리").all()
+
+
+def test_store_rebuilds_when_files_change(tmp_path):
+    path = tmp_path / "steam_persona.json"
+
+    def write(quote):
+        path.write_text(json.dumps({
+            "analysis_metadata": {"target": "STEAM"},
+            "segments": [{"segment_id": 0, "persona_profile": {"evidence_refs": [
+                {"evidence_type": "quite", "note": quote},                     # 예전 스냅샷 형식
+                {"evidence_type": "metric", "key": "playtime", "value": "12.5"},
+            ]}}],
+        }, ensure_ascii=False), encoding="utf-8")
+
+    write("첫 인용")
+    store = EvidenceStore(patterns=(str(tmp_path / "*.json"),))
+    index = store.get()
+    assert store.get() is index
+    assert index.query(evidence_type="quote")["text"].tolist() == ["첫 인용"]
+    assert index.query(key="playtime")["value"].tolist() == [12.5]
+
+    write("두 번째 인용입니다")
+    assert store.get().query(text="두 번째")["platform"].tolist() == ["steam"]
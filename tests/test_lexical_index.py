@@ -0,0 +1,55 @@
+import numpy as np
+
+from core.lexical_index import BM25Index
+
+
+DOCS = ["스토리가 정말 좋아요", "타격감 최고, 조작감 좋음", "서버 렉이 심하고 접속이 안 됨",
+        "스토리 엔딩이 아쉬움", "과금 유도가 심함 가챠 별로"]
+KEYS = [f"k{i}" for i in range(len(DOCS))]
+
+
+def _bruteforce(index, query):
+    # 모든 문서 x 모든 질의 용어를 그대로 더한 BM25 (CSC posting 경로와 비교용)
+    q = index._vec.transform([query]).tocsr()
+    tf = index._tf_csr.toarray()
+    out = np.zeros(len(index))
+    for term, qtf in zip(q.indices, q.data):
+        f = tf[:, term]
+        denom = f + index.k1 * (1 - index.b + index.b * index.doc_len / index.avgdl)
+        out += index.idf[term] * qtf * f * (index.k1 + 1) / denom
+    return out
+
+
+def test_scores_match_bruteforce_and_rank():
+    index = BM25Index.build(DOCS, KEYS)
+    for query in ("스토리", "서버 렉", "가챠 과금", "없는단어zz"):
+        np.testing.assert_allclose(index.scores(query), _bruteforce(index, query), rtol=1e-5, atol=1e-6)
+    rows, scores = index.search("스토리 엔딩", k=2)
+    assert rows[0] == 3 and set(rows) == {0, 3}
+    assert scores[0] >= scores[1] > 0
+    assert not index.scores("").any()
+
+
+def test_incremental_build_reuses_rows_in_new_order(tmp_path):
+    previous = BM25Index.build(DOCS[:3], KEYS[:3])
+    order = [4, 0, 2, 3, 1]
+    texts, keys = [DOCS[i] for i in order], [KEYS[i] for i in order]
+    incremental = BM25Index.build(texts, keys, previous=previous)
+    fresh = BM25Index.build(texts, keys)
+    assert list(incremental.keys) == keys
+    assert (incremental._tf_csr != fresh._tf_csr).nnz == 0
+    np.testing.assert_allclose(incremental.scores("조작감"), fresh.scores("조작감"))
+
+    path = str(tmp_path / "bm25.npz")
+    fresh.save(path)
+    loaded = BM25Index.load(path)
+    assert list(loaded.keys) == keys
+    np.testing.assert_allclose(loaded.scores("서버"), fresh.scores("서버"))
+
+
+def test_search_drops_documents_without_query_terms():
+    index = BM25Index.build(DOCS, KEYS)
+    rows, scores = index.search("엔딩", k=4)
+    assert list(rows) == [3] and (scores > 0).all()
+    rows, scores = index.search("없는단어zz", k=4)
+    assert len(rows) == 0 and len(scores) == 0
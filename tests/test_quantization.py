@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from core.quantization import CODECS, Int8Codec, PQCodec, codec_from_state, codec_state, make_codec
+from core.vector_index import l2_normalize
+
+
+def _vectors(n=500, dim=32, seed=0):
+    return l2_normalize(np.random.default_rng(seed).normal(size=(n, dim)).astype(np.float32))
+
+
+@pytest.mark.parametrize("name, tol", [("float16", 1e-3), ("int8", 1e-2), ("pq", 0.3)])
+def test_scores_match_decoded_and_approximate_float32(name, tol):
+    vectors = _vectors()
+    query = vectors[0]
+    codec = CODECS[name]().fit(vectors)
+    codes = codec.encode(vectors)
+    assert codes.nbytes == len(vectors) * codec.bytes_per_vector(vectors.shape[1])
+    # 압축 공간 내적 == 복원 벡터 내적
+    np.testing.assert_allclose(codec.scores(codes, query), codec.decode(codes) @ query, rtol=1e-4, atol=1e-4)
+    assert np.abs(codec.scores(codes, query) - vectors @ query).max() < tol
+
+
+def test_pq_picks_dividing_subspace_count():
+    codec = PQCodec(m=5).fit(_vectors(dim=24))
+    assert codec.m == 4 and codec.codebooks.shape == (4, 256, 6)
+
+
+@pytest.mark.parametrize("name", ["int8", "pq"])
+def test_state_roundtrip(tmp_path, name):
+    vectors = _vectors()
+    codec = make_codec(name).fit(vectors)
+    path = tmp_path / "codec.npz"
+    np.savez(path, **codec_state(codec))
+    restored = codec_from_state(np.load(path))
+    np.testing.assert_array_equal(restored.encode(vectors), codec.encode(vectors))
+
+
+def test_make_codec_names(monkeypatch):
+    assert make_codec("float32") is None
+    assert isinstance(make_codec("INT8"), Int8Codec)
+    monkeypatch.setenv("EMBED_VECTOR_CODEC", "pq")
+    assert isinstance(make_codec(), PQCodec)
+    with pytest.raises(ValueError):
+        make_codec("int4")
+    assert codec_from_state(codec_state(None)) is None
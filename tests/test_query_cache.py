@@ -0,0 +1,69 @@
+import numpy as np
+
+from core.query_cache import QueryEmbeddingCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Embedder:
+    """호출마다 받은 질의 목록을 기록하는 가짜 배치 임베딩 (clock 을 주면 호출 중 시간이 흐름)"""
+
+    def __init__(self, clock=None, latency=0.0):
+        self.calls = []
+        self.clock = clock
+        self.latency = latency
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.clock is not None:
+            self.clock.now += self.latency
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def test_one_batched_call_per_set_of_misses():
+    cache = QueryEmbeddingCache()
+    embed = Embedder()
+    out = cache.get_many("m", ["a", "bb", "a", "ccc"], embed)
+    assert embed.calls == [["a", "bb", "ccc"]]              # 중복 질의는 한 번만
+    np.testing.assert_array_equal(out[0], out[2])
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    out = cache.get_many("m", ["bb", "dddd", "a", "dddd"], embed)
+    assert embed.calls[1:] == [["dddd"]]
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert out[1][0] == 4.0 and not out[1].flags.writeable
+    assert cache.get_many("m", ["a", "bb"], embed) and len(embed.calls) == 2
+    cache.get("other-model", "a", embed)                     # 모델이 다르면 다른 키
+    assert embed.calls[-1] == ["a"]
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = QueryEmbeddingCache(maxsize=2)
+    embed = Embedder()
+    cache.get_many("m", ["a", "b"], embed)
+    cache.get("m", "a", embed)                               # a 를 최근 사용으로
+    cache.get("m", "c", embed)                               # b 가 밀려남
+    assert embed.calls == [["a", "b"], ["c"]]
+    cache.get_many("m", ["a", "c"], embed)
+    assert len(embed.calls) == 2
+    cache.get("m", "b", embed)
+    assert embed.calls[-1] == ["b"]
+
+
+def test_ttl_counts_from_when_the_batch_finished():
+    clock = FakeClock()
+    cache = QueryEmbeddingCache(ttl=10, clock=clock)
+    embed = Embedder(clock, latency=8.0)                     # 느린 배치 (8초)
+    cache.get("m", "a", embed)
+    clock.now += 9                                           # 저장 후 9초: 아직 유효
+    cache.get("m", "a", embed)
+    assert len(embed.calls) == 1
+    clock.now += 2                                           # 저장 후 11초: 만료
+    cache.get("m", "a", embed)
+    assert len(embed.calls) == 2
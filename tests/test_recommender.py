@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from core.recommender import DIM_COLS, RecommendationEngine, slider_to_vector
+
+
+def _games(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    features = rng.random((n, len(DIM_COLS)))
+    features[5] = 0                                          # 특성이 모두 0 인 게임
+    df = pd.DataFrame(features, columns=DIM_COLS)
+    df.insert(0, "Name", [f"game {i}" for i in range(n)])
+    return df
+
+
+def _profiles(seed=1):
+    rng = np.random.default_rng(seed)
+    profiles = rng.random((6, len(DIM_COLS)))
+    profiles[2] = 0                                          # 슬라이더가 모두 1 (입력 0 벡터)
+    return profiles
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_scores_match_sklearn_cosine(weighted):
+    df = _games()
+    engine = RecommendationEngine(df)
+    weights = np.random.default_rng(2).random(len(DIM_COLS)) * 2 if weighted else None
+    w = weights if weighted else np.ones(len(DIM_COLS))
+    profiles = _profiles()
+    # sklearn 은 0 벡터의 유사도를 0 으로 둠
+    expected = cosine_similarity(profiles * w, df[DIM_COLS].to_numpy() * w)
+
+    batch = engine.scores_batch(profiles, weights)
+    np.testing.assert_allclose(batch, expected, atol=1e-5)
+    for u, row in zip(profiles, expected):
+        np.testing.assert_allclose(engine.scores(u, weights), row, atol=1e-5)
+    assert not batch[2].any() and not batch[:, 5].any()
+
+
+def test_top_k_batch_matches_single_profile_ranking():
+    engine = RecommendationEngine(_games())
+    profiles = _profiles()[[0, 1, 3, 4, 5]]
+    weights = np.linspace(0.5, 2.0, len(DIM_COLS))
+    rows, scores = engine.top_k_batch(profiles, k=7, weights=weights)
+    for u, r, s in zip(profiles, rows, scores):
+        single = engine.scores(u, weights)
+        np.testing.assert_array_equal(r, engine.top_k_indices(single, 7))
+        np.testing.assert_allclose(s, single[r], rtol=1e-6)
+        assert (np.diff(s) <= 0).all()
+
+
+def test_recommend_copies_top_rows():
+    df = _games()
+    engine = RecommendationEngine(df)
+    out = engine.recommend(slider_to_vector([5, 4, 3, 2, 1, 1, 2, 3, 4, 5]), k=3)
+    assert len(out) == 3 and "match_score" not in df
+    out.loc[out.index[0], "Name"] = "changed"
+    assert "changed" not in engine.df_games["Name"].values
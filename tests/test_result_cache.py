@@ -0,0 +1,55 @@
+import os
+
+from core.result_cache import ResultCache, quantize_profile
+
+
+def test_lru_eviction_and_stats():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1          # a 가 최근 사용 -> b 가 밀려남
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats["hits"] == 3 and cache.stats["misses"] == 1 and len(cache) == 2
+
+
+def test_put_does_not_write_until_flush(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = ResultCache(maxsize=10, path=path, flush_every=100)
+    for i in range(5):
+        cache.put(i, i * i)
+    assert not os.path.exists(path)
+
+    cache.flush()
+    mtime = os.stat(path).st_mtime_ns
+    cache.flush()                       # 바뀐 것이 없으면 다시 쓰지 않음
+    assert os.stat(path).st_mtime_ns == mtime
+
+    reloaded = ResultCache(maxsize=10, path=path)
+    assert [reloaded.get(i) for i in range(5)] == [0, 1, 4, 9, 16]
+
+
+def test_flushes_every_n_puts(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = ResultCache(maxsize=100, path=path, flush_every=3)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert not os.path.exists(path)
+    cache.put("c", 3)
+    assert len(ResultCache(maxsize=100, path=path)) == 3
+
+
+def test_reload_respects_maxsize(tmp_path):
+    path = str(tmp_path / "cache.pkl")
+    cache = ResultCache(maxsize=10, path=path)
+    for i in range(10):
+        cache.put(i, i)
+    cache.flush()
+    small = ResultCache(maxsize=3, path=path)
+    assert len(small) == 3 and small.get(9) == 9 and small.get(0) is None
+
+
+def test_quantize_profile():
+    assert quantize_profile([1.2, 4.6]) == ((1, 5), None)
+    assert quantize_profile([3], weights=[0.25, 1.0]) == ((3,), (2, 10))
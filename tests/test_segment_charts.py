@@ -0,0 +1,46 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.segment_charts import SegmentProfiles
+
+
+def _profiles():
+    # zero_feat 는 모든 세그먼트 값이 0 -> 부분집합 평균 0, diff% 전부 NaN
+    df = pd.DataFrame({
+        "segment": [0, 1, 2, 3], "group": ["a", "b", "c", "d"],
+        "count": [50, 30, 15, 5], "pct": [50.0, 30.0, 15.0, 5.0],
+        "play_intensity": [1.0, 2.0, 4.0, 3.0], "play_intensity_diff%": [-50.0, 0.0, 100.0, 50.0],
+        "zero_feat": [0.0, 0.0, 0.0, 0.0], "zero_feat_diff%": [0.0, 0.0, 0.0, 0.0],
+    })
+    return SegmentProfiles(df)
+
+
+def test_compare_without_all_nan_warning():
+    profiles = _profiles()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = profiles.compare([0, 2, 3])
+    ranking = result.ranking.set_index("feature")
+    assert np.isnan(ranking.loc["zero_feat", "max_abs_diff%"])
+    assert ranking.loc["play_intensity", "top_segment"] == 2
+    assert ranking.loc["play_intensity", "bottom_segment"] == 0
+
+
+def test_compare_pairwise_matches_bruteforce():
+    profiles = _profiles()
+    result = profiles.compare([3, 1, 0])
+    assert result.segments == (0, 1, 3)
+    sub = profiles.values[[0, 1, 3]]
+    for i in range(3):
+        for j in range(3):
+            np.testing.assert_allclose(result.pairwise[i, j], sub[i] - sub[j], rtol=1e-6)
+    assert profiles.compare([0, 1, 3]) is result         # 같은 부분집합은 캐시 재사용
+
+
+@pytest.mark.parametrize("segments", [[], [1], [1, 1], [1, 99]])
+def test_compare_needs_two_known_segments(segments):
+    with pytest.raises(ValueError):
+        _profiles().compare(segments)
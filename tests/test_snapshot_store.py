@@ -0,0 +1,109 @@
+import json
+
+from core.persona_store import segment_persona
+from core.snapshot_store import SnapshotStore, read_header
+
+
+def _insight(version, when, scores, impact_top, segments):
+    return {
+        "analysis_metadata": {
+            "target": "STEAM", "postprocess_version": version, "postprocess_datetime": when,
+            "priority_scoring": {"impact_top": impact_top,
+                                 "scores": [{"segment_id": s, "impact_score": v} for s, v in scores.items()]},
+        },
+        "segments": segments,
+        "overall_insights": {"summary": version},
+    }
+
+
+def _segment(seg_id, name, quotes=(), note_quotes=()):
+    refs = [{"evidence_type": "quote", "value": q} for q in quotes]
+    refs += [{"evidence_type": "quite", "note": q} for q in note_quotes]      # 예전 스냅샷 형식
+    return {"segment_id": seg_id, "segment_size": 10,
+            "persona_profile": {"persona_name": name, "needs": ["a"], "evidence_refs": refs}}
+
+
+def _write(path, data, metadata_first=True):
+    if not metadata_first:
+        data = {k: data[k] for k in ("segments", "overall_insights", "analysis_metadata")}
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def _store(tmp_path):
+    _write(tmp_path / "STEAM_cluster_insights_1.json",
+           _insight("v1", "2025-01-01 00:00:00", {0: 0.5, 1: 0.2}, [0, 1],
+                    [_segment(0, "old", note_quotes=["~~옛~~ 인용"]), _segment(1, "gone")]))
+    _write(tmp_path / "STEAM_cluster_insights_2.json",
+           _insight("v2", "2025-02-01 00:00:00", {0: 0.7, 2: 0.1}, [0, 2],
+                    [_segment(0, "new", quotes=["새 인용"]), _segment(2, "added")]),
+           metadata_first=False)
+    return SnapshotStore(patterns=(str(tmp_path / "*.json"),))
+
+
+def test_read_header_small_chunks_and_metadata_last(tmp_path):
+    data = _insight("v1", "2025-01-01", {0: 0.5}, [0], [_segment(0, "x", quotes=["q" * 500])])
+    first = _write(tmp_path / "first.json", data)
+    last = _write(tmp_path / "last.json", data, metadata_first=False)
+    assert read_header(first, chunk=8) == data["analysis_metadata"]
+    assert read_header(last, chunk=8) == data["analysis_metadata"]
+
+
+def test_segment_persona_reads_note_quotes():
+    persona = segment_persona("steam", _segment(0, "old", quotes=["값"], note_quotes=["~~노트~~"]))
+    assert persona.persona_name == "old"
+    assert persona.quotes == ("값", "<del>노트</del>")
+
+
+def test_catalog_is_newest_first_and_open_is_cached(tmp_path):
+    store = _store(tmp_path)
+    infos = store.list("steam")
+    assert [i.version for i in infos] == ["v2", "v1"]
+    assert store.latest("steam").snapshot_id == "STEAM_cluster_insights_2"
+    assert store.list("youtube") == []
+
+    snapshot = store.open("STEAM_cluster_insights_1")
+    assert snapshot.segments[0].quotes == ("<del>옛</del> 인용",)
+    assert store.open(infos[1]) is snapshot
+    assert store.open("missing") is None
+
+
+def test_diff_scores_top_changes_and_fields(tmp_path):
+    store = _store(tmp_path)
+    d = store.diff("STEAM_cluster_insights_1", "STEAM_cluster_insights_2")
+    assert round(d.scores.loc[0, "impact_delta"], 6) == 0.2
+    assert d.scores.loc[1, "impact_other"] != d.scores.loc[1, "impact_other"]      # 사라진 세그먼트는 NaN
+    assert d.top_changes == {"impact_top": ((0, 1), (0, 2))}
+
+    changes = set(map(tuple, d.fields[["segment_id", "field", "change"]].to_numpy().tolist()))
+    assert (0, "persona_name", "changed") in changes
+    assert (0, "quotes", "added") in changes
+    assert (1, "segment", "removed") in changes
+    assert (2, "segment", "added") in changes
+    assert store.diff("STEAM_cluster_insights_1", "STEAM_cluster_insights_2") is d
+
+
+def test_catalog_is_built_once_until_directory_changes(tmp_path, monkeypatch):
+    import core.snapshot_store as snapshot_store
+
+    store = _store(tmp_path)
+    calls = []
+    real = snapshot_store.insight_files
+    monkeypatch.setattr(snapshot_store, "insight_files", lambda *a: calls.append(1) or real(*a))
+    store.list()
+    store.info("STEAM_cluster_insights_1")
+    store.latest("steam")
+    assert len(calls) == 1
+
+    # 새 파일 -> 디렉터리 수정 시각이 바뀌어 목록을 다시 만듦
+    _write(tmp_path / "STEAM_cluster_insights_3.json", _insight("v3", "2025-03-01 00:00:00", {0: 0.1}, [0], []))
+    assert store.latest("steam").version == "v3"
+
+    # 제자리 수정은 refresh() 뒤에 반영
+    path = tmp_path / "STEAM_cluster_insights_3.json"
+    mtime = tmp_path.stat().st_mtime_ns
+    path.write_text(json.dumps(_insight("v3b", "2025-03-01 00:00:00", {0: 0.1}, [0], [])), encoding="utf-8")
+    if tmp_path.stat().st_mtime_ns == mtime:
+        assert store.latest("steam").version == "v3"
+    store.refresh()
+    assert store.latest("steam").version == "v3b"
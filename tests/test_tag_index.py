@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from core.tag_index import TagIndex
+
+
+def _games(n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = [f"tag{i}" for i in range(15)]
+    # 앞쪽 태그일수록 흔하게 (IDF 차이가 생기도록)
+    p = np.linspace(3, 0.2, len(vocab))
+    p /= p.sum()
+    user_tags = [", ".join(rng.choice(vocab, rng.integers(1, 6), replace=False, p=p)) for _ in range(n)]
+    genres = [",".join(rng.choice(vocab[:4], 2, replace=False)) for _ in range(n)]
+    df = pd.DataFrame({"APPID": np.arange(1000, 1000 + n), "user_tags": user_tags, "genres_store": genres})
+    df.loc[3, ["user_tags", "genres_store"]] = [None, ""]   # 태그 없는 게임
+    return df
+
+
+def _dense(df, index):
+    """같은 어휘 순서로 직접 만든 IDF 가중 + 행 정규화 행렬"""
+    presence = np.zeros((len(df), len(index.vocab)))
+    pos = {t: i for i, t in enumerate(index.vocab)}
+    for r, (a, b) in enumerate(zip(df["user_tags"].fillna(""), df["genres_store"].fillna(""))):
+        for t in f"{a},{b}".split(","):
+            if t.strip():
+                presence[r, pos[t.strip()]] = 1
+    idf = np.log((1 + len(df)) / (1 + presence.sum(axis=0))) + 1
+    weighted = presence * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    return weighted / np.where(norms == 0, 1, norms), idf
+
+
+def test_idf_matrix_and_tag_query():
+    df = _games()
+    index = TagIndex(df)
+    dense, idf = _dense(df, index)
+    np.testing.assert_allclose(index.idf, idf, rtol=1e-6)
+    np.testing.assert_allclose(index.matrix.toarray(), dense, atol=1e-6)
+    assert index.popular_tags(1) == [index.vocab[np.argmax(index.doc_freq)]]
+
+    q = np.zeros(len(index.vocab))
+    for t in ("tag1", "tag9"):
+        q[list(index.vocab).index(t)] = idf[list(index.vocab).index(t)]
+    np.testing.assert_allclose(index.scores(["tag1", "tag9", "없는태그"]), dense @ (q / np.linalg.norm(q)), atol=1e-6)
+    assert not index.scores([]).any()
+
+
+def test_seed_game_query_adds_its_tag_vector():
+    df = _games()
+    index = TagIndex(df)
+    dense, _ = _dense(df, index)
+    np.testing.assert_allclose(index.scores(seed_appid=1005), dense @ dense[5], atol=1e-6)
+    q = index.query_vector(["tag12"], seed_appid=1005)
+    assert np.isclose(np.linalg.norm(q), 1) and q[list(index.vocab).index("tag12")] > 0
+
+
+def test_similar_to_matches_dense_ranking_without_self():
+    df = _games()
+    index = TagIndex(df, n_neighbors=10)
+    dense, _ = _dense(df, index)
+    sims = dense @ dense.T
+    np.fill_diagonal(sims, -np.inf)
+
+    rows, scores = index.similar_to(1007, k=5)
+    assert index._filled.sum() == 1 and index._filled[7]     # 물어본 게임 행만 채움
+    assert 7 not in rows
+    # 동점이 있어도 상위 점수 목록과 각 행의 실제 유사도는 같아야 함
+    np.testing.assert_allclose(scores, np.sort(sims[7])[::-1][:5], atol=1e-6)
+    np.testing.assert_allclose(scores, sims[7, rows], atol=1e-6)
+
+    index.precompute_neighbors()
+    assert index._filled.all()
+    for row in (0, 3, 40):
+        r, s = index.similar_to(1000 + row, k=10)
+        np.testing.assert_allclose(s, np.sort(sims[row])[::-1][:10], atol=1e-6)
+    assert len(index.similar_to(99999)[0]) == 0
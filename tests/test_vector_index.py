@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from core.vector_index import GameQuoteIndex
+
+
+def _docs(n=400, dim=12, seed=0):
+    rng = np.random.default_rng(seed)
+    # 문자열 정렬과 숫자 정렬이 다른 APPID (9 < 10 < 100) 를 섞어 둠
+    df = pd.DataFrame({
+        "APPID": rng.choice([9, 10, 100, 2001], n),
+        "dim": rng.choice(["D1", "D2", "D10"], n),
+        "raw_quote": [f"quote {i}" for i in range(n)],
+    })
+    df["key"] = [f"k{i}" for i in range(n)]
+    vectors = rng.normal(size=(n, dim)).astype(np.float32) * rng.uniform(0.5, 3.0, (n, 1))
+    return df, vectors
+
+
+def test_top_k_matches_bruteforce_filter_and_cosine():
+    df, vectors = _docs()
+    index = GameQuoteIndex(df, vectors)
+    query = np.random.default_rng(1).normal(size=vectors.shape[1])
+    for appid in (9, 10, 100, 2001):
+        for dim in (None, "D1", "D10"):
+            mask = (df["APPID"] == appid) & (True if dim is None else df["dim"] == dim)
+            assert index.count(appid, dim) == mask.sum()
+            sims = cosine_similarity(vectors[mask.values], query[None, :]).ravel()
+            want = df[mask].assign(score=sims).sort_values("score", ascending=False).head(5)
+            got = index.top_k(appid, query, k=5, dim=dim)
+            assert got["key"].tolist() == want["key"].tolist()
+            np.testing.assert_allclose(got["score"], want["score"], rtol=1e-5)
+
+
+def test_missing_game_returns_empty_frame():
+    df, vectors = _docs()
+    index = GameQuoteIndex(df, vectors)
+    assert index.count(12345) == 0 and index.count(9, "D7") == 0
+    out = index.top_k(12345, vectors[0], k=3)
+    assert out.empty and "score" in out
+
+
+def _normalized(vectors):
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_centroids_match_groupby_mean():
+    df, vectors = _docs()
+    index = GameQuoteIndex(df, vectors, chunk=37)             # 청크 경계가 그룹 중간에 걸리도록
+    normed = pd.DataFrame(_normalized(vectors)).assign(APPID=df["APPID"].astype(str), dim=df["dim"])
+    means = normed.groupby(["APPID", "dim"]).mean()
+    counts = normed.groupby(["APPID", "dim"]).size()
+    want = _normalized(means.to_numpy())
+    keys = [f"{a}\x1f{d}" for a, d in means.index]
+    pos = np.searchsorted(index.group_keys, keys)
+    np.testing.assert_allclose(index.centroids[pos], want, atol=1e-5)
+    np.testing.assert_array_equal(index.group_counts[pos], counts.to_numpy())
+    np.testing.assert_allclose(index.cohesion[pos], np.linalg.norm(means.to_numpy(), axis=1), atol=1e-5)
+
+    # 대표 리뷰 = 그룹 안에서 중심과 코사인이 가장 큰 리뷰
+    for (appid, dim), centroid in zip(means.index, want):
+        mask = ((df["APPID"].astype(str) == appid) & (df["dim"] == dim)).values
+        sims = _normalized(vectors[mask]) @ centroid
+        best = index.representative(appid, dim, k=2)
+        assert best["key"].tolist() == df["key"].values[mask][np.argsort(-sims)[:2]].tolist()
+
+
+def test_evidence_matrix_lookup():
+    df, vectors = _docs()
+    index = GameQuoteIndex(df, vectors)
+    counts, cohesion, quotes = index.evidence_matrix([10, 9, 555], ["D1", "D10", "D3"])
+    want = df.groupby([df["APPID"].astype(str), "dim"]).size()
+    assert counts.loc["10", "D1"] == want[("10", "D1")] and counts.loc["9", "D10"] == want[("9", "D10")]
+    assert (counts.loc["555"] == 0).all() and (counts["D3"] == 0).all()
+    assert np.isnan(cohesion.loc["555", "D1"]) and pd.isna(quotes.loc["555", "D1"])
+    assert quotes.loc["10", "D1"] == index.representative(10, "D1")["raw_quote"].iloc[0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import ward_tree
+from sklearn.cluster._agglomerative import _hc_cut
+
+from core.result_cache import ResultCache
+from core.ward_sweep import grid_points, pick_table, run_sweep, stable_cuts, sweep_table
+
+
+def _same_partition(a, b):
+    # 라벨 번호와 상관없이 같은 분할인지 (라벨 쌍이 1:1 대응)
+    pairs = set(zip(a.tolist(), b.tolist()))
+    return len(pairs) == len(set(a.tolist())) == len(set(b.tolist()))
+
+
+def _features_csv(tmp_path, n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=4.0, size=(4, 8))
+    X = centers[rng.integers(0, 4, n)] + rng.normal(size=(n, 8))
+    cols = [f"{p}_{i}" for p in ("focus", "culture", "engage", "emotion") for i in range(2)]
+    df = pd.DataFrame(X, columns=cols)
+    df.insert(0, "user_id", np.arange(n))
+    path = tmp_path / "features.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_stable_cuts_match_sklearn_and_keep_labels():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(80, 3))
+    children = ward_tree(X)[0]
+    ks = [2, 3, 4, 5, 6, 7]
+    cuts = stable_cuts(children, len(X), ks)
+    for k in ks:
+        assert _same_partition(cuts[k], _hc_cut(k, children, len(X)))
+        assert set(cuts[k].tolist()) == set(range(k))
+    # K 가 하나 늘면 군집 하나만 쪼개지고 나머지 번호는 그대로
+    for k in ks[:-1]:
+        prev, nxt = cuts[k], cuts[k + 1]
+        moved = nxt != prev
+        assert (nxt[moved] == k).all()
+        assert len(set(prev[moved].tolist())) == 1
+
+
+def test_run_sweep_reuses_cache_and_formats_table(tmp_path):
+    path = _features_csv(tmp_path)
+    cache = ResultCache(maxsize=64)
+    points = grid_points([1.0, 2.0], [3, 4], [10], [1.0], [1.0], [1.0])
+    logs = []
+    first = run_sweep(path, points, cache=cache, tree_dir=str(tmp_path / "trees"), log=logs.append)
+    assert set(first) == set(points)
+    assert "0 cached, 4 to compute (2 trees)" in logs[0]
+
+    # K 만 추가하면 기존 격자점은 캐시, 트리는 저장본 재사용
+    more = points + grid_points([1.0], [5], [10], [1.0], [1.0], [1.0])
+    logs.clear()
+    second = run_sweep(path, more, cache=cache, tree_dir=str(tmp_path / "trees"), log=logs.append)
+    assert "4 cached, 1 to compute (1 trees)" in logs[0]
+    assert all(second[p] == first[p] for p in points)
+
+    table = sweep_table(second)
+    assert list(table.columns[:6]) == ["W_FOCUS", "K", "Silhouette", "Davies-Bouldin", "Calinski-Harabasz",
+                                       "Balance(min/max)"]
+    assert [c for c in table.columns if c.startswith("군집")] == [f"군집{i}" for i in range(5)]
+    assert table[["W_FOCUS", "K"]].values.tolist() == [[1.0, 3], [1.0, 4], [1.0, 5], [2.0, 3], [2.0, 4]]
+    picked = pick_table(table, 1.0, 3)
+    assert len(picked) == 1 and "군집3" not in picked and "n_neighbors" not in picked
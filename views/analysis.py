@@ -1,7 +1,13 @@
+import time
+
 import streamlit as st
-import json
-import os
-import re
+
+from core.assets import AssetManifest, img_html, prefetch_html, segment_chart
+from core.evidence_index import EvidenceStore
+from core.perf import LatencyStats
+from core.snapshot_store import SnapshotStore, snapshot_label
+from core.segment_charts import (SegmentProfileStore, distance_spec, heatmap_spec, pairwise_spec, radar_overlay_spec,
+                                 radar_spec, size_spec)
 
 
 # 1. CSS 스타일링
@@ -65,14 +71,6 @@ st.markdown("""
         border-top: 1px solid #eee;
         padding-top: 30px;
     }
-    .graph-header {
-        font-weight: bold;
-        font-size: 1.3rem;
-        margin-top: 40px;
-        margin-bottom: 15px;
-        padding-left: 10px;
-        border-left: 5px solid #FF4B4B;
-    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -96,18 +94,154 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 2. 유틸리티 함수
-def load_json(path):
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return None
-
-def get_image_path(platform, filename):
-    path = os.path.join("data", "images", platform, filename)
-    if not os.path.exists(path) and not path.endswith(".png"):
-        path += ".png"
-    return path if os.path.exists(path) else None
+# 인사이트 JSON 목록은 헤더만 읽어 한 번 만들고 (파일 추가/삭제 시나 새로고침 버튼으로 다시 만듦),
+# 연 스냅샷과 버전 비교는 캐시
+@st.cache_resource
+def get_snapshot_store():
+    return SnapshotStore()
+
+def selected_snapshot(platform):
+    """버전 선택 상자에서 고른 스냅샷 (고르지 않았으면 최신)"""
+    store = get_snapshot_store()
+    sid = st.session_state.get(f"an_snapshot_{platform}")
+    info = store.info(sid) if sid else None
+    return store.open(info or store.latest(platform))
+
+# 차트 매니페스트 (python -m core.assets 로 빌드, 파일이 바뀌면 자동으로 다시 읽음)
+@st.cache_resource
+def get_asset_manifest():
+    return AssetManifest()
+
+# 세그먼트 프로필 CSV -> 차트 행렬 (파일이 바뀌면 자동으로 다시 읽음)
+@st.cache_resource
+def get_profile_store():
+    return SegmentProfileStore()
+
+# 전체 인사이트 파일의 근거 색인 (파일이 바뀌면 자동으로 다시 만듦)
+@st.cache_resource
+def get_evidence_store():
+    return EvidenceStore()
+
+# 세그먼트 전환 표시 시간 (프로세스 전체)
+@st.cache_resource
+def get_latency_stats():
+    return LatencyStats()
+
+RADAR_SIZES = "(max-width: 640px) 100vw, 45vw"     # 좌측 컬럼 폭 (좁은 화면에서는 컬럼이 세로로 쌓여 전체 폭)
+# 하단 상세 지표 그래프 (펼친 것만 렌더링)
+LOWER_CHARTS = [
+    ("topics", "1. 주요 토픽 (Top Topics)"),
+    ("lift", "2. 토픽 리프트 (Topic Lift)"),
+    ("mirror", "3. 긍/부정 비교 (Topdiff Mirror)"),
+    ("sizes", "4. 세그먼트 비중 (Segment Size)"),
+    ("heatmap", "5. 특성 히트맵 (Feature Z-score)"),
+]
+IMAGE_CHARTS = ("topics", "lift", "mirror")      # 세그먼트마다 다른 이미지 (이웃 세그먼트 미리 받기 대상)
+
+def show_chart(platform, name, sizes="100vw", caption=None, loading="lazy"):
+    """빌드된 WebP 파생본을 srcset 으로, 없으면 원본 PNG 를 표시 (이미지가 없으면 False)"""
+    assets = get_asset_manifest()
+    asset = assets.get(platform, name)
+    if asset is not None:
+        st.markdown(img_html(asset, sizes=sizes, alt=caption or name, loading=loading), unsafe_allow_html=True)
+        if caption:
+            st.caption(caption)
+        return True
+    path = assets.original(platform, name)
+    if path is None:
+        return False
+    st.image(path, caption=caption, use_container_width=True)
+    return True
+
+def show_lower_chart(platform, chart, current_seg):
+    """비중/히트맵은 프로필 표에서 바로 그리고 (표가 없으면 이미지), 나머지는 이미지"""
+    profiles = get_profile_store().get(platform)
+    if chart == "sizes":
+        if profiles is not None:
+            spec = size_spec(profiles.segments, profiles.counts, profiles.pcts, current_seg)
+        else:
+            # 프로필 표가 없는 플랫폼은 페르소나 JSON 의 세그먼트 크기 사용
+            snapshot = selected_snapshot(platform)
+            segs = [snapshot.segments[i] for i in sorted(snapshot.segments)] if snapshot else []
+            spec = size_spec([p.segment_id for p in segs], [p.segment_size or 0 for p in segs],
+                             [float(str(p.segment_ratio or 0).rstrip("%")) for p in segs], current_seg)
+        st.vega_lite_chart(spec, width="stretch")
+        return True
+    if chart == "heatmap" and profiles is not None:
+        st.vega_lite_chart(heatmap_spec(profiles, current_seg), width="stretch")
+        return True
+    return show_chart(platform, segment_chart(platform, chart, current_seg))
+
+EVIDENCE_LIMIT = 500     # 근거 탐색 표에 보여 줄 최대 행 수
+
+def render_evidence(platform, current_seg):
+    """플랫폼의 모든 스냅샷 근거를 키/출처/세그먼트/값 범위/인용 문구로 걸러 보기"""
+    index = get_evidence_store().get()
+    plat = index.query(platform=platform)
+    if plat.empty:
+        st.info("이 플랫폼의 근거 데이터가 없습니다.")
+        return
+    used = lambda col: sorted(plat[col].dropna().unique().tolist())
+
+    c1, c2, c3 = st.columns(3)
+    snapshots = c1.multiselect("스냅샷", used("snapshot"), key=f"an_ev_snapshot_{platform}")
+    types = c2.multiselect("유형", used("evidence_type"), key=f"an_ev_type_{platform}")
+    sources = c3.multiselect("출처", used("source"), key=f"an_ev_source_{platform}")
+    c4, c5, c6 = st.columns([2, 1, 1])
+    keys = c4.multiselect("지표 키", used("key"), key=f"an_ev_key_{platform}")
+    value_min = c5.number_input("값 ≥", value=None, key=f"an_ev_min_{platform}")
+    value_max = c6.number_input("값 ≤", value=None, key=f"an_ev_max_{platform}")
+    c7, c8 = st.columns([1, 2])
+    only_current = c7.toggle("현재 세그먼트만", value=True, key=f"an_ev_current_{platform}")
+    text = c8.text_input("인용 검색", placeholder="예: 스토리", key=f"an_ev_text_{platform}")
+
+    t0 = time.perf_counter()
+    result = index.query(text=text.strip() or None, platform=platform, snapshot=snapshots or None,
+                         evidence_type=types or None, source=sources or None, key=keys or None,
+                         segment=current_seg if only_current else None, value_min=value_min, value_max=value_max)
+    elapsed = (time.perf_counter() - t0) * 1000
+    st.caption(f"{len(result):,}건 / 전체 {len(index):,}건 · {elapsed:.1f} ms"
+               + (f" (앞 {EVIDENCE_LIMIT}건 표시)" if len(result) > EVIDENCE_LIMIT else ""))
+    st.dataframe(result.head(EVIDENCE_LIMIT).drop(columns="platform"), hide_index=True, width="stretch",
+                 column_config={
+                     "snapshot": "스냅샷", "segment_id": "세그먼트", "evidence_type": "유형", "source": "출처",
+                     "key": "키", "value": st.column_config.NumberColumn("값", format="%.4g"),
+                     "text": st.column_config.TextColumn("인용", width="large"), "chart_name": "차트",
+                 })
+
+def render_snapshot_diff(platform, snapshot, current_seg):
+    """선택한 버전과 다른 버전의 우선순위 점수 · 페르소나 필드 변화 (버전 쌍별 결과는 캐시)"""
+    store = get_snapshot_store()
+    others = [v for v in store.list(platform) if v.snapshot_id != snapshot.info.snapshot_id]
+    if not others:
+        st.info("비교할 다른 버전이 없습니다.")
+        return
+    # 기본 비교 기준: 선택한 버전 바로 이전 버전 (없으면 가장 최근의 다른 버전)
+    older = [i for i, v in enumerate(others) if v.timestamp <= snapshot.info.timestamp]
+    labels = {v.snapshot_id: snapshot_label(v) for v in others}
+    base_id = st.selectbox("비교 기준 버전", list(labels), index=older[0] if older else 0, format_func=labels.get,
+                           key=f"an_diff_base_{platform}")
+    diff = store.diff(base_id, snapshot.info.snapshot_id)
+    st.caption(f"{snapshot_label(diff.base)} → {snapshot_label(diff.other)}")
+
+    for name, (before, after) in diff.top_changes.items():
+        st.markdown(f"- **{name}**: {list(before)} → {list(after)}")
+    st.markdown("**📈 우선순위 점수 변화** (선택 버전 - 기준 버전)")
+    st.dataframe(diff.scores, width="stretch", column_config={
+        c: st.column_config.NumberColumn(format="%+.3f" if c.endswith("_delta") else "%.3f") for c in diff.scores.columns
+    })
+
+    if diff.fields is None:
+        st.warning("스냅샷 본문을 읽을 수 없어 필드 비교를 건너뜁니다.")
+        return
+    fields = diff.fields[diff.fields["segment_id"].isin([-1, current_seg])]
+    st.markdown(f"**📝 바뀐 필드** (Segment {current_seg} · 전체 메타데이터)")
+    if fields.empty:
+        st.info("바뀐 필드가 없습니다.")
+    else:
+        st.dataframe(fields.astype({"base": str, "other": str}).replace("None", ""), hide_index=True, width="stretch",
+                     column_config={"segment_id": "세그먼트", "field": "필드", "change": "변경",
+                                    "base": "기준 버전", "other": "선택 버전"})
 
 # 3. 상태 관리
 if "an_platform" not in st.session_state:
@@ -131,175 +265,234 @@ with c_plat2:
         st.session_state.an_selected_segment = 0
         st.rerun()
 
-# [Level 2] 세그먼트 선택
-platform = st.session_state.an_platform
-current_seg = st.session_state.an_selected_segment
-
-if platform == "steam":
-    seg_names = [
-        "0. 휴면 구매자", "1. 장기 몰입형 휴식자", "2. 조용한 꾸준 플레이어", "3. 하드코어 몰입형 분석가",
-        "4. 간헐적 만족 플레이어", "5. 구매 후 실망 이탈후보", "6. 영향력 높은 선별 비평가", "7. 충성도 높은 몰입 비평가"
-    ]
-    rows = [st.columns(4), st.columns(4)]
-else: # YouTube
-    seg_names = [
-        "0. 수동적 세계관 여행자", "1. 과몰입 서사 덕후", "2. 엄격한 성능 가별사", 
-        "3. 소수 정예 길마", "4. 진심 모드 장인", "5. 조용한 충성 고수"
-    ]
-    rows = [st.columns(6)]
-
-st.write("") 
-
-for i, name in enumerate(seg_names):
+def render_comparison(platform, seg_names):
+    """여러 세그먼트를 한 화면에서 비교 (부분집합별 계산 결과는 캐시)"""
+    profiles = get_profile_store().get(platform)
+    if profiles is None:
+        st.info("이 플랫폼은 세그먼트 프로필 표가 없어 비교 모드를 쓸 수 없습니다.")
+        return
+    labels = {int(s): seg_names[s] if s < len(seg_names) else f"Segment {s}" for s in profiles.segments}
+    current = st.session_state.an_selected_segment
+    default = [s for s in (current, current + 1 if current + 1 in labels else current - 1) if s in labels]
+    chosen = st.multiselect("비교할 세그먼트", list(labels), default=default, format_func=labels.get,
+                            key=f"an_compare_{platform}")
+    if len(chosen) < 2:
+        st.info("비교할 세그먼트를 두 개 이상 고르세요.")
+        return
+    result = profiles.compare(chosen)
+
+    c_radar, c_rank = st.columns([1.3, 1.7])
+    with c_radar:
+        st.vega_lite_chart(radar_overlay_spec(profiles, result.segments, labels), width="content")
+        st.caption("전체 평균 대비 배율")
+    with c_rank:
+        st.markdown("**🔎 구분 특성 순위** (선택한 세그먼트 사이 Z-score 폭)")
+        ranking = result.ranking.head(10).assign(top_segment=lambda d: d["top_segment"].map(labels),
+                                                 bottom_segment=lambda d: d["bottom_segment"].map(labels))
+        st.dataframe(ranking, hide_index=True, width="stretch", column_config={
+            "feature": "특성", "spread_z": st.column_config.NumberColumn("Z 폭", format="%.2f"),
+            "top_segment": "최고", "top_value": st.column_config.NumberColumn("최고값", format="%.3f"),
+            "bottom_segment": "최저", "bottom_value": st.column_config.NumberColumn("최저값", format="%.3f"),
+            "max_abs_diff%": st.column_config.NumberColumn("최대 |diff%|", format="%.1f"),
+        })
+
+    st.markdown("**📋 세그먼트별 값 · 선택 세그먼트 평균 대비 diff%** (고객수 가중)")
+    table = result.table.rename(index=labels)
+    st.dataframe(table, width="stretch", column_config={
+        c: st.column_config.NumberColumn(format="%+.1f" if c.endswith("_diff%") else "%.3f")
+        for c in table.columns if c not in ("count", "pct")
+    })
+
+    c_pair, c_dist = st.columns(2)
+    with c_pair:
+        feature = st.selectbox("쌍별 차이를 볼 특성 (행 - 열)", result.ranking["feature"], key=f"an_compare_feature_{platform}")
+        st.vega_lite_chart(pairwise_spec(result, profiles.features.index(feature), labels), width="stretch")
+    with c_dist:
+        st.markdown("**세그먼트 간 거리** (특성 전체 평균 |ΔZ|)")
+        st.vega_lite_chart(distance_spec(result, labels), width="stretch")
+
+# [Level 2] 세그먼트 선택 + 콘텐츠
+# 세그먼트 전환/그래프 펼치기는 이 fragment 만 다시 실행 (플랫폼 전환은 페이지 전체)
+def select_segment(i):
+    st.session_state.an_selected_segment = i
+
+@st.fragment
+def render_segment_view(platform):
+    t_start = time.perf_counter()
+    current_seg = st.session_state.an_selected_segment
+
     if platform == "steam":
-        row_idx = i // 4
-        col_idx = i % 4
-    else:
-        row_idx = 0
-        col_idx = i
+        seg_names = [
+            "0. 휴면 구매자", "1. 장기 몰입형 휴식자", "2. 조용한 꾸준 플레이어", "3. 하드코어 몰입형 분석가",
+            "4. 간헐적 만족 플레이어", "5. 구매 후 실망 이탈후보", "6. 영향력 높은 선별 비평가", "7. 충성도 높은 몰입 비평가"
+        ]
+    else: # YouTube
+        seg_names = [
+            "0. 수동적 세계관 여행자", "1. 과몰입 서사 덕후", "2. 엄격한 성능 가별사", 
+            "3. 소수 정예 길마", "4. 진심 모드 장인", "5. 조용한 충성 고수"
+        ]
+
+    # 비교 모드에서는 세그먼트 버튼 대신 여러 세그먼트를 골라 한 화면에서 비교
+    if st.toggle("🔀 세그먼트 비교 모드", key="an_compare_mode"):
+        render_comparison(platform, seg_names)
+        return
+
+    # 인사이트 버전 선택 (목록은 헤더만 읽은 것, 고른 버전은 처음 한 번만 파싱)
+    versions = get_snapshot_store().list(platform)
+    if len(versions) > 1:
+        labels = {v.snapshot_id: snapshot_label(v) for v in versions}
+        c_version, c_refresh = st.columns([6, 1], vertical_alignment="bottom")
+        c_version.selectbox("🗂️ 인사이트 버전", list(labels), format_func=labels.get, key=f"an_snapshot_{platform}")
+        # 파일을 제자리에서 고쳐 쓴 경우 목록을 다시 읽음
+        c_refresh.button("🔄", key="an_snapshot_refresh", help="인사이트 목록 새로고침",
+                         on_click=get_snapshot_store().refresh)
+
+    rows = [st.columns(4), st.columns(4)] if platform == "steam" else [st.columns(6)]
+
+    st.write("") 
+
+    for i, name in enumerate(seg_names):
+        if platform == "steam":
+            row_idx = i // 4
+            col_idx = i % 4
+        else:
+            row_idx = 0
+            col_idx = i
+            
+        with rows[row_idx][col_idx]:
+            btn_type = "primary" if current_seg == i else "secondary"
+            st.button(name, key=f"seg_btn_{i}", type=btn_type, use_container_width=True,
+                      on_click=select_segment, args=(i,))
+
+    st.divider()
+
+
+    # 5. 콘텐츠 렌더링
+    # 연 스냅샷의 segment_id 색인 조회 — 세그먼트/버전 전환 시 JSON 파싱 없음
+    snapshot = selected_snapshot(platform)
+    persona = snapshot.segments.get(current_seg) if snapshot else None
+
+    if persona is None:
+        st.warning(f"Segment {current_seg}에 대한 JSON 데이터가 없습니다.")
+        return
+
+
+    # 1순위: 상단 영역 (레이더 차트 + 설명)
+    c_radar, c_info = st.columns([1.3, 1.7])
+
+    with c_radar:
+        # 레이더 차트 (좌측) — 프로필 표가 있으면 수 KB 짜리 spec 으로 브라우저에서 그림
+        profiles = get_profile_store().get(platform)
+        radar_img = segment_chart(platform, "radar", current_seg)
+        if profiles is not None and profiles.row(current_seg) is not None:
+            group = profiles.groups[profiles.row(current_seg)]
+            title = f"{persona.persona_name} ({group})" if group else persona.persona_name
+            st.vega_lite_chart(radar_spec(profiles, current_seg, title=title), width="content")
+            st.caption(f"{platform.upper()} - Segment {current_seg} Radar · 전체 평균 대비 배율")
+        # 첫 화면이므로 이미지는 바로 받음
+        elif not show_chart(platform, radar_img, sizes=RADAR_SIZES, loading="eager",
+                            caption=f"{platform.upper()} - Segment {current_seg} Radar"):
+            st.container(border=True, height=400).write(f"이미지 없음: {radar_img}")
+
+    with c_info:
+        # 설명들 (우측)
+        # 1. 이름
+        st.markdown(f"<div class='persona-title'>{persona.persona_name}</div>", unsafe_allow_html=True)
         
-    with rows[row_idx][col_idx]:
-        label = name
-        btn_type = "primary" if current_seg == i else "secondary"
-        if st.button(label, key=f"seg_btn_{i}", type=btn_type, use_container_width=True):
-            st.session_state.an_selected_segment = i
-            st.rerun()
-
-st.divider()
-
-
-# 5. 콘텐츠 렌더링
-json_path = os.path.join("data", "insights", f"{platform}_persona.json")
-full_data = load_json(json_path)
-
-# 데이터 준비
-seg_data = None
-profile = {}
-
-if full_data and "segments" in full_data:
-    for seg in full_data["segments"]:
-        if seg.get("segment_id") == current_seg:
-            seg_data = seg
-            profile = seg_data.get("persona_profile", {})
-            break
-
-if not seg_data:
-    st.warning(f"Segment {current_seg}에 대한 JSON 데이터가 없습니다.")
-    st.stop()
-
-
-# 1순위: 상단 영역 (레이더 차트 + 설명)
-c_radar, c_info = st.columns([1.3, 1.7])
-
-with c_radar:
-    # 레이더 차트 (좌측)
-    img_prefix = "08_radar_seg_" if platform == "steam" else "04_radar_"
-    img_path = get_image_path(platform, f"{img_prefix}{current_seg}")
-    if img_path:
-        st.image(img_path, caption=f"{platform.upper()} - Segment {current_seg} Radar", use_container_width=True)
-    else:
-        st.container(border=True, height=400).write(f"이미지 없음: {img_prefix}{current_seg}")
-
-with c_info:
-    # 설명들 (우측)
-    # 1. 이름
-    st.markdown(f"<div class='persona-title'>{profile.get('persona_name', 'N/A')}</div>", unsafe_allow_html=True)
-    
-    # 2. 해시태그
-    priority = profile.get('target_priority', '-')
-    money = profile.get('monetization_potential', '-')
-    st.markdown(f"""
-    <div style='margin-bottom: 10px;'>
-        <span class='hashtag-badge'>#우선순위: {priority}</span>
-        <span class='hashtag-badge'>#수익화: {money}</span>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # 3. 한줄 요약
-    one_liner = profile.get('one_liner', '')
-    if one_liner:
-        st.markdown(f"<div class='persona-one-liner'>💡 {one_liner}</div>", unsafe_allow_html=True)
-    
-    # 4. 탭
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 특징", "📖 상세 설명", "🎯 니즈/페인포인트", "✅ 액션 플랜"])
-    
-    with tab1:
-        st.markdown("**주요 특징**")
-        for char in profile.get('key_characteristics', []):
-            st.markdown(f"- {char}")
-    
-    with tab2:
-        st.markdown("**📝 세그먼트 상세 설명**")
-        st.write(profile.get('description', '설명 데이터가 없습니다.'))
-
-    with tab3:
-        c_needs, c_pains = st.columns(2)
-        with c_needs:
-            st.markdown("**Needs (니즈)**")
-            for item in profile.get('needs', []):
-                st.markdown(f"- {item}")
-        with c_pains:
-            st.markdown("**Pain Points (불만)**")
-            for item in profile.get('pain_points', []):
-                st.markdown(f"- {item}")
-
-    with tab4:
-        st.markdown("**Recommended Actions**")
-        for action in profile.get('recommended_actions', []):
-            st.markdown(f"- {action}")
-
-
-# 2순위: 대표 댓글 (중앙)
-st.markdown("<div class='centered-header'>🗣️ 대표 댓글 (Voice of User)</div>", unsafe_allow_html=True)
-
-evidence_list = profile.get('evidence_refs', [])
-quotes = [e for e in evidence_list if e.get('evidence_type') in ['quote', 'quite']]
-
-if quotes:
-    # 댓글 여러 개일 경우 grid 사용 여부는 선택 (여기선 1열로 큼직하게)
-    for q in quotes:
-        content = q.get('value', '')
-        if content:
-            # 취소선 처리
-            content = re.sub(r'~~(.*?)~~', r'<del>\1</del>', content)
+        # 2. 해시태그
+        priority = persona.target_priority
+        money = persona.monetization_potential
+        st.markdown(f"""
+        <div style='margin-bottom: 10px;'>
+            <span class='hashtag-badge'>#우선순위: {priority}</span>
+            <span class='hashtag-badge'>#수익화: {money}</span>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # 3. 한줄 요약
+        one_liner = persona.one_liner
+        if one_liner:
+            st.markdown(f"<div class='persona-one-liner'>💡 {one_liner}</div>", unsafe_allow_html=True)
+        
+        # 4. 탭
+        tab1, tab2, tab3, tab4 = st.tabs(["📝 특징", "📖 상세 설명", "🎯 니즈/페인포인트", "✅ 액션 플랜"])
+        
+        with tab1:
+            st.markdown("**주요 특징**")
+            for char in persona.key_characteristics:
+                st.markdown(f"- {char}")
+        
+        with tab2:
+            st.markdown("**📝 세그먼트 상세 설명**")
+            st.write(persona.description)
+
+        with tab3:
+            c_needs, c_pains = st.columns(2)
+            with c_needs:
+                st.markdown("**Needs (니즈)**")
+                for item in persona.needs:
+                    st.markdown(f"- {item}")
+            with c_pains:
+                st.markdown("**Pain Points (불만)**")
+                for item in persona.pain_points:
+                    st.markdown(f"- {item}")
+
+        with tab4:
+            st.markdown("**Recommended Actions**")
+            for action in persona.recommended_actions:
+                st.markdown(f"- {action}")
+
+    # 첫 화면(상단 영역) 전송까지 걸린 서버 시간
+    stats = get_latency_stats()
+    stats.record(f"{platform}:first_paint", time.perf_counter() - t_start)
+
+
+    # 2순위: 대표 댓글 (중앙)
+    st.markdown("<div class='centered-header'>🗣️ 대표 댓글 (Voice of User)</div>", unsafe_allow_html=True)
+
+    # 인용 추출과 취소선(<del>) 변환은 store 에서 미리 끝나 있음
+    if persona.quotes:
+        # 댓글 여러 개일 경우 grid 사용 여부는 선택 (여기선 1열로 큼직하게)
+        for content in persona.quotes:
             st.markdown(f"<div class='comment-box'>“{content}”</div>", unsafe_allow_html=True)
-else:
-    st.info("이 세그먼트에 등록된 대표 댓글이 없습니다.")
-
-
-# 3, 4, 5순위: 상세 지표 그래프 (하단 나열)
-st.write("")
-st.markdown("### 📊 상세 지표 분석")
-
-# 3순위: Top Topics
-st.markdown("<div class='graph-header'>1. 주요 토픽 (Top Topics)</div>", unsafe_allow_html=True)
-if platform == "steam":
-    topic_img = f"top_topic_segment_{current_seg}.png"
-else:
-    topic_img = f"02_2_top_topics_per_segment_{current_seg}.png"
-
-path_topic = get_image_path(platform, topic_img)
-if path_topic:
-    st.image(path_topic, use_container_width=True)
-else:
-    st.error(f"이미지 없음: {topic_img}")
-
-
-# 4순위: Topic Lift
-st.markdown("<div class='graph-header'>2. 토픽 리프트 (Topic Lift)</div>", unsafe_allow_html=True)
-lift_img = f"02_3_topic_lift_segment_{current_seg}.png"
-path_lift = get_image_path(platform, lift_img)
-if path_lift:
-    st.image(path_lift, use_container_width=True)
-else:
-    st.error(f"이미지 없음: {lift_img}")
-
-
-# 5순위: Topdiff Mirror
-st.markdown("<div class='graph-header'>3. 긍/부정 비교 (Topdiff Mirror)</div>", unsafe_allow_html=True)
-mirror_img = f"12_topdiff_mirror_segment_{current_seg}.png" if platform == "steam" else f"09_topdiff_mirror_segment_{current_seg}.png"
-path_mirror = get_image_path(platform, mirror_img)
-if path_mirror:
-    st.image(path_mirror, use_container_width=True)
-else:
-    st.error(f"이미지 없음: {mirror_img}")
\ No newline at end of file
+    else:
+        st.info("이 세그먼트에 등록된 대표 댓글이 없습니다.")
+
+
+    # 3, 4, 5순위: 상세 지표 그래프 (하단)
+    # 접힌 그래프는 렌더링 자체를 건너뛰고, 펼친 그래프도 이미지는 스크롤로 화면에 들어올 때 받음
+    st.write("")
+    st.markdown("### 📊 상세 지표 분석")
+
+    opened = []
+    for chart, label in LOWER_CHARTS:
+        with st.expander(label, key=f"an_open_{chart}", on_change="rerun") as section:
+            if section.open:
+                opened.append(chart)
+                if not show_lower_chart(platform, chart, current_seg):
+                    st.error(f"이미지 없음: {segment_chart(platform, chart, current_seg)}.png")
+    with st.expander("6. 근거 탐색 (Evidence)", key="an_open_evidence", on_change="rerun") as section:
+        if section.open:
+            render_evidence(platform, current_seg)
+    with st.expander("7. 버전 변경 내역 (Snapshot Diff)", key="an_open_versions", on_change="rerun") as section:
+        if section.open:
+            render_snapshot_diff(platform, snapshot, current_seg)
+
+    # 이웃 세그먼트(±1)의 이미지 레이더와 펼쳐 둔 이미지 그래프를 브라우저가 유휴 시간에 미리 받아 둠
+    assets = get_asset_manifest()
+    neighbors = [s for s in (current_seg + 1, current_seg - 1) if 0 <= s < len(seg_names)]
+    image_charts = [] if profiles is not None else [("radar", RADAR_SIZES)]
+    image_charts += [(c, "100vw") for c in opened if c in IMAGE_CHARTS]
+    prefetch = [(assets.get(platform, segment_chart(platform, chart, s)), sizes)
+                for s in neighbors for chart, sizes in image_charts]
+    html = prefetch_html(prefetch)
+    if html:
+        st.markdown(html, unsafe_allow_html=True)
+
+    stats.record(f"{platform}:total", time.perf_counter() - t_start)
+    first, total = stats.summary(f"{platform}:first_paint"), stats.summary(f"{platform}:total")
+    st.caption(f"⏱ 세그먼트 표시(서버): 상단 {first['last_ms']:.1f} ms · 전체 {total['last_ms']:.1f} ms "
+               f"(최근 {first['count']}회 중앙값 상단 {first['p50_ms']:.1f} ms · p90 {first['p90_ms']:.1f} ms)")
+
+
+render_segment_view(st.session_state.an_platform)
@@ -1,104 +1,80 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import google.generativeai as genai
-from sklearn.metrics.pairwise import cosine_similarity
-import re
-import threading
-import time
-
-
-# 1. 백그라운드 작업 관리자
-class EmbeddingJobManager:
-    def __init__(self):
-        self.is_running = False      # 실행 중인지 여부
-        self.progress = 0.0          # 진행률 (0.0 ~ 1.0)
-        self.status_text = ""        # 현재 상태 메시지
-        self.df_docs = None          # 결과 데이터 (문서)
-        self.doc_embeddings = None   # 결과 데이터 (임베딩)
-        self.error_msg = None        # 에러 메시지
-
-    def start_job(self, df_rag, api_key):
-        """백그라운드 쓰레드 시작"""
-        if self.is_running: return 
-        if self.doc_embeddings is not None: return 
-        
-        self.is_running = True
-        self.error_msg = None
-        self.progress = 0.0
-        
-        # 쓰레드 생성
-        thread = threading.Thread(target=self._run_embedding, args=(df_rag, api_key))
-        thread.start()
-
-    def _run_embedding(self, df_rag, api_key):
-        """실제 백그라운드 임베딩 작업"""
-        try:
-            genai.configure(api_key=api_key)
-            
-            # 데이터 전처리
-            documents = []
-            quote_cols = [c for c in df_rag.columns if "quote" in c.lower()]
-            
-            self.status_text = "데이터 전처리 중..."
-            
-            for _, row in df_rag.iterrows():
-                appid = row['APPID']
-                game_name = row.get('game_name', f"Game {appid}")
-                for col in quote_cols:
-                    quote = str(row[col]) if pd.notna(row[col]) else ""
-                    quote = re.sub(r"\s+", " ", quote).strip()
-                    if not quote: continue
-                    dim_code = col.split("_")[0].upper()
-                    documents.append({
-                        "APPID": appid, "game_name": game_name,
-                        "dim": dim_code, "text": f"[{dim_code}] {quote}",
-                        "raw_quote": quote
-                    })
-            
-            if not documents:
-                self.error_msg = "분석할 텍스트 데이터가 없습니다."
-                self.is_running = False
-                return
-
-            self.df_docs = pd.DataFrame(documents)
-            texts = self.df_docs['text'].tolist()
-            embeddings = []
-            batch_size = 50
-            total_batches = len(texts) // batch_size + 1
-            
-            model = "models/text-embedding-004"
-            
-            # 배치 처리 및 진행률 업데이트
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i+batch_size]
-                try:
-                    result = genai.embed_content(model=model, content=batch)
-                    embeddings.extend(result['embedding'])
-                except Exception as e:
-                    print(f"Error: {e}")
-                    time.sleep(1)
-                
-                # 진행률 업데이트
-                current_batch = (i // batch_size) + 1
-                self.progress = min(current_batch / total_batches, 0.99)
-                self.status_text = f"임베딩 생성 중... ({int(self.progress * 100)}%)"
-            
-            self.doc_embeddings = np.array(embeddings)
-            self.status_text = "완료!"
-            self.progress = 1.0
-            
-        except Exception as e:
-            self.error_msg = f"임베딩 실패: {e}"
-        finally:
-            self.is_running = False
 
-# 메모리에 저장 (세션 스테이트 사용)
+
+from core.embedding_job import EmbeddingJobManager, RAG_CSV_PATH
+from core.data import data_version, load_games_cached
+from core.lexical_index import DIM_KEYWORDS
+from core.perf import RunCounter
+from core.query_cache import QueryEmbeddingCache
+from core.recommender import DIM_CODES, DIM_COLS, RecommendationEngine
+from core.result_cache import DEFAULT_RESULT_CACHE_PATH, ResultCache, quantize_profile
+from core.tag_index import TagIndex
+
+
+# 1. 백그라운드 작업 관리자 (서버 프로세스당 하나를 모든 세션이 공유)
+@st.cache_resource
 def get_job_manager():
-    if 'my_job_manager' not in st.session_state:
-        st.session_state.my_job_manager = EmbeddingJobManager()
-    return st.session_state.my_job_manager
+    return EmbeddingJobManager()
+
+# 질의 임베딩 캐시 (모든 세션 공유, 1시간 TTL)
+@st.cache_resource
+def get_query_cache():
+    return QueryEmbeddingCache(maxsize=1024, ttl=3600)
+
+def embed_queries(queries):
+    """캐시에 없는 질의만 한 번의 배치 호출로 임베딩 (문서와 같은 백엔드 사용)"""
+    backend = get_job_manager().backend
+    return get_query_cache().get_many(backend.id, queries, backend.embed_batch)
+
+# 추천 결과 캐시 (슬라이더 입력이 유한하므로 같은 프로필은 계산/네트워크 호출 없이 재사용)
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(maxsize=256, path=DEFAULT_RESULT_CACHE_PATH)
+
+# 근거 리뷰 검색 방식 (표시명 -> fusion 인자, None 이면 임베딩만, centroid 면 차원 중심 순위)
+SEARCH_MODES = {"하이브리드 (RRF)": "rrf", "하이브리드 (가중합)": "blend", "임베딩만": None,
+                "차원 대표 리뷰 (질의 임베딩 없음)": "centroid"}
+
+def find_card_quotes(manager, appids, target_kor_col, k=3, fusion="rrf", dim_filter=True):
+    """추천 게임별 근거 리뷰 top-k -> ({appid: DataFrame}, 에러)
+
+    dim_filter 면 팀 강점 차원(D1~D10)에서 나온 리뷰만 봅니다.
+    centroid 모드는 (게임, 차원) 중심 벡터에 가까운 순으로 골라 질의 임베딩 호출이 없고,
+    하이브리드 모드에서는 차원 키워드 BM25 점수를 한 번 계산해 카드마다 슬라이스하며,
+    질의 임베딩이 실패해도 (오프라인 등) BM25 순위로 근거를 보여줍니다.
+    """
+    if manager.index is None:
+        return {}, None
+    dim = DIM_CODES[DIM_COLS.index(target_kor_col)] if dim_filter or fusion == "centroid" else None
+    appids = [a for a in appids if manager.index.count(a, dim)]
+    if not appids:
+        return {}, None
+    if fusion == "centroid":
+        return {a: manager.index.representative(a, dim, k=k) for a in appids}, None
+    lexical_scores = None
+    if fusion is not None and manager.lexical is not None:
+        lexical_scores = manager.lexical.scores(DIM_KEYWORDS.get(target_kor_col, target_kor_col))
+    query = f"이 게임의 {target_kor_col}에 대한 긍정적인 평가나 특징"
+    try:
+        # 카드별 질의를 모아 한 번에 임베딩 (질의 캐시 적중 시 네트워크 호출 없음)
+        query_vectors = embed_queries([query] * len(appids))
+    except Exception as e:
+        if lexical_scores is None:
+            return {}, e
+        query_vectors = [None] * len(appids)
+    return {a: manager.index.top_k(a, q_vec, k=k, dim=dim, lexical_scores=lexical_scores, fusion=fusion or "rrf")
+            for a, q_vec in zip(appids, query_vectors)}, None
+
+
 
+# 페이지 스크립트 실행 횟수 (진행률 갱신 방식 비교용)
+@st.cache_resource
+def get_run_counter():
+    return RunCounter()
+
+get_run_counter().record("rag")
 
 
 # 2. 기본 설정 및 데이터 로드
@@ -135,43 +111,52 @@ manager = get_job_manager()
 if "gemini_api_key" not in st.session_state:
     st.session_state.gemini_api_key = ""
 
-if st.session_state.gemini_api_key:
+if st.session_state.gemini_api_key and manager.backend.requires_api_key:
     try:
-        genai.configure(api_key=st.session_state.gemini_api_key)
+        manager.backend.configure(api_key=st.session_state.gemini_api_key)
     except: pass
 
+# 로컬/스텁 백엔드(EMBED_BACKEND=local|http)는 API Key 없이 동작
 has_key = bool(st.session_state.gemini_api_key)
-expander_title = "✅ Google Gemini API Key 설정 완료" if has_key else "🔑 Google Gemini API Key 설정 (필수)"
-is_expanded = not has_key 
+rag_enabled = has_key or not manager.backend.requires_api_key
 
-if has_key:
-    st.success("API Key가 정상적으로 등록되었습니다. 분석 기능을 사용할 수 있습니다!", icon="✅")
+if manager.backend.requires_api_key:
+    expander_title = "✅ Google Gemini API Key 설정 완료" if has_key else "🔑 Google Gemini API Key 설정 (필수)"
+    is_expanded = not has_key 
 
-with st.expander(expander_title, expanded=is_expanded):
-    input_key = st.text_input("API Key 입력 (본 시스템은 API Key를 수집하지 않습니다.)", type="password", value=st.session_state.gemini_api_key)
-    if st.button("API Key 적용"):
-        st.session_state.gemini_api_key = input_key
-        st.rerun()
+    if has_key:
+        st.success("API Key가 정상적으로 등록되었습니다. 분석 기능을 사용할 수 있습니다!", icon="✅")
+
+    with st.expander(expander_title, expanded=is_expanded):
+        input_key = st.text_input("API Key 입력 (본 시스템은 API Key를 수집하지 않습니다.)", type="password", value=st.session_state.gemini_api_key)
+        if st.button("API Key 적용"):
+            st.session_state.gemini_api_key = input_key
+            st.rerun()
+else:
+    st.info(f"오프라인 임베딩 백엔드 사용 중: `{manager.backend.id}` (API Key 불필요)", icon="🖥️")
 
 
 # 3. 임베딩 작업 상태 모니터링 UI
-if manager.is_running:
-    st.write("") # 약간의 여백
-    status_container = st.container(border=True)
-    with status_container:
+# 진행률 위젯만 1초마다 다시 그리는 fragment (페이지 전체는 재실행하지 않음)
+@st.fragment(run_every=1)
+def render_job_progress():
+    if not manager.is_running:
+        # 작업이 끝나면 결과를 반영하도록 페이지 전체를 한 번만 재실행
+        st.rerun()
+    with st.container(border=True):
         st.info(f"🔄 {manager.status_text}")
         st.progress(manager.progress)
         st.caption("💡 팁: 이 작업은 백그라운드에서 계속됩니다. 다른 페이지를 다녀오셔도 됩니다!")
-        
-        # 실시간 갱신을 위해 1초마다 리런
-        time.sleep(1) 
-        st.rerun()
+        st.caption(f"📉 페이지 전체 실행: 최근 1분 {get_run_counter().per_minute('rag'):.0f}회 (진행률만 갱신 중)")
+
+if manager.is_running:
+    st.write("") # 약간의 여백
+    render_job_progress()
         
 elif manager.error_msg:
     st.error(f"🚨 {manager.error_msg}")
     if st.button("다시 시도"):
-        manager.doc_embeddings = None
-        manager.error_msg = None
+        manager.reset()
         st.rerun()
 
 # 4. 분석 결과 예시 화면 (Preview)
@@ -222,29 +207,38 @@ if not st.session_state.rag_analysis_done:
 
 
 # 5. 데이터 로드 및 임베딩 자동 시작 로직
-@st.cache_data
+# (리뷰 CSV 는 임베딩 작업이 청크 단위로 직접 스트리밍하므로 여기서 읽지 않음)
+# Arrow 캐시를 memory-map 으로 읽은 프레임을 세션마다 pickle 복사하지 않고 공유 (읽기 전용으로 사용)
+# 실패는 캐시되지 않도록 예외로 올리고, 오류 표시는 호출하는 쪽에서 함
+@st.cache_resource
 def load_data():
-    try:
-        df_dim = pd.read_csv("data/GAME_DIM_D1_D10.csv")
-        df_rag = pd.read_csv("data/GAME_DIM_CLASSIFIED_END.csv")
-        df_tag = pd.read_csv("data/TAG_STEAM_GAME.csv")
-        for df in [df_dim, df_rag, df_tag]:
-            col_map = {c: "APPID" for c in df.columns if "appid" in c.lower().replace("_", "")}
-            df.rename(columns=col_map, inplace=True)
-            if "APPID" in df.columns: df['APPID'] = df['APPID'].astype(str)
-        df_merged = pd.merge(df_dim, df_tag, on='APPID', how='inner', suffixes=('', '_tag'))
-        return df_merged, df_rag
-    except Exception as e:
-        st.error(f"데이터 로드 오류: {e}")
-        return None, None
-
-df_main, df_rag = load_data()
+    return load_games_cached()
+
+try:
+    df_main = load_data()
+except (OSError, ValueError, KeyError) as e:
+    st.error(f"데이터 로드 오류: {e}")
+    df_main = None
+
+# 추천 엔진 (정규화된 특성 행렬을 프로세스당 한 번만 생성, df_main 을 읽은 뒤에만 호출)
+@st.cache_resource
+def get_recommender():
+    return RecommendationEngine(load_data(), DIM_COLS)
+
+# 게임 x 태그 희소 행렬 (user_tags / genres_store 를 병합 데이터와 같은 행 순서로 한 번만 파싱)
+@st.cache_resource
+def get_tag_index():
+    tag_index = TagIndex(load_data())
+    if len(tag_index) <= 20000:
+        tag_index.precompute_neighbors()    # 작은 카탈로그는 이웃 표를 미리 채움
+    return tag_index
 
 # [자동 시작] 데이터 있고 + 키 있고 + 아직 안 돌렸으면 -> start_job 호출
-if df_main is not None and st.session_state.gemini_api_key:
-    if not manager.is_running and manager.doc_embeddings is None:
-        manager.start_job(df_rag, st.session_state.gemini_api_key)
-        st.rerun()
+# (다른 세션이 이미 시작한 작업이 있으면 새로 띄우지 않고 그 작업에 합류)
+if df_main is not None and rag_enabled:
+    if not manager.is_running and manager.doc_embeddings is None and not manager.error_msg:
+        if manager.start_job(st.session_state.gemini_api_key, RAG_CSV_PATH):
+            st.rerun()
 
 
 # 6. 분석 옵션 (사이드바)
@@ -253,11 +247,35 @@ if df_main is None: st.stop()
 with st.sidebar:
     st.header("🎛️ 분석 옵션")
     input_vector = []
-    dim_cols = ["아트", "연출", "서사", "조작감", "시스템복잡도", "컨텐츠설계량", "엔진", "네트워크", "운영", "BM"]
+    slider_values = []
+    dim_cols = DIM_COLS
     
     for col_name in dim_cols:
         val = st.slider(col_name, 1, 5, 3)
+        slider_values.append(val)
         input_vector.append((val - 1) / 4.0)
+
+    # 차원별 가중치 (모두 1.0 이면 일반 코사인 유사도)
+    with st.expander("⚖️ 차원별 가중치 (선택)"):
+        dim_weights = [st.slider(f"{col_name} 가중치", 0.0, 2.0, 1.0, 0.1, key=f"w_{col_name}") for col_name in dim_cols]
+    if all(w == 1.0 for w in dim_weights):
+        dim_weights = None
+
+    # 태그 기반 보정 (선택 태그 / 기준 게임과의 태그 유사도를 차원 코사인과 섞음)
+    tag_index = get_tag_index()
+    with st.expander("🏷️ 태그 / 기준 게임 (선택)"):
+        chosen_tags = st.multiselect("선호 태그", tag_index.popular_tags())
+        game_labels = {f"{n} ({a})": a for a, n in zip(df_main['APPID'].astype(str), df_main.get('game_name', df_main['APPID']).astype(str))}
+        seed_label = st.selectbox("이 게임과 비슷한 게임", ["(선택 안 함)"] + list(game_labels.keys()))
+        seed_appid = game_labels.get(seed_label)
+        tag_weight = st.slider("태그 유사도 비중", 0.0, 1.0, 0.3, 0.05, disabled=not (chosen_tags or seed_appid))
+    if not (chosen_tags or seed_appid):
+        tag_weight = 0.0
+
+    # 근거 리뷰 검색 방식 (BM25 키워드 일치 + 임베딩 의미 유사도)
+    search_mode = st.selectbox("🔀 근거 리뷰 검색 방식", list(SEARCH_MODES.keys()))
+    fusion = SEARCH_MODES[search_mode]
+    dim_filter = st.checkbox("🎯 팀 강점 차원 리뷰만 보기", value=True, disabled=fusion == "centroid")
     
     st.divider()
     # 버튼 클릭 시 상태 변경 -> 예시 화면 사라짐 + 결과 화면 등장
@@ -269,30 +287,61 @@ with st.sidebar:
 if st.session_state.rag_analysis_done:
     st.divider()
     
-    # 추천 로직
-    target_cols = dim_cols
-    game_features = df_main[target_cols].values
-    user_features = np.array(input_vector).reshape(1, -1)
-    similarity = cosine_similarity(user_features, game_features).flatten()
-    df_main['match_score'] = similarity
-    df_top5 = df_main.sort_values(by='match_score', ascending=False).head(5)
+    top_dim_idx = np.argmax(input_vector)
+    target_kor_col = dim_cols[top_dim_idx]
+    genre_col = 'TARGET_GENRE' if 'TARGET_GENRE' in df_main.columns else 'genre'
+    rag_ready = manager.index is not None and rag_enabled
+
+    # 결과 캐시 조회: (양자화 입력, 게임 데이터 버전, 임베딩 버전)
+    result_cache = get_result_cache()
+    cache_key = (quantize_profile(slider_values, dim_weights), data_version(), manager.version if rag_ready else None, fusion, dim_filter,
+                 tuple(sorted(chosen_tags)), seed_appid, round(tag_weight, 2))
+    cached = result_cache.get(cache_key)
+    query_error = None
+    if cached is None:
+        # 추천 로직 (공유 df_main 은 수정하지 않음)
+        tag_scores = tag_index.scores(chosen_tags, seed_appid) if tag_weight > 0 else None
+        df_top5 = get_recommender().recommend(input_vector, k=5, weights=dim_weights, tag_scores=tag_scores, tag_weight=tag_weight)
+        genre_counts = df_top5[genre_col].value_counts().loc[lambda s: s > 0].head(2) if genre_col in df_top5.columns else None
+        card_quotes = {}
+        if rag_ready:
+            card_quotes, query_error = find_card_quotes(manager, [str(a) for a in df_top5['APPID']], target_kor_col, fusion=fusion, dim_filter=dim_filter)
+        cached = {"df_top5": df_top5, "genre_counts": genre_counts, "card_quotes": card_quotes}
+        if query_error is None:
+            result_cache.put(cache_key, cached)
+    df_top5, genre_counts, card_quotes = cached["df_top5"], cached["genre_counts"], cached["card_quotes"]
 
     # 요약 화면
     st.subheader("📊 추천 결과 요약")
     c1, c2 = st.columns([1, 2])
     with c1:
-        genre_col = 'TARGET_GENRE' if 'TARGET_GENRE' in df_main.columns else 'genre'
-        if genre_col in df_top5.columns: st.dataframe(df_top5[genre_col].value_counts().head(2), use_container_width=True)
+        if genre_counts is not None: st.dataframe(genre_counts, use_container_width=True)
     with c2:
-        display_cols = ['APPID', 'game_name', 'match_score']
+        display_cols = ['APPID', 'game_name', 'match_score', 'dim_score', 'tag_score']
         valid_cols = [c for c in display_cols if c in df_top5.columns]
-        st.dataframe(df_top5[valid_cols].style.format({"match_score": "{:.4f}"}), use_container_width=True, hide_index=True)
+        st.dataframe(df_top5[valid_cols].style.format({"match_score": "{:.4f}", "dim_score": "{:.4f}", "tag_score": "{:.4f}"}), use_container_width=True, hide_index=True)
+    cache_stats = result_cache.stats
+    st.caption(f"⚡ 결과 캐시: 적중 {cache_stats['hits']} · 미스 {cache_stats['misses']} · 저장 {cache_stats['size']}개")
+
+    # 추천 게임 x 10개 차원 근거 매트릭스 (미리 계산된 그룹 중심에서 한 번에 조회, 임베딩 호출 없음)
+    if rag_ready:
+        with st.expander("📋 차원별 근거 매트릭스 (추천 게임 x 역량 차원)"):
+            top_appids = [str(a) for a in df_top5['APPID']]
+            ev_counts, ev_cohesion, ev_quotes = manager.index.evidence_matrix(top_appids, DIM_CODES)
+            names = df_top5['game_name'].astype(str).tolist() if 'game_name' in df_top5.columns else top_appids
+            for ev in (ev_counts, ev_cohesion, ev_quotes):
+                ev.index, ev.columns = names, DIM_COLS
+            st.caption("리뷰 수 (색이 진할수록 리뷰 내용이 한 방향으로 모임)")
+            ev_css = ("background-color: rgba(66, 133, 244, " + ev_cohesion.fillna(0).clip(0, 1).round(2).astype(str) + ")")
+            st.dataframe(ev_counts.style.apply(lambda _: ev_css, axis=None), use_container_width=True)
+            ev_dim = st.selectbox("대표 리뷰 볼 차원", DIM_COLS, index=DIM_COLS.index(target_kor_col))
+            st.dataframe(ev_quotes[[ev_dim]].fillna("-"), use_container_width=True)
 
     st.divider()
     st.subheader("🧐 상세 근거 및 AI 분석")
 
     # 매니저 상태 체크 (결과 화면에서도 진행 중일 수 있으므로)
-    if not st.session_state.gemini_api_key:
+    if not rag_enabled:
         st.warning("⚠️ API Key가 없습니다.")
     elif manager.is_running:
         st.warning("⏳ AI 분석 데이터 생성 중입니다... (상단 진행률 확인)")
@@ -314,28 +363,32 @@ if st.session_state.rag_analysis_done:
                 tech_cols = ['engine', 'network', 'update', 'business_model']
                 tech_data = {k: row.get(k, 'N/A') for k in tech_cols if k in row.index}
                 st.table(pd.DataFrame([tech_data]))
+                # 태그가 비슷한 게임 (미리 계산된 이웃 표 조회)
+                sim_rows, sim_scores = tag_index.similar_to(appid, k=3)
+                sim_names = [f"{get_recommender().df_games.iloc[r].get('game_name', tag_index.appids[r])} ({s:.2f})"
+                             for r, s in zip(sim_rows, sim_scores) if s > 0]
+                if sim_names:
+                    st.caption("🏷️ 태그가 비슷한 게임: " + ", ".join(sim_names))
 
             with col_rag:
                 st.caption("💬 유저 반응 분석 (RAG)")
-                if manager.doc_embeddings is not None and manager.df_docs is not None:
-                    game_indices = manager.df_docs[manager.df_docs['APPID'] == appid].index.tolist()
-                    if game_indices:
-                        top_dim_idx = np.argmax(input_vector)
-                        target_kor_col = dim_cols[top_dim_idx]
-                        query = f"이 게임의 {target_kor_col}에 대한 긍정적인 평가나 특징"
-                        try:
-                            game_embeddings = manager.doc_embeddings[game_indices]
-                            q_vec = genai.embed_content(model="models/text-embedding-004", content=query)['embedding']
-                            q_vec = np.array(q_vec).reshape(1, -1)
-                            sims = cosine_similarity(q_vec, game_embeddings).flatten()
-                            best_idx = np.argmax(sims)
-                            best_doc = manager.df_docs.iloc[game_indices[best_idx]]
-                            
-                            st.info(f"**팀 선호 요소({target_kor_col}) 관련 리뷰:**")
-                            st.markdown(f"> *\"{best_doc['raw_quote']}\"*")
-                            st.caption(f"(관련성: {sims[best_idx]:.4f})")
-                        except Exception as e:
-                            st.error("분석 중 오류 발생")
+                if rag_ready:
+                    if appid in card_quotes:
+                        df_best = card_quotes[appid]
+                        best_doc = df_best.iloc[0]
+                        
+                        st.info(f"**팀 선호 요소({target_kor_col}) 관련 리뷰:**")
+                        st.markdown(f"> *\"{best_doc['raw_quote']}\"*")
+                        if 'lexical_score' in df_best.columns:
+                            st.caption(f"(관련성: {best_doc['score']:.4f} · 키워드 BM25: {best_doc['lexical_score']:.2f})")
+                        else:
+                            st.caption(f"(관련성: {best_doc['score']:.4f})")
+                        if len(df_best) > 1:
+                            with st.expander(f"다른 근거 리뷰 {len(df_best) - 1}개"):
+                                for _, doc in df_best.iloc[1:].iterrows():
+                                    st.markdown(f"- [{doc['dim']}] {doc['raw_quote']} <small>({doc['score']:.4f})</small>", unsafe_allow_html=True)
+                    elif query_error is not None:
+                        st.error("분석 중 오류 발생")
                     else:
                         st.write("관련 리뷰 없음")
                 else:
@@ -344,4 +397,41 @@ if st.session_state.rag_analysis_done:
     # [팁] 결과를 보고 다시 처음으로 돌아가고 싶다면?
     if st.button("🔄 조건 변경 및 다시 검색"):
         st.session_state.rag_analysis_done = False
-        st.rerun()
\ No newline at end of file
+        st.rerun()
+
+# 8. 전체 리뷰 검색 (근사 최근접 이웃, 추천 게임과 무관하게 모든 리뷰 대상)
+if manager.ann_index is not None and rag_enabled:
+    st.divider()
+    with st.expander("🔎 전체 리뷰 검색 (search all reviews)"):
+        search_text = st.text_input("검색어", placeholder="예: 타격감이 좋은 액션 게임")
+        sc1, sc2 = st.columns(2)
+        with sc1:
+            search_k = st.slider("결과 수", 5, 50, 10)
+        with sc2:
+            nlist = manager.ann_index.nlist
+            nprobe = st.slider("탐색 군집 수 (높을수록 정확, 낮을수록 빠름)", 1, max(2, nlist), min(manager.ann_index.nprobe, nlist))
+        use_hybrid = manager.lexical is not None and st.checkbox("키워드(BM25) 일치 함께 반영", value=True)
+        if search_text:
+            q_vec, embed_error = None, None
+            try:
+                q_vec = embed_queries([search_text])[0]
+            except Exception as e:
+                # 백엔드(Gemini / HTTP / 로컬)마다 예외 종류가 달라 질의 임베딩만 넓게 받음
+                embed_error = e
+            if embed_error is not None and not use_hybrid:
+                st.error(f"질의 임베딩 실패: {embed_error}")
+            else:
+                if embed_error is not None:
+                    st.caption(f"⚠️ 질의 임베딩 실패 ({embed_error}) — 키워드(BM25) 검색 결과만 표시합니다.")
+                try:
+                    if use_hybrid:
+                        df_hits = manager.search_hybrid(search_text, q_vec, k=search_k, nprobe=nprobe)
+                    else:
+                        df_hits = manager.search_all(q_vec, k=search_k, nprobe=nprobe)
+                    hit_cols = [c for c in ['game_name', 'dim', 'raw_quote', 'score', 'lexical_score'] if c in df_hits.columns]
+                    st.dataframe(df_hits[hit_cols].style.format({"score": "{:.4f}", "lexical_score": "{:.2f}"}), use_container_width=True, hide_index=True)
+                    st.caption(f"전체 {len(manager.ann_index):,}개 리뷰 중 {nprobe}/{nlist}개 군집 탐색 · "
+                               f"벡터 저장 {manager.vector_codec} ({manager.index.nbytes / 2 ** 20:,.1f} MB)")
+                except (ValueError, KeyError, IndexError) as e:
+                    # 색인/질의 차원 불일치, 저장 색인과 문서 표 불일치 등
+                    st.error(f"검색 중 오류 발생: {e}")